@@ -8,8 +8,14 @@ Ce fichier a été commenté par une intelligence artificielle (ChatGpt)
 # Le point (.) signifie : "dans le même dossier (backend)"
 from .gestion_enquete import GestionEnquetes
 
+# Filtre composite d'affaires (une seule requête SQL)
+from .filtre_affaires import FiltreAffaires
+
+# Événement publié aux abonnés de GestionEnquetes (flux de changements)
+from .evenements import Evenement
+
 
 # __all__ définit ce qui est exporté publiquement par le package backend
-# Cela signifie que seul GestionEnquetes est accessible avec :
+# Cela signifie que seuls GestionEnquetes, FiltreAffaires et Evenement sont accessibles avec :
 # from backend import *
-__all__ = ["GestionEnquetes"]
+__all__ = ["GestionEnquetes", "FiltreAffaires", "Evenement"]
@@ -5,7 +5,7 @@ Ce fichier a été commenté par une intelligence artificielle (ChatGpt)
 """
 
 # Permet de créer automatiquement __init__, __repr__, etc.
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Types pour annotations (meilleure lisibilité, pas obligatoire à l’exécution)
 from typing import Optional, List
@@ -14,12 +14,19 @@ from typing import Optional, List
 from backend.exceptions import PreconditionError, PostconditionError
 
 # Fonctions utilitaires pour accéder à la base de données
-from database import insert, get_all, get_by_id, update, delete, get_connection
+from database import insert, get_all, get_by_id, delete, get_connection, statut_canonique
+
+# Cache des instances déjà chargées (même id -> même objet)
+from backend.identity_map import identity_map
+
+# Suivi des colonnes modifiées (save() n'écrit que celles-ci)
+from backend.suivi import SuiviModifications
 
 
 # @dataclass génère automatiquement le constructeur (__init__)
-@dataclass
-class Affaire:
+# slots=True : pas de __dict__ par instance (listes de 100k affaires)
+@dataclass(slots=True)
+class Affaire(SuiviModifications):
     # Identifiant unique de l’affaire (None si pas encore en DB)
     id_affaire: Optional[int]
 
@@ -37,30 +44,38 @@ class Affaire:
     pos_x: int = 40
     pos_y: int = 40
 
+    # Relations préchargées (None = pas de préchargement, lecture en DB)
+    _suspects: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+    _armes: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+    _lieux: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+
+    # Version d'affichage (colonne tenue par les triggers ; None = pas lue)
+    version: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
     # Nom de la table SQL associée à cette classe
     TABLE_NAME = "Affaire"
+    PK = "id_affaire"
 
-    # Méthode appelée automatiquement après __init__ (dataclass)
-    def __post_init__(self):
-        # Stockage interne du statut (pour @property)
-        self._statut = self.statut
+    # Nombre d'ids par requête « IN » (chargement par lot)
+    LOT_RELATIONS = 500
 
-    # Getter du statut (lecture contrôlée)
-    @property
-    def statut(self):
-        return self._statut
-
-    # Setter du statut avec validation
-    @statut.setter
-    def statut(self, value):
-        # Valeurs autorisées pour le statut
-        allowed = {"en cours", "classée", "classee"}
+    # Toute affectation du statut (constructeur compris) est validée
+    def __setattr__(self, nom, valeur):
+        if nom == "statut":
+            valeur = self._normaliser_statut(valeur)
+        SuiviModifications.__setattr__(self, nom, valeur)
 
-        # Normalisation de la valeur reçue
-        v = str(value).strip().lower()
+    # Forme canonique (« en cours » / « classée ») ; invalide → « en cours »
+    @staticmethod
+    def _normaliser_statut(value):
+        return statut_canonique(value)
 
-        # Si invalide → valeur par défaut
-        self._statut = value if v in allowed else "En cours"
+    # Valeurs SQL d'une mise à jour par id (statut validé comme à l'affectation)
+    @classmethod
+    def normaliser_valeurs(cls, valeurs: dict) -> dict:
+        if "statut" in valeurs:
+            valeurs["statut"] = cls._normaliser_statut(valeurs["statut"])
+        return valeurs
 
     # =========================
     #  CONVERSIONS
@@ -132,6 +147,9 @@ class Affaire:
                 "PRE: le titre de l'affaire ne peut pas être vide."
             )
 
+        # Statut validé avant écriture : les lignes relues sont sûres
+        statut = cls._normaliser_statut(statut)
+
         # Données à insérer en base
         data = {
             "titre": titre,
@@ -170,32 +188,55 @@ class Affaire:
     # Récupère une affaire par son id
     @classmethod
     def get(cls, id_affaire: int) -> Optional["Affaire"]:
+        affaire = identity_map.get(cls.TABLE_NAME, id_affaire)
+        if affaire is not None:
+            return affaire
+
         row = get_by_id(cls.TABLE_NAME, id_affaire, pk="id_affaire")
-        return cls.from_row(row) if row else None
+        if not row:
+            return None
+        return identity_map.add(cls.TABLE_NAME, id_affaire, cls.from_trusted_row(row))
+
+    # Récupère plusieurs affaires par id, dans l'ordre des ids fournis
+    @classmethod
+    def get_many(cls, ids) -> List["Affaire"]:
+        ids = list(ids)
+        par_id = {}
+
+        conn = get_connection()
+        cur = conn.cursor()
+        for i in range(0, len(ids), cls.LOT_RELATIONS):
+            lot = ids[i:i + cls.LOT_RELATIONS]
+            marqueurs = ", ".join("?" * len(lot))
+            cur.execute(f"SELECT * FROM {cls.TABLE_NAME} WHERE id_affaire IN ({marqueurs})", lot)
+            for row in cur.fetchall():
+                par_id[row[0]] = cls.from_trusted_row(row)
+        conn.close()
+
+        return [par_id[i] for i in ids if i in par_id]
 
     # Récupère toutes les affaires
     @classmethod
     def all(cls) -> List["Affaire"]:
         rows = get_all(cls.TABLE_NAME)
-        return [cls.from_row(r) for r in rows]
+        return cls.from_trusted_rows(rows)
 
-    # Sauvegarde les modifications de l’objet en DB
-    def save(self) -> None:
-        if self.id_affaire is None:
-            return
-        update(self.TABLE_NAME, self.id_affaire, self.to_dict(), pk="id_affaire")
-
-    # Met à jour dynamiquement plusieurs attributs
-    def update(self, **kwargs) -> None:
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-        self.save()
+    # Récupère toutes les affaires avec leurs suspects, armes et lieux
+    @classmethod
+    def all_with_relations(cls) -> List["Affaire"]:
+        affaires = cls.all()
+        cls.charger_relations(affaires, toutes=True)
+        return affaires
 
     # Supprime l’affaire de la DB
     def delete(self) -> None:
         if self.id_affaire is not None:
             delete(self.TABLE_NAME, self.id_affaire, pk="id_affaire")
+
+            # Armes et lieux de l'affaire sont supprimés en cascade
+            identity_map.invalidate(self.TABLE_NAME, self.id_affaire)
+            identity_map.invalidate_where("Arme", lambda a: a.id_affaire == self.id_affaire)
+            identity_map.invalidate_where("Lieu", lambda l: l.id_affaire == self.id_affaire)
             self.id_affaire = None
 
     # =========================
@@ -203,22 +244,98 @@ class Affaire:
     # =========================
 
     # Met à jour la position graphique de l’affaire
+    # (seules les coordonnées modifiées sont écrites)
     def update_position(self, x: int, y: int):
         self.pos_x = x
         self.pos_y = y
-        update(
-            self.TABLE_NAME,
-            self.id_affaire,
-            {"pos_x": x, "pos_y": y},
-            pk="id_affaire"
-        )
+        self.save()
 
     # =========================
     #  LIAISONS
     # =========================
 
+    # Précharge les suspects, armes et lieux d'une liste d'affaires.
+    # Trois requêtes au total (par lot de LOT_RELATIONS ids si toutes=False),
+    # au lieu de trois requêtes par affaire.
+    @classmethod
+    def charger_relations(cls, affaires: List["Affaire"], toutes: bool = False) -> None:
+        from backend.suspect import Suspect
+        from backend.arme import Arme
+        from backend.lieu import Lieu
+
+        par_id = {a.id_affaire: a for a in affaires if a.id_affaire is not None}
+        for a in par_id.values():
+            a._suspects, a._armes, a._lieux = [], [], []
+        if not par_id:
+            return
+
+        # (attribut, table N-N, table liée, clé, modèle)
+        relations = (
+            ("_suspects", "AffaireSuspect", "Suspect", "id_suspect", Suspect),
+            ("_armes", "AffaireArme", "Arme", "id_arme", Arme),
+            ("_lieux", "AffaireLieu", "Lieu", "id_lieu", Lieu),
+        )
+
+        # Liste entière : pas de filtre ; sinon lots « IN (?, ?, ...) »
+        if toutes:
+            lots = [None]
+        else:
+            ids = list(par_id)
+            lots = [ids[i:i + cls.LOT_RELATIONS] for i in range(0, len(ids), cls.LOT_RELATIONS)]
+
+        conn = get_connection()
+        cur = conn.cursor()
+        for attr, jointure, table, pk, modele in relations:
+            requete = f"""
+                SELECT j.id_affaire, e.*
+                FROM {table} e
+                         JOIN {jointure} j ON j.{pk} = e.{pk}
+            """
+            for lot in lots:
+                if lot is None:
+                    cur.execute(requete)
+                else:
+                    marqueurs = ", ".join("?" * len(lot))
+                    cur.execute(f"{requete} WHERE j.id_affaire IN ({marqueurs})", lot)
+
+                for row in cur.fetchall():
+                    affaire = par_id.get(row[0])
+                    if affaire is not None:
+                        getattr(affaire, attr).append(modele.from_trusted_row(row[1:]))
+        conn.close()
+
+    # Lit la version d'affichage d'une liste d'affaires (une requête par lot)
+    @classmethod
+    def charger_versions(cls, affaires: List["Affaire"]) -> None:
+        par_id = {a.id_affaire: a for a in affaires if a.id_affaire is not None}
+        ids = list(par_id)
+
+        conn = get_connection()
+        cur = conn.cursor()
+        for i in range(0, len(ids), cls.LOT_RELATIONS):
+            lot = ids[i:i + cls.LOT_RELATIONS]
+            marqueurs = ", ".join("?" * len(lot))
+            cur.execute(f"SELECT id_affaire, version FROM {cls.TABLE_NAME} WHERE id_affaire IN ({marqueurs})", lot)
+            for id_affaire, version in cur.fetchall():
+                par_id[id_affaire].version = version
+        conn.close()
+
+    # Oublie les relations préchargées (prochain accès relu en DB)
+    def invalider_relations(self) -> None:
+        self._suspects = None
+        self._armes = None
+        self._lieux = None
+
+    # Vrai si suspects, armes et lieux sont déjà en mémoire
+    @property
+    def relations_chargees(self) -> bool:
+        return self._suspects is not None and self._armes is not None and self._lieux is not None
+
     # Récupère les suspects liés à l’affaire
     def get_suspects(self):
+        if self._suspects is not None:
+            return list(self._suspects)
+
         from backend.suspect import Suspect
         conn = get_connection()
         cur = conn.cursor()
@@ -234,10 +351,13 @@ class Affaire:
         rows = cur.fetchall()
         conn.close()
 
-        return [Suspect.from_row(r) for r in rows]
+        return Suspect.from_trusted_rows(rows)
 
     # Récupère les armes liées à l’affaire
     def get_armes(self):
+        if self._armes is not None:
+            return list(self._armes)
+
         from backend.arme import Arme
         conn = get_connection()
         cur = conn.cursor()
@@ -252,10 +372,13 @@ class Affaire:
         rows = cur.fetchall()
         conn.close()
 
-        return [Arme.from_row(r) for r in rows]
+        return Arme.from_trusted_rows(rows)
 
     # Récupère les lieux liés à l’affaire
     def get_lieux(self):
+        if self._lieux is not None:
+            return list(self._lieux)
+
         from backend.lieu import Lieu
         conn = get_connection()
         cur = conn.cursor()
@@ -270,4 +393,4 @@ class Affaire:
         rows = cur.fetchall()
         conn.close()
 
-        return [Lieu.from_row(r) for r in rows]
+        return Lieu.from_trusted_rows(rows)
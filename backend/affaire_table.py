@@ -0,0 +1,165 @@
+"""
+
+Représentation en colonnes (lecture seule) de la table Affaire.
+
+Au lieu d'un objet Affaire par ligne, chaque colonne est un tableau
+(array) ou une liste de chaînes internées : les listings, filtres et
+statistiques sur de gros volumes ne matérialisent aucun objet métier.
+La description, potentiellement longue, n'est pas chargée.
+
+"""
+
+# Tableaux compacts de nombres (ids, positions, codes, dates)
+from array import array
+
+# Dates converties en ordinaux (entiers comparables)
+from datetime import date
+
+# Mutualise les chaînes répétées (villes, lieux, codes postaux)
+from sys import intern
+
+# Types pour annotations
+from typing import Dict, Iterable, List, Optional
+
+# Accès à la base de données
+from database import get_connection, statut_canonique
+
+
+# Convertit une date ISO (colonne date_iso) en ordinal (0 si absente ou invalide)
+def date_en_ordinal(date_iso: Optional[str]) -> int:
+    try:
+        return date.fromisoformat(date_iso).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+class AffaireTable:
+    # Codes de statut stockés dans la colonne `statuts`
+    EN_COURS = 0
+    CLASSEE = 1
+    STATUTS = ("en cours", "classée")
+
+    # Colonnes lues en base (la description n'est jamais chargée)
+    COLONNES = "id_affaire, titre, date_iso, lieu, code_postal, statut, pos_x, pos_y"
+
+    # Nombre de lignes lues par fetchmany
+    TAILLE_LOT = 5000
+
+    __slots__ = (
+        "ids", "pos_x", "pos_y", "statuts", "dates",
+        "titres", "lieux", "codes_postaux", "_index",
+    )
+
+    def __init__(self):
+        self.ids = array("q")
+        self.pos_x = array("i")
+        self.pos_y = array("i")
+        self.statuts = array("b")
+        self.dates = array("i")
+        self.titres: List[str] = []
+        self.lieux: List[str] = []
+        self.codes_postaux: List[Optional[str]] = []
+        self._index: Optional[Dict[int, int]] = None
+
+    # Code numérique d'un statut texte (même règle que database.statut_canonique)
+    @classmethod
+    def code_statut(cls, statut: Optional[str]) -> int:
+        return cls.STATUTS.index(statut_canonique(statut))
+
+    # Charge toutes les affaires (ordre des ids) en un seul parcours
+    @classmethod
+    def charger(cls) -> "AffaireTable":
+        table = cls()
+
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(f"SELECT {cls.COLONNES} FROM Affaire ORDER BY id_affaire")
+
+        # Une chaîne par valeur distincte, partagée par toutes les lignes
+        def partager(texte):
+            return intern(texte) if texte is not None else None
+
+        while True:
+            rows = cur.fetchmany(cls.TAILLE_LOT)
+            if not rows:
+                break
+            for id_affaire, titre, date_iso, lieu, code_postal, statut, x, y in rows:
+                table.ids.append(id_affaire)
+                table.pos_x.append(x or 0)
+                table.pos_y.append(y or 0)
+                table.statuts.append(cls.code_statut(statut))
+                table.dates.append(date_en_ordinal(date_iso))
+                table.titres.append(titre)
+                table.lieux.append(partager(lieu))
+                table.codes_postaux.append(partager(code_postal))
+
+        conn.close()
+        return table
+
+    # =========================
+    #  ACCÈS
+    # =========================
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Position d'un id dans les colonnes (None si absent)
+    def indice(self, id_affaire: int) -> Optional[int]:
+        if self._index is None:
+            self._index = {id_: i for i, id_ in enumerate(self.ids)}
+        return self._index.get(id_affaire)
+
+    # Statut texte de la ligne i
+    def statut(self, i: int) -> str:
+        return self.STATUTS[self.statuts[i]]
+
+    # Ligne i sous forme de dictionnaire (affichage ponctuel)
+    def ligne(self, i: int) -> dict:
+        return {
+            "id_affaire": self.ids[i],
+            "titre": self.titres[i],
+            "date": date.fromordinal(self.dates[i]).strftime("%d-%m-%Y") if self.dates[i] else None,
+            "lieu": self.lieux[i],
+            "code_postal": self.codes_postaux[i],
+            "statut": self.statut(i),
+            "pos_x": self.pos_x[i],
+            "pos_y": self.pos_y[i],
+        }
+
+    # =========================
+    #  FILTRES (retournent des indices)
+    # =========================
+
+    def indices_statut(self, statut: str) -> List[int]:
+        code = self.code_statut(statut)
+        return [i for i, c in enumerate(self.statuts) if c == code]
+
+    # Dates comprises entre debut et fin (objets date, bornes incluses)
+    def indices_entre_dates(self, debut: date, fin: date) -> List[int]:
+        dmin, dmax = debut.toordinal(), fin.toordinal()
+        return [i for i, d in enumerate(self.dates) if d and dmin <= d <= dmax]
+
+    def indices_code_postal(self, code_postal: str) -> List[int]:
+        return [i for i, cp in enumerate(self.codes_postaux) if cp == code_postal]
+
+    # Ids correspondant à une liste d'indices
+    def ids_de(self, indices: Iterable[int]) -> List[int]:
+        return [self.ids[i] for i in indices]
+
+    # =========================
+    #  STATISTIQUES
+    # =========================
+
+    # Nombre d'affaires par statut texte
+    def compter_par_statut(self) -> Dict[str, int]:
+        comptes = dict.fromkeys(self.STATUTS, 0)
+        for c in self.statuts:
+            comptes[self.STATUTS[c]] += 1
+        return comptes
+
+    # Nombre d'affaires par code postal
+    def compter_par_code_postal(self) -> Dict[Optional[str], int]:
+        comptes: Dict[Optional[str], int] = {}
+        for cp in self.codes_postaux:
+            comptes[cp] = comptes.get(cp, 0) + 1
+        return comptes
@@ -11,12 +11,18 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 # Fonctions utilitaires pour la base de données
-from database import insert, get_all, get_by_id, update, delete
+from database import insert, insert_many, get_all, get_by_id, delete
+
+# Cache des instances déjà chargées (même id -> même objet)
+from backend.identity_map import identity_map
+
+# Suivi des colonnes modifiées (save() n'écrit que celles-ci)
+from backend.suivi import SuiviModifications
 
 
 # Représente une arme liée à une affaire
-@dataclass
-class Arme:
+@dataclass(slots=True)
+class Arme(SuiviModifications):
     # Identifiant unique de l’arme (None si pas encore en DB)
     id_arme: Optional[int]
 
@@ -34,6 +40,7 @@ class Arme:
 
     # Nom de la table SQL correspondante
     TABLE_NAME = "Arme"
+    PK = "id_arme"
 
     # Alias pratique pour accéder à l’id
     @property
@@ -77,30 +84,37 @@ class Arme:
         # Retourne l’objet Arme créé
         return cls(new_id, type, description, numero_serie, id_affaire)
 
+    # Crée plusieurs armes en une transaction
+    # armes : liste de dicts avec les paramètres de create()
+    @classmethod
+    def create_many(cls, armes) -> List["Arme"]:
+        objets = [cls(None, **a) for a in armes]
+        ids = insert_many(cls.TABLE_NAME, [o.to_dict() for o in objets])
+        for o, new_id in zip(objets, ids):
+            o.id_arme = new_id
+        return objets
+
     # Récupère une arme via son identifiant
     @classmethod
     def get(cls, id_arme: int) -> Optional["Arme"]:
+        arme = identity_map.get(cls.TABLE_NAME, id_arme)
+        if arme is not None:
+            return arme
+
         row = get_by_id(cls.TABLE_NAME, id_arme, pk="id_arme")
-        return cls.from_row(row) if row else None
+        if not row:
+            return None
+        return identity_map.add(cls.TABLE_NAME, id_arme, cls.from_trusted_row(row))
 
     # Récupère toutes les armes de la base
     @classmethod
     def all(cls) -> List["Arme"]:
-        return [cls.from_row(r) for r in get_all(cls.TABLE_NAME)]
-
-    # Met à jour les champs de l’arme
-    def update(self, **kwargs):
-        # Parcourt les champs à modifier
-        for k, v in kwargs.items():
-            if hasattr(self, k):
-                setattr(self, k, v)
-
-        # Sauvegarde les modifications en DB
-        update(self.TABLE_NAME, self.id_arme, self.to_dict(), pk="id_arme")
+        return cls.from_trusted_rows(get_all(cls.TABLE_NAME))
 
     # Supprime l’arme de la base
     def delete(self):
         delete(self.TABLE_NAME, self.id_arme, pk="id_arme")
+        identity_map.invalidate(self.TABLE_NAME, self.id_arme)
 
         # L’objet n’a plus d’id après suppression
         self.id_arme = None
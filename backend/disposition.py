@@ -0,0 +1,479 @@
+"""
+
+Disposition automatique du mur par forces (Fruchterman-Reingold).
+
+Les affaires se repoussent entre elles et les affaires liées s'attirent
+comme reliées par un ressort : les groupes d'affaires liées se
+rassemblent, les lignes se croisent moins.
+
+La répulsion n'est calculée qu'entre affaires de cases voisines d'une
+grille (cases de 2 x DISTANCE) : le coût d'une itération est
+proportionnel au nombre d'affaires et non à son carré. Avec numpy
+(requirements.txt), les forces sont calculées sur des tableaux ; sans
+numpy, une version Python applique le même algorithme, plus lentement.
+Les positions obtenues diffèrent d'une version à l'autre : les sommes
+flottantes ne sont pas faites dans le même ordre et la disposition
+amplifie ces écarts au fil des itérations.
+
+Aucun post-it n'en chevauche un autre à la fin : des passes de
+séparation écartent les paires trop proches, puis les post-it des amas
+encore trop denses sont posés sur une grille de cases libres. La taille
+de chaque post-it (coordonnées du mur) peut être fournie ; à défaut, un
+post-it standard de 2 x DEMI_POSTIT est supposé.
+
+"""
+
+# Tirage des positions confondues (reproductible)
+import random
+
+# Cases de la grille de placement final
+import math
+
+# Types pour annotations
+from typing import Dict, Iterable, Optional, Tuple
+
+# Distance idéale entre deux affaires liées (post-it de 200 px + marge ;
+# en dessous, les groupes denses se chevauchent)
+DISTANCE = 350
+
+# Nombre d'itérations par défaut
+ITERATIONS = 60
+
+# Coin supérieur gauche de la disposition produite
+MARGE = 40
+
+# Attraction vers le centre (garde les groupes isolés à portée)
+GRAVITE = 0.02
+
+# Demi-côté d'un post-it standard (gui.styles.POSTIT_WIDTH / POSTIT_HEIGHT),
+# utilisé pour les affaires sans taille fournie. Les positions sont des
+# coins supérieurs gauches.
+DEMI_POSTIT = 100
+
+# Espace minimal entre deux post-it après la passe anti-chevauchement
+ESPACE = 20
+
+# Nombre maximal de passes anti-chevauchement (arrêt dès qu'aucun post-it
+# ne se chevauche ; les chevauchements restants sont réglés par _placer_libres)
+PASSES_SEPARATION = 100
+
+
+# numpy n'est importé qu'au premier calcul (None s'il n'est pas installé)
+_np = False
+
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+
+# Vrai si le calcul vectorisé est disponible
+def numpy_disponible() -> bool:
+    return _numpy() is not None
+
+
+# Calcule une disposition par forces.
+# positions : {id: (x, y)} coins supérieurs gauches actuels (point de départ)
+# aretes    : paires (id_a, id_b) d'affaires liées
+# tailles   : {id: (largeur, hauteur)} des post-it sur le mur (post-it
+#             standard pour les ids absents)
+# Retourne {id: (x, y)} entiers, le coin de la disposition en (MARGE, MARGE).
+def disposition_forces(
+    positions: Dict[int, Tuple[int, int]],
+    aretes: Iterable[Tuple[int, int]],
+    iterations: int = ITERATIONS,
+    distance: float = DISTANCE,
+    graine: int = 0,
+    vectorise: bool = True,
+    tailles: Optional[Dict[int, Tuple[float, float]]] = None,
+) -> Dict[int, Tuple[int, int]]:
+    ids = list(positions)
+    if not ids:
+        return {}
+
+    indice = {id_: i for i, id_ in enumerate(ids)}
+    aretes = [(indice[a], indice[b]) for a, b in aretes if a in indice and b in indice and a != b]
+
+    # Demi-largeur et demi-hauteur de chaque post-it
+    tailles = tailles or {}
+    standard = (2 * DEMI_POSTIT, 2 * DEMI_POSTIT)
+    demi = [(l / 2, h / 2) for l, h in (tailles.get(id_, standard) for id_ in ids)]
+
+    # Positions de départ : centres des post-it, légèrement dispersés
+    # (deux affaires exactement superposées ne se repousseraient pas)
+    rng = random.Random(graine)
+    depart = [
+        (x + dx + rng.uniform(-1, 1), y + dy + rng.uniform(-1, 1))
+        for (x, y), (dx, dy) in zip((positions[id_] for id_ in ids), demi)
+    ]
+
+    # Départ trop dense (ex. grille serrée) : écarté pour que chaque affaire
+    # dispose d'environ distance² de surface ; moins de paires à repousser
+    depart = _etaler(depart, distance)
+
+    np = _numpy() if vectorise else None
+    if np is not None:
+        centres = _separer_numpy(np, _iterer_numpy(np, depart, aretes, iterations, distance), demi)
+    else:
+        centres = _separer_python(_iterer_python(depart, aretes, iterations, distance), demi)
+
+    # Amas trop denses pour les passes : post-it restants déplacés vers une place libre
+    centres = _placer_libres(centres, demi)
+
+    # Coins supérieurs gauches, translatés pour commencer en (MARGE, MARGE)
+    coins = [(x - dx, y - dy) for (x, y), (dx, dy) in zip(centres, demi)]
+    x_min = min(x for x, _ in coins)
+    y_min = min(y for _, y in coins)
+    return {
+        id_: (int(round(x - x_min)) + MARGE, int(round(y - y_min)) + MARGE)
+        for id_, (x, y) in zip(ids, coins)
+    }
+
+
+# Côté des cases de voisinage : deux post-it plus éloignés sur un axe ne
+# peuvent pas se chevaucher
+def _case_voisinage(demi) -> float:
+    return 2 * max(max(dx, dy) for dx, dy in demi) + ESPACE
+
+
+# Homothétie autour du centre si la surface occupée est trop petite
+def _etaler(points, distance):
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    surface = max(max(xs) - min(xs), distance) * max(max(ys) - min(ys), distance)
+    facteur = (len(points) * distance * distance / surface) ** 0.5
+    if facteur <= 1:
+        return points
+    mx = sum(xs) / len(xs)
+    my = sum(ys) / len(ys)
+    return [(mx + (x - mx) * facteur, my + (y - my) * facteur) for x, y in points]
+
+
+# Température initiale (déplacement maximal d'une itération)
+def _temperature(n: int, distance: float) -> float:
+    return distance * max(2.0, n ** 0.5) / 2
+
+
+# ---------------------------------------------------------------------------
+# VERSION VECTORISÉE (numpy)
+# ---------------------------------------------------------------------------
+
+# Paires (i, j) d'affaires situées dans des cases voisines, chacune une
+# seule fois : même case (i < j) ou l'une des 4 cases « suivantes »
+def _paires_voisines(np, pos, case):
+    cx = np.floor(pos[:, 0] / case).astype(np.int64)
+    cy = np.floor(pos[:, 1] / case).astype(np.int64)
+    cx -= cx.min() - 1
+    cy -= cy.min() - 1
+    largeur = int(cy.max()) + 2
+    cles = cx * largeur + cy
+
+    ordre = np.argsort(cles, kind="stable")
+    cles_triees = cles[ordre]
+    n = len(pos)
+
+    paires_i, paires_j = [], []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        # Cibles parcourues dans l'ordre des clés : recherche plus rapide
+        cible = cles_triees + (dx * largeur + dy)
+        debut = np.searchsorted(cles_triees, cible, side="left")
+        fin = np.searchsorted(cles_triees, cible, side="right")
+        comptes = fin - debut
+        total = int(comptes.sum())
+        if not total:
+            continue
+
+        # Déroule les plages [debut, fin) de chaque affaire en une seule passe
+        rang = np.repeat(np.arange(n), comptes)
+        decalage = np.arange(total) - np.repeat(np.cumsum(comptes) - comptes, comptes)
+        rang_j = np.repeat(debut, comptes) + decalage
+        if dx == 0 and dy == 0:
+            garder = rang < rang_j
+            rang, rang_j = rang[garder], rang_j[garder]
+        paires_i.append(ordre[rang])
+        paires_j.append(ordre[rang_j])
+
+    if not paires_i:
+        vide = np.empty(0, dtype=np.int64)
+        return vide, vide
+    return np.concatenate(paires_i), np.concatenate(paires_j)
+
+
+def _iterer_numpy(np, depart, aretes, iterations, distance):
+    pos = np.array(depart, dtype=float)
+    n = len(pos)
+    k2 = distance * distance
+    portee = 2 * distance
+
+    if aretes:
+        a = np.array([e[0] for e in aretes], dtype=np.int64)
+        b = np.array([e[1] for e in aretes], dtype=np.int64)
+
+    t0 = _temperature(n, distance)
+    for etape in range(iterations):
+        deplacement = np.zeros_like(pos)
+
+        # Répulsion k² / d entre voisins de grille (au-delà de la portée : ignorée)
+        i, j = _paires_voisines(np, pos, portee)
+        if len(i):
+            delta = pos[i] - pos[j]
+            d2 = np.maximum((delta * delta).sum(axis=1), 0.01)
+            force = np.where(d2 < portee * portee, k2 / d2, 0.0)
+            for axe in (0, 1):
+                poussee = delta[:, axe] * force
+                deplacement[:, axe] += np.bincount(i, weights=poussee, minlength=n)
+                deplacement[:, axe] -= np.bincount(j, weights=poussee, minlength=n)
+
+        # Attraction d² / k le long des liens
+        if aretes:
+            delta = pos[a] - pos[b]
+            d = np.sqrt((delta * delta).sum(axis=1)) + 0.01
+            vecteur = delta * (d / distance)[:, None]
+            for axe in (0, 1):
+                deplacement[:, axe] += np.bincount(b, weights=vecteur[:, axe], minlength=n)
+                deplacement[:, axe] -= np.bincount(a, weights=vecteur[:, axe], minlength=n)
+
+        # Gravité vers le centre
+        deplacement -= GRAVITE * (pos - pos.mean(axis=0))
+
+        # Déplacement limité par la température (refroidissement linéaire)
+        t = t0 * (1 - etape / iterations)
+        longueur = np.sqrt((deplacement * deplacement).sum(axis=1)) + 0.01
+        pos += deplacement * (np.minimum(longueur, t) / longueur)[:, None]
+
+    return pos
+
+
+# Écarte les post-it qui se chevauchent encore (les forces ne l'empêchent
+# pas) : chaque paire est repoussée sur l'axe du plus petit recouvrement
+def _separer_numpy(np, pos, demi):
+    n = len(pos)
+    case = _case_voisinage(demi)
+    demi = np.array(demi, dtype=float)
+    for _ in range(PASSES_SEPARATION):
+        i, j = _paires_voisines(np, pos, case)
+        if not len(i):
+            break
+        delta = pos[i] - pos[j]
+        recouvrement = demi[i] + demi[j] + ESPACE - np.abs(delta)
+        chevauche = (recouvrement[:, 0] > 0) & (recouvrement[:, 1] > 0)
+        if not chevauche.any():
+            break
+
+        i, j, delta, recouvrement = i[chevauche], j[chevauche], delta[chevauche], recouvrement[chevauche]
+        axe_x = recouvrement[:, 0] < recouvrement[:, 1]
+        signe = np.where(delta >= 0, 1.0, -1.0)
+        poussee = np.zeros_like(delta)
+        poussee[:, 0] = np.where(axe_x, recouvrement[:, 0] * signe[:, 0] / 2, 0.0)
+        poussee[:, 1] = np.where(axe_x, 0.0, recouvrement[:, 1] * signe[:, 1] / 2)
+        for axe in (0, 1):
+            pos[:, axe] += np.bincount(i, weights=poussee[:, axe], minlength=n)
+            pos[:, axe] -= np.bincount(j, weights=poussee[:, axe], minlength=n)
+    return pos.tolist()
+
+
+# ---------------------------------------------------------------------------
+# VERSION PYTHON (sans numpy)
+# ---------------------------------------------------------------------------
+
+def _iterer_python(depart, aretes, iterations, distance):
+    pos = [list(p) for p in depart]
+    n = len(pos)
+    k2 = distance * distance
+    portee = 2 * distance
+    portee2 = portee * portee
+
+    t0 = _temperature(n, distance)
+    for etape in range(iterations):
+        dep = [[0.0, 0.0] for _ in range(n)]
+
+        # Grille : case -> indices des affaires qu'elle contient
+        cases = {}
+        for i, (x, y) in enumerate(pos):
+            cases.setdefault((int(x // portee), int(y // portee)), []).append(i)
+
+        # Répulsion entre voisins de grille
+        for (cx, cy), membres in cases.items():
+            voisins = [
+                j
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for j in cases.get((cx + dx, cy + dy), ())
+            ]
+            for i in membres:
+                xi, yi = pos[i]
+                fx = fy = 0.0
+                for j in voisins:
+                    if i == j:
+                        continue
+                    dx = xi - pos[j][0]
+                    dy = yi - pos[j][1]
+                    d2 = max(dx * dx + dy * dy, 0.01)
+                    if d2 < portee2:
+                        f = k2 / d2
+                        fx += dx * f
+                        fy += dy * f
+                dep[i][0] += fx
+                dep[i][1] += fy
+
+        # Attraction le long des liens
+        for a, b in aretes:
+            dx = pos[a][0] - pos[b][0]
+            dy = pos[a][1] - pos[b][1]
+            f = ((dx * dx + dy * dy) ** 0.5 + 0.01) / distance
+            dep[a][0] -= dx * f
+            dep[a][1] -= dy * f
+            dep[b][0] += dx * f
+            dep[b][1] += dy * f
+
+        # Gravité vers le centre
+        mx = sum(p[0] for p in pos) / n
+        my = sum(p[1] for p in pos) / n
+
+        t = t0 * (1 - etape / iterations)
+        for i in range(n):
+            dx = dep[i][0] - GRAVITE * (pos[i][0] - mx)
+            dy = dep[i][1] - GRAVITE * (pos[i][1] - my)
+            longueur = (dx * dx + dy * dy) ** 0.5 + 0.01
+            r = min(longueur, t) / longueur
+            pos[i][0] += dx * r
+            pos[i][1] += dy * r
+
+    return pos
+
+
+def _separer_python(pos, demi):
+    case = _case_voisinage(demi)
+    for _ in range(PASSES_SEPARATION):
+        cases = {}
+        for i, (x, y) in enumerate(pos):
+            cases.setdefault((int(x // case), int(y // case)), []).append(i)
+
+        poussees = [[0.0, 0.0] for _ in pos]
+        chevauchement = False
+        for (cx, cy), membres in cases.items():
+            voisins = [
+                j
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for j in cases.get((cx + dx, cy + dy), ())
+            ]
+            for i in membres:
+                for j in voisins:
+                    if i == j:
+                        continue
+                    dx = pos[i][0] - pos[j][0]
+                    dy = pos[i][1] - pos[j][1]
+                    rx = demi[i][0] + demi[j][0] + ESPACE - abs(dx)
+                    ry = demi[i][1] + demi[j][1] + ESPACE - abs(dy)
+                    if rx <= 0 or ry <= 0:
+                        continue
+                    chevauchement = True
+                    # Chaque paire est vue deux fois : demi-poussée côté i seulement
+                    if rx < ry:
+                        poussees[i][0] += rx / 2 if dx >= 0 else -rx / 2
+                    else:
+                        poussees[i][1] += ry / 2 if dy >= 0 else -ry / 2
+
+        if not chevauchement:
+            break
+        for p, (px, py) in zip(pos, poussees):
+            p[0] += px
+            p[1] += py
+    return pos
+
+
+# ---------------------------------------------------------------------------
+# PLACEMENT FINAL (commun aux deux versions)
+# ---------------------------------------------------------------------------
+
+# Garantit qu'aucun post-it n'en chevauche un autre. Les post-it sans
+# conflit (aucun autre post-it à moins de ESPACE) restent en place ; les
+# autres sont posés au centre de la case libre la plus proche d'une grille
+# dont le pas est celui du plus grand d'entre eux (plus ESPACE). Deux cases
+# distinctes sont à un pas l'une de l'autre sur un axe au moins : plus
+# aucun chevauchement, et chaque essai de case ne coûte qu'une recherche
+# dans un ensemble.
+def _placer_libres(centres, demi):
+    pos = [tuple(p) for p in centres]
+
+    # Post-it en conflit (voisins cherchés dans les 9 cases de voisinage)
+    case = _case_voisinage(demi)
+    cases = {}
+    for i, (x, y) in enumerate(pos):
+        cases.setdefault((int(x // case), int(y // case)), []).append(i)
+    conflits = set()
+    for (cx, cy), membres in cases.items():
+        voisins = [
+            j
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for j in cases.get((cx + dx, cy + dy), ())
+        ]
+        for i in membres:
+            (xi, yi), (hxi, hyi) = pos[i], demi[i]
+            if any(
+                j != i
+                and abs(xi - pos[j][0]) < hxi + demi[j][0] + ESPACE
+                and abs(yi - pos[j][1]) < hyi + demi[j][1] + ESPACE
+                for j in voisins
+            ):
+                conflits.add(i)
+    if not conflits:
+        return pos
+
+    # Pas de la grille et demi-taille maximale des post-it à y poser
+    hx = max(demi[i][0] for i in conflits)
+    hy = max(demi[i][1] for i in conflits)
+    pas_x, pas_y = 2 * hx + ESPACE, 2 * hy + ESPACE
+
+    # Indices de cases (centres en ((k + 0.5) * pas)) à moins de `portee` de v
+    def indices_proches(v, pas, portee):
+        debut = math.floor((v - portee) / pas - 0.5)
+        fin = math.floor((v + portee) / pas - 0.5) + 1
+        return [c for c in range(debut, fin + 1) if abs((c + 0.5) * pas - v) < portee]
+
+    # Cases gênées par un post-it resté en place
+    occupees = set()
+    for i, (x, y) in enumerate(pos):
+        if i not in conflits:
+            colonnes = indices_proches(x, pas_x, hx + demi[i][0] + ESPACE)
+            lignes = indices_proches(y, pas_y, hy + demi[i][1] + ESPACE)
+            occupees.update((kx, ky) for kx in colonnes for ky in lignes)
+
+    # Chaque post-it en conflit prend la case libre la plus proche de son
+    # centre, cherchée par anneaux de cases autour de sa case
+    for i in sorted(conflits):
+        x, y = pos[i]
+        cx, cy = int(x // pas_x), int(y // pas_y)
+        rayon = 0
+        while True:
+            anneau = [c for c in _anneau(cx, cy, rayon) if c not in occupees]
+            if anneau:
+                break
+            rayon += 1
+
+        choisie = min(anneau, key=lambda c: ((c[0] + 0.5) * pas_x - x) ** 2 + ((c[1] + 0.5) * pas_y - y) ** 2)
+        occupees.add(choisie)
+        pos[i] = ((choisie[0] + 0.5) * pas_x, (choisie[1] + 0.5) * pas_y)
+
+    return pos
+
+
+# Cases situées à exactement `rayon` cases (distance de Chebyshev) de (cx, cy)
+def _anneau(cx, cy, rayon):
+    if rayon == 0:
+        return [(cx, cy)]
+    cotes = range(-rayon, rayon + 1)
+    return (
+        [(cx + d, cy - rayon) for d in cotes]
+        + [(cx + d, cy + rayon) for d in cotes]
+        + [(cx - rayon, cy + d) for d in cotes[1:-1]]
+        + [(cx + rayon, cy + d) for d in cotes[1:-1]]
+    )
@@ -0,0 +1,79 @@
+"""
+
+Flux de changements émis par GestionEnquetes.
+
+Chaque écriture (création, modification, suppression, liaison, position)
+publie un Evenement aux abonnés, une fois la transaction validée :
+
+    def on_changement(evt):
+        print(evt.action, evt.entite, evt.id, evt.affaires)
+
+    gestion.abonner(on_changement)
+
+Un abonné (ex. le mur d'enquête) peut ainsi ne mettre à jour que les
+affaires concernées au lieu de tout recharger.
+
+"""
+
+# Structure de l'événement
+from dataclasses import dataclass
+
+# Types pour annotations
+from typing import Callable, List, Tuple
+
+# Logger : une erreur d'abonné ne doit pas interrompre les autres
+from backend.logger import get_logger
+
+log = get_logger()
+
+
+@dataclass(frozen=True)
+class Evenement:
+    # Actions publiées
+    CREATION = "creation"
+    MODIFICATION = "modification"
+    SUPPRESSION = "suppression"
+    POSITION = "position"
+    LIAISON = "liaison"
+    DELIAISON = "deliaison"
+
+    # Une des actions ci-dessus
+    action: str
+
+    # "affaire", "suspect", "arme" ou "lieu"
+    entite: str
+
+    # Id de l'entité (None pour une liaison en lot)
+    id: object
+
+    # Affaires dont l'affichage est concerné (texte du post-it ou liens)
+    affaires: Tuple[int, ...] = ()
+
+    # Vrai si les liens entre affaires peuvent avoir changé
+    @property
+    def touche_liens(self) -> bool:
+        if self.action in (self.LIAISON, self.DELIAISON, self.SUPPRESSION):
+            return True
+        return self.entite == "affaire" and self.action == self.CREATION
+
+
+class FluxChangements:
+
+    def __init__(self):
+        self._abonnes: List[Callable[[Evenement], None]] = []
+
+    def abonner(self, callback: Callable[[Evenement], None]) -> None:
+        if callback not in self._abonnes:
+            self._abonnes.append(callback)
+
+    def desabonner(self, callback: Callable[[Evenement], None]) -> None:
+        if callback in self._abonnes:
+            self._abonnes.remove(callback)
+
+    # Transmet l'événement à chaque abonné (copie : un abonné peut se désabonner)
+    def publier(self, evenement: Evenement) -> None:
+        for callback in list(self._abonnes):
+            try:
+                callback(evenement)
+            except Exception:
+                log.exception(f"Erreur d'un abonné sur {evenement}")
@@ -0,0 +1,188 @@
+"""
+
+Filtre composite d'affaires compilé en une seule requête SQL.
+
+Chaque critère (statut, texte, dates, suspect, arme, lieu, code postal)
+ajoute une condition paramétrée ; les critères se cumulent (ET logique) :
+
+    filtre = FiltreAffaires().en_cours().suspect(3).entre_dates(debut, fin)
+    affaires = filtre.affaires()
+
+Les conditions portent sur des colonnes indexées (statut, date_iso,
+code_postal, tables de liaison, index plein texte) : aucune affaire
+n'est chargée pour être écartée ensuite en Python.
+
+"""
+
+# Dates des bornes (date ou datetime)
+from datetime import date
+
+# Types pour annotations
+from typing import List, Optional, Tuple
+
+# Modèle retourné par le filtre
+from backend.affaire import Affaire
+
+# Requête plein texte (mêmes règles que GestionEnquetes.rechercher)
+from backend.recherche import requete_fts
+
+# Accès à la base de données
+from database import get_connection, statut_canonique
+
+
+class FiltreAffaires:
+
+    # (table de liaison, clé) pour les critères par entité liée
+    LIAISONS = {
+        "suspect": ("AffaireSuspect", "id_suspect"),
+        "arme": ("AffaireArme", "id_arme"),
+        "lieu": ("AffaireLieu", "id_lieu"),
+    }
+
+    def __init__(self):
+        # Critères : (condition SQL, paramètres, libellé)
+        self._criteres: List[Tuple[str, tuple, str]] = []
+
+        # Tri des résultats
+        self._ordre = "id_affaire"
+
+    def _ajouter(self, condition: str, params: tuple, libelle: str) -> "FiltreAffaires":
+        self._criteres.append((condition, params, libelle))
+        return self
+
+    # =========================
+    #  CRITÈRES
+    # =========================
+
+    def statut(self, statut: str) -> "FiltreAffaires":
+        # Le statut est enregistré sous sa forme canonique (index idx_affaire_statut)
+        cle = statut_canonique(statut)
+        return self._ajouter("statut = ?", (cle,), f"Statut : {cle}")
+
+    def en_cours(self) -> "FiltreAffaires":
+        return self.statut("en cours")
+
+    def classees(self) -> "FiltreAffaires":
+        return self.statut("classée")
+
+    # Recherche plein texte (titre, description, lieu, ville, entités liées)
+    def texte(self, texte: str) -> "FiltreAffaires":
+        requete = requete_fts(texte)
+        if not requete:
+            # Aucun mot exploitable : aucun résultat, comme rechercher()
+            return self._ajouter("0", (), f"Texte : {texte}")
+        return self._ajouter(
+            "id_affaire IN (SELECT rowid FROM RechercheAffaire WHERE RechercheAffaire MATCH ?)",
+            (requete,),
+            f"Texte : {texte}",
+        )
+
+    # Bornes incluses, chacune optionnelle
+    def entre_dates(self, debut: Optional[date] = None, fin: Optional[date] = None) -> "FiltreAffaires":
+        if debut is None and fin is None:
+            return self
+
+        fmt = "%d-%m-%Y"
+        libelle = (
+            f"Entre : {debut.strftime(fmt) if debut else '—'} -> "
+            f"{fin.strftime(fmt) if fin else '—'}"
+        )
+
+        # Parcours de l'index idx_affaire_date_iso (les bornes absentes sont ouvertes)
+        return self._ajouter(
+            "date_iso BETWEEN ? AND ?",
+            (
+                debut.strftime("%Y-%m-%d") if debut else "0000-00-00",
+                fin.strftime("%Y-%m-%d") if fin else "9999-99-99",
+            ),
+            libelle,
+        )
+
+    # Résultats triés par date (chronologie), index idx_affaire_date_iso
+    def chronologique(self) -> "FiltreAffaires":
+        self._ordre = "date_iso, id_affaire"
+        return self
+
+    def _liaison(self, entite: str, id_entite: int, libelle: str) -> "FiltreAffaires":
+        table, pk = self.LIAISONS[entite]
+        return self._ajouter(
+            f"id_affaire IN (SELECT id_affaire FROM {table} WHERE {pk} = ?)",
+            (id_entite,),
+            libelle,
+        )
+
+    def suspect(self, id_suspect: int, libelle: Optional[str] = None) -> "FiltreAffaires":
+        return self._liaison("suspect", id_suspect, libelle or f"Suspect #{id_suspect}")
+
+    def arme(self, id_arme: int, libelle: Optional[str] = None) -> "FiltreAffaires":
+        return self._liaison("arme", id_arme, libelle or f"Arme #{id_arme}")
+
+    def lieu(self, id_lieu: int, libelle: Optional[str] = None) -> "FiltreAffaires":
+        return self._liaison("lieu", id_lieu, libelle or f"Lieu #{id_lieu}")
+
+    def code_postal(self, code_postal: str) -> "FiltreAffaires":
+        return self._ajouter("code_postal = ?", (code_postal,), f"Code postal : {code_postal}")
+
+    # Restreint aux affaires d'ids donnés (ex. vérifier si des affaires
+    # modifiées correspondent toujours au filtre, sans tout relancer)
+    def parmi(self, ids) -> "FiltreAffaires":
+        ids = tuple(ids)
+        if not ids:
+            return self._ajouter("0", (), "Parmi : aucune")
+        marqueurs = ", ".join("?" * len(ids))
+        return self._ajouter(f"id_affaire IN ({marqueurs})", ids, f"Parmi : {len(ids)} affaire(s)")
+
+    # =========================
+    #  COMPILATION / EXÉCUTION
+    # =========================
+
+    # Vrai si aucun critère n'a été ajouté
+    def est_vide(self) -> bool:
+        return not self._criteres
+
+    # Nouveau filtre avec les mêmes critères (pour en ajouter sans modifier celui-ci)
+    def copie(self) -> "FiltreAffaires":
+        filtre = FiltreAffaires()
+        filtre._criteres = list(self._criteres)
+        filtre._ordre = self._ordre
+        return filtre
+
+    # Description lisible des critères (affichée dans la sidebar)
+    def libelle(self) -> str:
+        return " + ".join(c[2] for c in self._criteres) or "Aucun"
+
+    # Clause WHERE et ses paramètres
+    def where(self) -> Tuple[str, list]:
+        if not self._criteres:
+            return "1", []
+        conditions = " AND ".join(f"({c[0]})" for c in self._criteres)
+        params = [p for c in self._criteres for p in c[1]]
+        return conditions, params
+
+    # Requête SQL complète et ses paramètres
+    def compiler(self, colonnes: str = "*") -> Tuple[str, list]:
+        where, params = self.where()
+        return f"SELECT {colonnes} FROM Affaire WHERE {where} ORDER BY {self._ordre}", params
+
+    def _executer(self, colonnes: str) -> list:
+        sql, params = self.compiler(colonnes)
+        conn = get_connection()
+        rows = conn.execute(sql, params).fetchall()
+        conn.close()
+        return rows
+
+    # Ids des affaires correspondantes
+    def ids(self) -> List[int]:
+        return [r[0] for r in self._executer("id_affaire")]
+
+    # Affaires correspondantes
+    def affaires(self) -> List[Affaire]:
+        return Affaire.from_trusted_rows(self._executer("*"))
+
+    # Nombre d'affaires correspondantes
+    def compter(self) -> int:
+        where, params = self.where()
+        conn = get_connection()
+        n = conn.execute(f"SELECT COUNT(*) FROM Affaire WHERE {where}", params).fetchone()[0]
+        conn.close()
+        return n
@@ -5,16 +5,34 @@ Ce fichier a été commenté par une intelligence artificielle (ChatGpt)
 """
 
 # Types pour les annotations (meilleure lisibilité)
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+# Gestionnaire de contexte pour les transactions
+from contextlib import contextmanager
+
+# Écriture des positions en attente à la fermeture du programme
+import atexit
+
+# Instances suivies sans être retenues (vidage du tampon à la fermeture)
+import weakref
 
 # Import des modèles métiers
 from .affaire import Affaire
+from .affaire_table import AffaireTable
 from .suspect import Suspect
 from .arme import Arme
 from .lieu import Lieu
+from .liens import Lien, MoteurLiens, PaireLiee
+from .recherche import rechercher_affaires
+from .filtre_affaires import FiltreAffaires
+from .identity_map import identity_map
+from .evenements import Evenement, FluxChangements
+from .disposition import disposition_forces
+from .tampon_positions import TamponPositions
 
 # Fonctions utilitaires pour la base de données
-from database import insert, get_all, update, delete, get_connection
+from database import insert, get_all, delete, get_connection
+import database
 
 # Logger pour tracer les actions importantes
 from backend.logger import get_logger
@@ -22,10 +40,86 @@ from backend.logger import get_logger
 # Initialisation du logger
 log = get_logger()
 
+# Instances de GestionEnquetes dont le tampon de positions est vidé à la
+# fermeture du programme (références faibles : une instance abandonnée
+# n'est pas gardée en vie jusqu'à la fin du processus)
+_instances = weakref.WeakSet()
+
+
+# Un seul gestionnaire atexit pour toutes les instances
+@atexit.register
+def _vider_positions_en_attente():
+    for gestion in list(_instances):
+        try:
+            gestion.vider_positions()
+        except Exception as e:
+            log.error(f"Positions en attente non enregistrées à la fermeture : {e}")
+
 
 # Classe centrale qui orchestre toute la logique métier
 class GestionEnquetes:
 
+    def __init__(self):
+        # Cache de session : un même id donne la même instance
+        self.cache = identity_map
+
+        # Abonnés aux changements (création, modification, suppression, liaisons)
+        self.evenements = FluxChangements()
+
+        # Positions graphiques en attente d'écriture (voir vider_positions) ;
+        # celles encore en attente sont écrites à la fermeture du programme
+        self.positions = TamponPositions()
+        _instances.add(self)
+
+    # Vide le cache de session (ex. après une modification externe de la base)
+    def vider_cache(self):
+        self.cache.clear()
+
+    # ============================================================
+    #                     FLUX DE CHANGEMENTS
+    # ============================================================
+
+    # Abonne callback(evenement) aux changements : il est appelé après
+    # chaque écriture validée (dans une transaction : après le commit,
+    # jamais si elle est annulée)
+    def abonner(self, callback):
+        self.evenements.abonner(callback)
+
+    def desabonner(self, callback):
+        self.evenements.desabonner(callback)
+
+    # Publie un événement une fois les écritures validées
+    def _notifier(self, action: str, entite: str, id_, affaires=()):
+        evenement = Evenement(action, entite, id_, tuple(affaires))
+        database.apres_commit(lambda: self.evenements.publier(evenement))
+
+    # Ids des affaires liées à une entité par sa table de liaison
+    def _affaires_liees(self, table: str, colonne: str, id_entite: int) -> List[int]:
+        conn = get_connection()
+        rows = conn.execute(
+            f"SELECT id_affaire FROM {table} WHERE {colonne} = ?", (id_entite,)
+        ).fetchall()
+        conn.close()
+        return [r[0] for r in rows]
+
+    # ============================================================
+    #                     TRANSACTIONS
+    # ============================================================
+
+    # Unité de travail : tous les appels faits dans le bloc
+    #     with gestion.transaction():
+    # partagent une connexion et sont validés une seule fois à la fin
+    # (ou annulés si une exception est levée)
+    @contextmanager
+    def transaction(self):
+        try:
+            with database.transaction() as conn:
+                yield conn
+        except BaseException:
+            # Les instances en cache peuvent refléter des écritures annulées
+            self.cache.clear()
+            raise
+
     # ============================================================
     #                     AFFAIRES
     # ============================================================
@@ -34,6 +128,7 @@ class GestionEnquetes:
     def creer_affaire(self, *args, **kwargs) -> Affaire:
         affaire = Affaire.create(*args, **kwargs)
         log.info(f"Affaire créée : id={affaire.id_affaire}, titre='{affaire.titre}'")
+        self._notifier(Evenement.CREATION, "affaire", affaire.id_affaire, (affaire.id_affaire,))
         return affaire
 
     # Récupère une affaire par son id
@@ -41,26 +136,82 @@ class GestionEnquetes:
         return Affaire.get(id_affaire)
 
     # Récupère toutes les affaires
-    def get_affaires(self) -> List[Affaire]:
+    # with_relations=True : suspects, armes et lieux préchargés en 3 requêtes
+    def get_affaires(self, with_relations: bool = False) -> List[Affaire]:
+        if with_relations:
+            return Affaire.all_with_relations()
         return Affaire.all()
 
+    # Parcourt les affaires page par page (mémoire constante)
+    # with_relations=True : relations préchargées pour chaque page
+    def iter_affaires(self, with_relations: bool = False, taille_page: int = 500):
+        dernier = None
+        while True:
+            page = Affaire.page(after_id=dernier, limit=taille_page)
+            if not page:
+                return
+            if with_relations:
+                Affaire.charger_relations(page)
+            yield from page
+            dernier = page[-1].id_affaire
+
+    # Parcourt seulement quelques colonnes des affaires (tuples, sans objet)
+    def iter_colonnes_affaires(self, colonnes, where: Optional[str] = None, params=()):
+        return database.iter_rows("Affaire", columns=colonnes, where=where, params=params, pk="id_affaire")
+
+    # Récupère plusieurs affaires par id (ordre conservé)
+    def get_affaires_par_ids(self, ids) -> List[Affaire]:
+        return Affaire.get_many(ids)
+
+    # Toutes les affaires en colonnes (lecture seule, sans objet par ligne) :
+    # listings, filtres et statistiques sur de gros volumes
+    def get_table_affaires(self) -> AffaireTable:
+        return AffaireTable.charger()
+
+    # Recherche plein texte : ids d'affaires classés par pertinence.
+    # Porte sur le titre, la description, le lieu et la ville de l'affaire
+    # ainsi que sur ses suspects, armes et lieux liés.
+    def rechercher(self, query: str, limit: Optional[int] = None) -> List[int]:
+        return rechercher_affaires(query, limit)
+
+    # Nouveau filtre composite, à compléter puis exécuter :
+    #     gestion.filtre().en_cours().suspect(3).affaires()
+    def filtre(self) -> FiltreAffaires:
+        return FiltreAffaires()
+
+    # Affaires triées par date, éventuellement entre deux dates (bornes incluses)
+    def chronologie(self, debut=None, fin=None) -> List[Affaire]:
+        return FiltreAffaires().entre_dates(debut, fin).chronologique().affaires()
+
+    # Précharge les suspects, armes et lieux d'une liste d'affaires
+    def charger_relations(self, affaires: List[Affaire]) -> None:
+        Affaire.charger_relations(affaires)
+
+    # Lit la version d'affichage d'une liste d'affaires
+    # (change à chaque modification de l'affaire, de ses liaisons ou d'une entité liée)
+    def charger_versions(self, affaires: List[Affaire]) -> None:
+        Affaire.charger_versions(affaires)
+
     # Supprime une affaire
     def supprimer_affaire(self, id_affaire: int):
         a = Affaire.get(id_affaire)
         if a:
             a.delete()
             log.warning(f"Affaire supprimée : id={id_affaire}")
+            self._notifier(Evenement.SUPPRESSION, "affaire", id_affaire, (id_affaire,))
         else:
             log.error(f"Tentative suppression affaire inexistante : id={id_affaire}")
 
     # Met à jour une affaire
-    def maj_affaire(self, id_affaire: int, data: dict):
-        a = Affaire.get(id_affaire)
-        if a:
-            a.update(**data)
+    # (une seule requête UPDATE, sans relecture préalable ;
+    # retourne False si l'id n'existe pas)
+    def maj_affaire(self, id_affaire: int, data: dict) -> bool:
+        if Affaire.maj(id_affaire, data):
             log.info(f"Affaire modifiée : id={id_affaire}")
-        else:
-            log.error(f"Tentative modification affaire inexistante : id={id_affaire}")
+            self._notifier(Evenement.MODIFICATION, "affaire", id_affaire, (id_affaire,))
+            return True
+        log.error(f"Tentative modification affaire inexistante : id={id_affaire}")
+        return False
 
     # ============================================================
     #                     SUSPECTS
@@ -73,8 +224,18 @@ class GestionEnquetes:
             f"Suspect créé : id={suspect.id_suspect}, "
             f"nom='{suspect.nom} {suspect.prenom}'"
         )
+        self._notifier(Evenement.CREATION, "suspect", suspect.id_suspect)
         return suspect
 
+    # Crée plusieurs suspects en une seule transaction
+    # suspects : liste de dicts {"nom": ..., "prenom": ..., ...}
+    def creer_suspects(self, suspects: List[dict]) -> List[Suspect]:
+        crees = Suspect.create_many(suspects)
+        log.info(f"{len(crees)} suspect(s) créé(s) en lot")
+        for s in crees:
+            self._notifier(Evenement.CREATION, "suspect", s.id_suspect)
+        return crees
+
     # Récupère un suspect par son id
     def get_suspect(self, id_suspect: int) -> Optional[Suspect]:
         return Suspect.get(id_suspect)
@@ -87,19 +248,25 @@ class GestionEnquetes:
     def supprimer_suspect(self, id_suspect: int):
         s = Suspect.get(id_suspect)
         if s:
+            # Affaires à prévenir, lues avant la suppression des liaisons
+            affaires = self._affaires_liees("AffaireSuspect", "id_suspect", id_suspect)
             s.delete()
             log.warning(f"Suspect supprimé : id={id_suspect}")
+            self._notifier(Evenement.SUPPRESSION, "suspect", id_suspect, affaires)
         else:
             log.error(f"Tentative suppression suspect inexistant : id={id_suspect}")
 
     # Met à jour un suspect
-    def maj_suspect(self, id_suspect: int, data: dict):
-        s = Suspect.get(id_suspect)
-        if s:
-            s.update(**data)
+    def maj_suspect(self, id_suspect: int, data: dict) -> bool:
+        if Suspect.maj(id_suspect, data):
             log.info(f"Suspect modifié : id={id_suspect}")
-        else:
-            log.error(f"Tentative modification suspect inexistant : id={id_suspect}")
+            self._notifier(
+                Evenement.MODIFICATION, "suspect", id_suspect,
+                self._affaires_liees("AffaireSuspect", "id_suspect", id_suspect),
+            )
+            return True
+        log.error(f"Tentative modification suspect inexistant : id={id_suspect}")
+        return False
 
     # ============================================================
     #                     ARMES
@@ -109,8 +276,18 @@ class GestionEnquetes:
     def creer_arme(self, *args, **kwargs) -> Arme:
         arme = Arme.create(*args, **kwargs)
         log.info(f"Arme créée : id={arme.id_arme}, type='{arme.type}'")
+        self._notifier(Evenement.CREATION, "arme", arme.id_arme)
         return arme
 
+    # Crée plusieurs armes en une seule transaction
+    # armes : liste de dicts {"type": ..., "description": ..., "numero_serie": ..., "id_affaire": ...}
+    def creer_armes(self, armes: List[dict]) -> List[Arme]:
+        creees = Arme.create_many(armes)
+        log.info(f"{len(creees)} arme(s) créée(s) en lot")
+        for a in creees:
+            self._notifier(Evenement.CREATION, "arme", a.id_arme)
+        return creees
+
     # Récupère une arme
     def get_arme(self, id_arme: int) -> Optional[Arme]:
         return Arme.get(id_arme)
@@ -123,19 +300,25 @@ class GestionEnquetes:
     def supprimer_arme(self, id_arme: int):
         a = Arme.get(id_arme)
         if a:
+            # Affaires à prévenir, lues avant la suppression des liaisons
+            affaires = self._affaires_liees("AffaireArme", "id_arme", id_arme)
             a.delete()
             log.warning(f"Arme supprimée : id={id_arme}")
+            self._notifier(Evenement.SUPPRESSION, "arme", id_arme, affaires)
         else:
             log.error(f"Tentative suppression arme inexistante : id={id_arme}")
 
     # Met à jour une arme
-    def maj_arme(self, id_arme: int, data: dict):
-        a = Arme.get(id_arme)
-        if a:
-            a.update(**data)
+    def maj_arme(self, id_arme: int, data: dict) -> bool:
+        if Arme.maj(id_arme, data):
             log.info(f"Arme modifiée : id={id_arme}")
-        else:
-            log.error(f"Tentative modification arme inexistante : id={id_arme}")
+            self._notifier(
+                Evenement.MODIFICATION, "arme", id_arme,
+                self._affaires_liees("AffaireArme", "id_arme", id_arme),
+            )
+            return True
+        log.error(f"Tentative modification arme inexistante : id={id_arme}")
+        return False
 
     # ============================================================
     #                     VILLES
@@ -166,8 +349,18 @@ class GestionEnquetes:
     def creer_lieu(self, *args, **kwargs) -> Lieu:
         lieu = Lieu.create(*args, **kwargs)
         log.info(f"Lieu créé : id={lieu.id_lieu}, adresse='{lieu.adresse}'")
+        self._notifier(Evenement.CREATION, "lieu", lieu.id_lieu)
         return lieu
 
+    # Crée plusieurs lieux en une seule transaction
+    # lieux : liste de dicts {"nom": ..., "adresse": ..., "type": ..., "id_affaire": ...}
+    def creer_lieux(self, lieux: List[dict]) -> List[Lieu]:
+        crees = Lieu.create_many(lieux)
+        log.info(f"{len(crees)} lieu(x) créé(s) en lot")
+        for l in crees:
+            self._notifier(Evenement.CREATION, "lieu", l.id_lieu)
+        return crees
+
     # Récupère un lieu
     def get_lieu(self, id_lieu: int) -> Optional[Lieu]:
         return Lieu.get(id_lieu)
@@ -180,33 +373,131 @@ class GestionEnquetes:
     def supprimer_lieu(self, id_lieu: int):
         l = Lieu.get(id_lieu)
         if l:
+            # Affaires à prévenir, lues avant la suppression des liaisons
+            affaires = self._affaires_liees("AffaireLieu", "id_lieu", id_lieu)
             l.delete()
             log.warning(f"Lieu supprimé : id={id_lieu}")
+            self._notifier(Evenement.SUPPRESSION, "lieu", id_lieu, affaires)
         else:
             log.error(f"Tentative suppression lieu inexistant : id={id_lieu}")
 
     # Met à jour un lieu
-    def maj_lieu(self, id_lieu: int, data: dict):
-        l = Lieu.get(id_lieu)
-        if l:
-            l.update(**data)
+    def maj_lieu(self, id_lieu: int, data: dict) -> bool:
+        if Lieu.maj(id_lieu, data):
             log.info(f"Lieu modifié : id={id_lieu}")
-        else:
-            log.error(f"Tentative modification lieu inexistant : id={id_lieu}")
+            self._notifier(
+                Evenement.MODIFICATION, "lieu", id_lieu,
+                self._affaires_liees("AffaireLieu", "id_lieu", id_lieu),
+            )
+            return True
+        log.error(f"Tentative modification lieu inexistant : id={id_lieu}")
+        return False
+
+    # ============================================================
+    #                     LIENS ENTRE AFFAIRES
+    # ============================================================
+
+    # Liens (entités communes) entre affaires, restreints à ids_affaires si fourni
+    def get_liens(self, ids_affaires=None) -> List[Lien]:
+        return MoteurLiens().calculer(ids_affaires)
+
+    # Liens d'une affaire : {id de l'autre affaire: Lien}
+    def get_liens_affaire(self, id_affaire: int) -> Dict[int, Lien]:
+        return MoteurLiens().liens_de(id_affaire)
+
+    # Paires d'affaires liées (compteurs lus dans la table LienAffaire, sans calcul)
+    def get_paires_liees(self, ids_affaires=None) -> List[PaireLiee]:
+        return MoteurLiens().paires(ids_affaires)
+
+    # Paires liées à une affaire (lecture indexée)
+    def get_paires_affaire(self, id_affaire: int) -> List[PaireLiee]:
+        return MoteurLiens().paires_de(id_affaire)
+
+    # Entités communes à deux affaires (détail d'un lien, à la demande)
+    def get_lien(self, id_a: int, id_b: int) -> Lien:
+        return MoteurLiens().lien(id_a, id_b)
 
     # ============================================================
     #                     POSITIONS VISUELLES
     # ============================================================
 
-    # Met à jour la position graphique d’une affaire
-    def maj_position_affaire(self, id_affaire, x, y):
-        update("Affaire", id_affaire, {"pos_x": x, "pos_y": y})
-        log.info(f"Position affaire mise à jour : id={id_affaire} ({x},{y})")
+    # Met à jour la position graphique d’une affaire, écrite tout de suite
+    # (avec les positions en attente : un déplacement différé plus ancien
+    # ne peut pas l'écraser ensuite). Retourne le nombre de lignes écrites.
+    def maj_position_affaire(self, id_affaire, x, y) -> int:
+        self.positions.ajouter("affaire", id_affaire, x, y)
+        return self.vider_positions()
+
+    # Enregistre la position graphique d’une affaire dans le tampon :
+    # seule la dernière position est gardée, écrite au prochain
+    # vider_positions() avec les autres déplacements (glisser-déposer du mur).
+    # Aucun événement n'est publié avant ce vidage.
+    def maj_position_affaire_differee(self, id_affaire, x, y):
+        self.positions.ajouter("affaire", id_affaire, x, y)
+
+    # Met à jour les positions de plusieurs affaires en une transaction
+    # positions : {id_affaire: (x, y)} ; retourne le nombre de lignes écrites
+    def maj_positions_affaires(self, positions: Dict[int, tuple]) -> int:
+        for id_affaire, (x, y) in positions.items():
+            self.positions.ajouter("affaire", id_affaire, x, y)
+        return self.vider_positions()
+
+    # Écrit toutes les positions en attente : un executemany par table,
+    # une seule transaction, une ligne de log. Retourne le nombre de lignes écrites.
+    def vider_positions(self) -> int:
+        if not len(self.positions):
+            return 0
+
+        positions = self.positions.extraire()
+        affaires, suspects = positions["affaire"], positions["suspect"]
+        try:
+            with self.transaction():
+                n = Affaire.maj_lot({i: {"pos_x": x, "pos_y": y} for i, (x, y) in affaires.items()})
+                n += Suspect.maj_lot({i: {"pos_x": x, "pos_y": y} for i, (x, y) in suspects.items()})
+
+                # Un événement par table (publiés après le commit)
+                if affaires:
+                    self._notifier(Evenement.POSITION, "affaire", None, affaires.keys())
+                if suspects:
+                    self._notifier(Evenement.POSITION, "suspect", None)
+        except Exception:
+            # Rien n'est perdu : les positions seront réécrites au prochain vidage
+            self.positions.restaurer(positions)
+            raise
 
-    # Met à jour la position graphique d’un suspect
-    def maj_position_suspect(self, id_suspect, x, y):
-        update("Suspect", id_suspect, {"pos_x": x, "pos_y": y})
-        log.info(f"Position suspect mise à jour : id={id_suspect} ({x},{y})")
+        log.info(
+            f"Positions enregistrées en lot : {len(affaires)} affaire(s), "
+            f"{len(suspects)} suspect(s)"
+        )
+        return n
+
+    # Disposition par forces des affaires (toutes, ou ids_affaires) selon
+    # leurs liens : {id_affaire: (x, y)}, sans rien enregistrer.
+    # tailles : {id_affaire: (largeur, hauteur)} des post-it sur le mur
+    # (post-it standard pour les autres), aucun chevauchement à ces tailles.
+    # Calcul vectorisé si numpy est installé (voir backend/disposition.py).
+    def calculer_disposition(self, ids_affaires=None, tailles=None) -> Dict[int, tuple]:
+        positions = {
+            i: (x or 0, y or 0)
+            for i, x, y in self.iter_colonnes_affaires(["id_affaire", "pos_x", "pos_y"])
+        }
+        if ids_affaires is not None:
+            ids = set(ids_affaires)
+            positions = {i: p for i, p in positions.items() if i in ids}
+
+        aretes = [(p.id_a, p.id_b) for p in self.get_paires_liees(positions.keys())]
+        return disposition_forces(positions, aretes, tailles=tailles)
+
+    # Met à jour la position graphique d’un suspect, écrite tout de suite
+    # (comme maj_position_affaire). Retourne le nombre de lignes écrites.
+    def maj_position_suspect(self, id_suspect, x, y) -> int:
+        self.positions.ajouter("suspect", id_suspect, x, y)
+        return self.vider_positions()
+
+    # Enregistre la position graphique d’un suspect dans le tampon
+    # (écrite au prochain vider_positions())
+    def maj_position_suspect_differee(self, id_suspect, x, y):
+        self.positions.ajouter("suspect", id_suspect, x, y)
 
     # ============================================================
     #            LIAISONS AFFAIRE <-> SUSPECT / ARME / LIEU
@@ -222,7 +513,9 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.info(f"Liaison créée : Affaire {id_affaire} <-> Suspect {id_suspect}")
+        self._notifier(Evenement.LIAISON, "suspect", id_suspect, (id_affaire,))
 
     # Lie une arme à une affaire
     def lier_arme_affaire(self, id_affaire: int, id_arme: int):
@@ -234,7 +527,9 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.info(f"Liaison créée : Affaire {id_affaire} <-> Arme {id_arme}")
+        self._notifier(Evenement.LIAISON, "arme", id_arme, (id_affaire,))
 
     # Lie un lieu à une affaire
     def lier_lieu_affaire(self, id_affaire: int, id_lieu: int):
@@ -246,7 +541,66 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.info(f"Liaison créée : Affaire {id_affaire} <-> Lieu {id_lieu}")
+        self._notifier(Evenement.LIAISON, "lieu", id_lieu, (id_affaire,))
+
+    # Les relations préchargées d'une affaire en cache deviennent périmées
+    def _invalider_relations(self, id_affaire: int):
+        affaire = self.cache.get("Affaire", id_affaire)
+        if affaire is not None:
+            affaire.invalider_relations()
+
+    # ---------------- Liaisons en lot ----------------
+
+    # Insère plusieurs liaisons (id_affaire, id) en une transaction ;
+    # retourne le nombre de liaisons réellement créées (doublons ignorés)
+    def _lier_plusieurs(self, table: str, colonne: str, id_affaire: int, ids) -> int:
+        ids = list(ids)
+        if not ids:
+            return 0
+        conn = get_connection()
+        cur = conn.cursor()
+        try:
+            cur.executemany(
+                f"INSERT OR IGNORE INTO {table} (id_affaire, {colonne}) VALUES (?, ?)",
+                [(id_affaire, i) for i in ids],
+            )
+            n = cur.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return n
+
+    # Lie plusieurs suspects à une affaire ; retourne le nombre de liaisons créées
+    def lier_suspects_affaire(self, id_affaire: int, ids_suspects):
+        n = self._lier_plusieurs("AffaireSuspect", "id_suspect", id_affaire, ids_suspects)
+        self._invalider_relations(id_affaire)
+        log.info(f"Liaisons créées en lot : Affaire {id_affaire} <-> {n} suspect(s)")
+        if n:
+            self._notifier(Evenement.LIAISON, "suspect", None, (id_affaire,))
+        return n
+
+    # Lie plusieurs armes à une affaire ; retourne le nombre de liaisons créées
+    def lier_armes_affaire(self, id_affaire: int, ids_armes):
+        n = self._lier_plusieurs("AffaireArme", "id_arme", id_affaire, ids_armes)
+        self._invalider_relations(id_affaire)
+        log.info(f"Liaisons créées en lot : Affaire {id_affaire} <-> {n} arme(s)")
+        if n:
+            self._notifier(Evenement.LIAISON, "arme", None, (id_affaire,))
+        return n
+
+    # Lie plusieurs lieux à une affaire ; retourne le nombre de liaisons créées
+    def lier_lieux_affaire(self, id_affaire: int, ids_lieux):
+        n = self._lier_plusieurs("AffaireLieu", "id_lieu", id_affaire, ids_lieux)
+        self._invalider_relations(id_affaire)
+        log.info(f"Liaisons créées en lot : Affaire {id_affaire} <-> {n} lieu(x)")
+        if n:
+            self._notifier(Evenement.LIAISON, "lieu", None, (id_affaire,))
+        return n
 
     # ---------------- Suppression des liaisons ----------------
 
@@ -260,7 +614,9 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.warning(f"Liaison supprimée : Affaire {id_affaire} <-> Suspect {id_suspect}")
+        self._notifier(Evenement.DELIAISON, "suspect", id_suspect, (id_affaire,))
 
     # Supprime la liaison entre une arme et une affaire
     def del_arme_affaire(self, id_affaire: int, id_arme: int):
@@ -272,7 +628,9 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.warning(f"Liaison supprimée : Affaire {id_affaire} <-> Arme {id_arme}")
+        self._notifier(Evenement.DELIAISON, "arme", id_arme, (id_affaire,))
 
     # Supprime la liaison entre un lieu et une affaire
     def del_lieu_affaire(self, id_affaire: int, id_lieu: int):
@@ -284,4 +642,6 @@ class GestionEnquetes:
         )
         conn.commit()
         conn.close()
+        self._invalider_relations(id_affaire)
         log.warning(f"Liaison supprimée : Affaire {id_affaire} <-> Lieu {id_lieu}")
+        self._notifier(Evenement.DELIAISON, "lieu", id_lieu, (id_affaire,))
@@ -0,0 +1,93 @@
+"""
+
+Carte d'identité (identity map) des objets métier chargés depuis la base.
+
+Un même couple (table, id) donne toujours la même instance tant qu'elle est
+en cache : les lectures répétées (menus du CLI, validations) ne refont ni
+requête ni objet. Le cache est borné (les entrées les moins récemment
+utilisées sont évincées) et invalidé par les mises à jour et suppressions.
+
+"""
+
+# Dictionnaire ordonné : sert de file LRU
+from collections import OrderedDict
+
+# Verrou : le cache peut être lu depuis un thread de chargement
+import threading
+
+# Types pour annotations
+from typing import Any, Callable, Hashable, Optional
+
+# Le cache est lié à un fichier de base : il est vidé si DB_NAME change
+import database
+
+
+class IdentityMap:
+
+    def __init__(self, taille_max: int = 2048):
+        if taille_max < 1:
+            raise ValueError("La taille du cache doit être au moins 1.")
+        self.taille_max = taille_max
+        self._objets = OrderedDict()
+        self._db_name = database.DB_NAME
+        self._lock = threading.RLock()
+
+    # Vide le cache si la base courante a changé
+    def _verifier_base(self):
+        if self._db_name != database.DB_NAME:
+            self._objets.clear()
+            self._db_name = database.DB_NAME
+
+    # Retourne l'instance en cache pour (table, id), ou None
+    def get(self, table: str, id_: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._verifier_base()
+            obj = self._objets.get((table, id_))
+            if obj is not None:
+                self._objets.move_to_end((table, id_))
+            return obj
+
+    # Enregistre une instance et retourne l'instance de référence
+    # (celle déjà en cache si le couple est déjà connu)
+    def add(self, table: str, id_: Hashable, obj: Any) -> Any:
+        with self._lock:
+            self._verifier_base()
+            existant = self._objets.get((table, id_))
+            if existant is not None:
+                self._objets.move_to_end((table, id_))
+                return existant
+
+            self._objets[(table, id_)] = obj
+            while len(self._objets) > self.taille_max:
+                self._objets.popitem(last=False)
+            return obj
+
+    # Retire (table, id) du cache, sauf si l'instance en cache est `sauf`
+    # (un objet à jour qui vient de s'enregistrer lui-même)
+    def invalidate(self, table: str, id_: Hashable, sauf: Any = None) -> None:
+        with self._lock:
+            obj = self._objets.get((table, id_))
+            if obj is not None and obj is not sauf:
+                del self._objets[(table, id_)]
+
+    # Retire toutes les instances d'une table vérifiant `condition(obj)`
+    def invalidate_where(self, table: str, condition: Callable[[Any], bool]) -> None:
+        with self._lock:
+            a_retirer = [
+                cle for cle, obj in self._objets.items()
+                if cle[0] == table and condition(obj)
+            ]
+            for cle in a_retirer:
+                del self._objets[cle]
+
+    # Vide entièrement le cache
+    def clear(self) -> None:
+        with self._lock:
+            self._objets.clear()
+
+    def __len__(self):
+        return len(self._objets)
+
+
+# Cache de la session (un processus CLI ou GUI = une session)
+identity_map = IdentityMap()
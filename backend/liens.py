@@ -0,0 +1,208 @@
+"""
+
+Moteur de liens entre affaires (suspects, armes et lieux communs).
+
+"""
+
+# Génère automatiquement __init__, __repr__, etc.
+from dataclasses import dataclass, field
+
+# Types pour annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Modèles des entités partagées
+from backend.suspect import Suspect
+from backend.arme import Arme
+from backend.lieu import Lieu
+
+# Accès à la base de données
+from database import get_connection
+
+
+# Représente le lien entre deux affaires et les entités qu'elles partagent
+@dataclass
+class Lien:
+    # Identifiants des deux affaires (toujours id_a < id_b)
+    id_a: int
+    id_b: int
+
+    # Entités communes aux deux affaires
+    suspects: List[Suspect] = field(default_factory=list)
+    armes: List[Arme] = field(default_factory=list)
+    lieux: List[Lieu] = field(default_factory=list)
+
+    # Retourne l'identifiant de l'autre affaire du lien
+    def autre(self, id_affaire: int) -> int:
+        return self.id_b if id_affaire == self.id_a else self.id_a
+
+    # Liste de chaînes descriptives (affichées dans le popup du mur)
+    def communs(self) -> List[str]:
+        communs = []
+
+        for s in self.suspects:
+            communs.append(f"👥 Suspect commun : {s.prenom} {s.nom}")
+
+        for a in self.armes:
+            label = a.type
+            if a.numero_serie:
+                label += f" (n° {a.numero_serie})"
+            communs.append(f"🔪 Arme commune : {label}")
+
+        for l in self.lieux:
+            label = l.nom
+            if l.adresse:
+                label += f" ({l.adresse})"
+            communs.append(f"📍 Lieu commun : {label}")
+
+        return communs
+
+
+# Paire d'affaires liées telle que stockée dans LienAffaire (compteurs seulement)
+@dataclass
+class PaireLiee:
+    # Identifiants des deux affaires (toujours id_a < id_b)
+    id_a: int
+    id_b: int
+
+    # Nombre d'entités communes
+    nb_suspects: int = 0
+    nb_armes: int = 0
+    nb_lieux: int = 0
+
+    # Retourne l'identifiant de l'autre affaire de la paire
+    def autre(self, id_affaire: int) -> int:
+        return self.id_b if id_affaire == self.id_a else self.id_a
+
+    # Nombre total d'entités communes
+    @property
+    def total(self) -> int:
+        return self.nb_suspects + self.nb_armes + self.nb_lieux
+
+
+# Calcule les liens à partir d'index inversés entité -> affaires
+class MoteurLiens:
+
+    # (attribut de Lien, table N-N, table liée, clé, modèle)
+    RELATIONS = (
+        ("suspects", "AffaireSuspect", "Suspect", "id_suspect", Suspect),
+        ("armes", "AffaireArme", "Arme", "id_arme", Arme),
+        ("lieux", "AffaireLieu", "Lieu", "id_lieu", Lieu),
+    )
+
+    # Calcule tous les liens, éventuellement restreints à un ensemble d'affaires
+    def calculer(self, ids_affaires: Optional[Iterable[int]] = None) -> List[Lien]:
+        filtre = set(ids_affaires) if ids_affaires is not None else None
+        liens: Dict[Tuple[int, int], Lien] = {}
+
+        conn = get_connection()
+        cur = conn.cursor()
+
+        for attr, jointure, table, pk, modele in self.RELATIONS:
+            # Une seule passe sur la table N-N : listes entité -> affaires
+            cur.execute(f"""
+                SELECT j.id_affaire, e.*
+                FROM {jointure} j
+                         JOIN {table} e ON e.{pk} = j.{pk}
+                ORDER BY j.{pk}, j.id_affaire
+            """)
+
+            postings: Dict[int, List[int]] = {}
+            entites = {}
+            for row in cur.fetchall():
+                id_affaire, entite_row = row[0], row[1:]
+                if filtre is not None and id_affaire not in filtre:
+                    continue
+                id_entite = entite_row[0]
+                postings.setdefault(id_entite, []).append(id_affaire)
+                if id_entite not in entites:
+                    entites[id_entite] = modele.from_trusted_row(entite_row)
+
+            # Seules les entités partagées par au moins deux affaires produisent des paires
+            for id_entite, affaires in postings.items():
+                if len(affaires) < 2:
+                    continue
+                entite = entites[id_entite]
+                for i, id_a in enumerate(affaires):
+                    for id_b in affaires[i + 1:]:
+                        lien = liens.get((id_a, id_b))
+                        if lien is None:
+                            lien = liens[(id_a, id_b)] = Lien(id_a, id_b)
+                        getattr(lien, attr).append(entite)
+
+        conn.close()
+        return list(liens.values())
+
+    # Paires liées lues dans la table LienAffaire (maintenue par triggers),
+    # éventuellement restreintes aux paires dont les deux affaires sont dans ids_affaires
+    def paires(self, ids_affaires: Optional[Iterable[int]] = None) -> List[PaireLiee]:
+        conn = get_connection()
+        rows = conn.execute("SELECT * FROM LienAffaire").fetchall()
+        conn.close()
+
+        if ids_affaires is not None:
+            filtre = set(ids_affaires)
+            rows = [r for r in rows if r[0] in filtre and r[1] in filtre]
+        return [PaireLiee(*r) for r in rows]
+
+    # Paires liées à une affaire (clé primaire + index idx_lienaffaire_b)
+    def paires_de(self, id_affaire: int) -> List[PaireLiee]:
+        conn = get_connection()
+        rows = conn.execute(
+            """
+            SELECT * FROM LienAffaire WHERE id_a = ?
+            UNION ALL
+            SELECT * FROM LienAffaire WHERE id_b = ?
+            """,
+            (id_affaire, id_affaire),
+        ).fetchall()
+        conn.close()
+        return [PaireLiee(*r) for r in rows]
+
+    # Détail d'un lien (entités communes à deux affaires), chargé à la demande
+    def lien(self, id_a: int, id_b: int) -> Lien:
+        id_a, id_b = min(id_a, id_b), max(id_a, id_b)
+        lien = Lien(id_a, id_b)
+
+        conn = get_connection()
+        cur = conn.cursor()
+        for attr, jointure, table, pk, modele in self.RELATIONS:
+            cur.execute(f"""
+                SELECT e.*
+                FROM {jointure} x
+                         JOIN {jointure} y ON y.{pk} = x.{pk} AND y.id_affaire = ?
+                         JOIN {table} e ON e.{pk} = x.{pk}
+                WHERE x.id_affaire = ?
+                ORDER BY e.{pk}
+            """, (id_b, id_a))
+            setattr(lien, attr, modele.from_trusted_rows(cur.fetchall()))
+        conn.close()
+        return lien
+
+    # Liens d'une seule affaire : {id de l'autre affaire: Lien}
+    def liens_de(self, id_affaire: int) -> Dict[int, Lien]:
+        liens: Dict[int, Lien] = {}
+
+        conn = get_connection()
+        cur = conn.cursor()
+
+        for attr, jointure, table, pk, modele in self.RELATIONS:
+            # Autres affaires partageant une entité avec id_affaire
+            cur.execute(f"""
+                SELECT autre.id_affaire, e.*
+                FROM {jointure} ref
+                         JOIN {jointure} autre
+                              ON autre.{pk} = ref.{pk} AND autre.id_affaire <> ref.id_affaire
+                         JOIN {table} e ON e.{pk} = ref.{pk}
+                WHERE ref.id_affaire = ?
+                ORDER BY autre.id_affaire, e.{pk}
+            """, (id_affaire,))
+
+            for row in cur.fetchall():
+                id_autre = row[0]
+                lien = liens.get(id_autre)
+                if lien is None:
+                    lien = liens[id_autre] = Lien(min(id_affaire, id_autre), max(id_affaire, id_autre))
+                getattr(lien, attr).append(modele.from_trusted_row(row[1:]))
+
+        conn.close()
+        return liens
@@ -11,12 +11,18 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 # Fonctions utilitaires pour la base de données
-from database import insert, get_all, get_by_id, update, delete
+from database import insert, insert_many, get_all, get_by_id, delete
+
+# Cache des instances déjà chargées (même id -> même objet)
+from backend.identity_map import identity_map
+
+# Suivi des colonnes modifiées (save() n'écrit que celles-ci)
+from backend.suivi import SuiviModifications
 
 
 # Représente un lieu lié à une affaire
-@dataclass
-class Lieu:
+@dataclass(slots=True)
+class Lieu(SuiviModifications):
     # Identifiant unique du lieu (None si pas encore en DB)
     id_lieu: Optional[int]
 
@@ -34,6 +40,7 @@ class Lieu:
 
     # Nom de la table SQL associée
     TABLE_NAME = "Lieu"
+    PK = "id_lieu"
 
     # Alias pratique pour l'id
     @property
@@ -76,28 +83,35 @@ class Lieu:
         # Retourne l’objet Lieu créé
         return cls(new_id, nom, adresse, type, id_affaire)
 
+    # Crée plusieurs lieux en une transaction
+    # lieux : liste de dicts avec les paramètres de create()
+    @classmethod
+    def create_many(cls, lieux) -> List["Lieu"]:
+        objets = [cls(None, **l) for l in lieux]
+        ids = insert_many(cls.TABLE_NAME, [o.to_dict() for o in objets])
+        for o, new_id in zip(objets, ids):
+            o.id_lieu = new_id
+        return objets
+
     # Récupère un lieu via son id
     @classmethod
     def get(cls, id_lieu: int) -> Optional["Lieu"]:
+        lieu = identity_map.get(cls.TABLE_NAME, id_lieu)
+        if lieu is not None:
+            return lieu
+
         row = get_by_id(cls.TABLE_NAME, id_lieu, pk="id_lieu")
-        return cls.from_row(row) if row else None
+        if not row:
+            return None
+        return identity_map.add(cls.TABLE_NAME, id_lieu, cls.from_trusted_row(row))
 
     # Récupère tous les lieux
     @classmethod
     def all(cls) -> List["Lieu"]:
-        return [cls.from_row(r) for r in get_all(cls.TABLE_NAME)]
-
-    # Met à jour les champs du lieu
-    def update(self, **kwargs):
-        # Met à jour dynamiquement les attributs existants
-        for k, v in kwargs.items():
-            if hasattr(self, k):
-                setattr(self, k, v)
-
-        # Sauvegarde les modifications en DB
-        update(self.TABLE_NAME, self.id_lieu, self.to_dict(), pk="id_lieu")
+        return cls.from_trusted_rows(get_all(cls.TABLE_NAME))
 
     # Supprime le lieu de la base
     def delete(self):
         delete(self.TABLE_NAME, self.id_lieu, pk="id_lieu")
+        identity_map.invalidate(self.TABLE_NAME, self.id_lieu)
         self.id_lieu = None
@@ -0,0 +1,47 @@
+"""
+
+Recherche plein texte dans les affaires (index FTS5 RechercheAffaire).
+
+"""
+
+# Expressions régulières pour découper la saisie en mots
+import re
+
+# Types pour annotations
+from typing import List, Optional
+
+# Accès à la base de données
+from database import get_connection
+
+
+# Transforme une saisie libre en requête FTS5 sûre :
+# chaque mot devient un préfixe entre guillemets, tous les mots sont requis
+def requete_fts(texte: str) -> str:
+    mots = re.findall(r"\w+", texte or "")
+    return " ".join(f'"{m}"*' for m in mots)
+
+
+# Retourne les ids des affaires correspondant au texte, les plus pertinentes d'abord
+def rechercher_affaires(texte: str, limit: Optional[int] = None) -> List[int]:
+    requete = requete_fts(texte)
+    if not requete:
+        return []
+
+    conn = get_connection()
+    cur = conn.cursor()
+
+    # LIMIT -1 = pas de limite
+    cur.execute(
+        """
+        SELECT rowid
+        FROM RechercheAffaire
+        WHERE RechercheAffaire MATCH ?
+        ORDER BY rank
+        LIMIT ?
+        """,
+        (requete, -1 if limit is None else limit),
+    )
+    ids = [r[0] for r in cur.fetchall()]
+
+    conn.close()
+    return ids
@@ -0,0 +1,223 @@
+"""
+
+Suivi des champs modifiés des objets métier (dirty tracking).
+
+Chaque modèle (dataclass) hérite de SuiviModifications : toute affectation
+d'une colonne qui change réellement sa valeur est notée, et save() n'écrit
+que ces colonnes (rien du tout si l'objet n'a pas changé depuis son
+chargement ou sa dernière sauvegarde).
+
+"""
+
+# Introspection des champs des dataclasses
+from dataclasses import dataclass, field, fields
+
+# Types pour annotations
+from typing import Iterator, List, Optional
+
+# Fonctions utilitaires pour accéder à la base de données
+from database import update, update_many, get_by_id, iter_rows, apres_commit
+
+# Cache des instances déjà chargées (même id -> même objet)
+from backend.identity_map import identity_map
+
+
+# Colonnes suivies, calculées une fois par modèle
+_colonnes_par_modele = {}
+
+# Plan de construction rapide (champs de la ligne, champs par défaut), par modèle
+_plans_par_modele = {}
+
+
+# Dataclass à slots, comme les modèles : seul attribut d'instance du mixin.
+# _modifies vaut None tant que __init__ n'est pas terminé (suivi inactif).
+@dataclass(slots=True)
+class SuiviModifications:
+    _modifies: Optional[set] = field(default=None, init=False, repr=False, compare=False)
+
+    # Nom de la table SQL et clé primaire (définis par chaque modèle)
+    TABLE_NAME = ""
+    PK = ""
+
+    # Appelée automatiquement après __init__ (dataclass) : l'objet est « propre »
+    def __post_init__(self):
+        self.marquer_propre()
+
+    # Colonnes SQL du modèle (champs du constructeur, sauf la clé primaire)
+    @classmethod
+    def colonnes(cls):
+        colonnes = _colonnes_par_modele.get(cls)
+        if colonnes is None:
+            colonnes = _colonnes_par_modele[cls] = frozenset(
+                f.name for f in fields(cls) if f.init and f.name != cls.PK
+            )
+        return colonnes
+
+    # Champs remplis depuis une ligne SQL (ordre des colonnes de la table)
+    # et champs hors constructeur avec leur valeur par défaut
+    @classmethod
+    def _plan_construction(cls):
+        plan = _plans_par_modele.get(cls)
+        if plan is None:
+            champs = [f for f in fields(cls) if f.name != "_modifies"]
+            plan = _plans_par_modele[cls] = (
+                tuple(f.name for f in champs if f.init),
+                tuple((f.name, f.default) for f in champs if not f.init),
+            )
+        return plan
+
+    # Construit une instance directement depuis une ligne écrite par nous-mêmes :
+    # ni __init__, ni validation, ni suivi des affectations.
+    # Réservé aux lignes lues en base (les données saisies passent par le constructeur).
+    @classmethod
+    def from_trusted_row(cls, row: tuple):
+        return cls.from_trusted_rows((row,))[0]
+
+    # Version par lot de from_trusted_row (chargements de listes entières)
+    @classmethod
+    def from_trusted_rows(cls, rows) -> list:
+        noms, defauts = cls._plan_construction()
+        nouveau = object.__new__
+        affecter = object.__setattr__
+
+        objets = []
+        for row in rows:
+            obj = nouveau(cls)
+            for nom, valeur in zip(noms, row):
+                affecter(obj, nom, valeur)
+            for nom, valeur in defauts:
+                affecter(obj, nom, valeur)
+            affecter(obj, "_modifies", set())
+            objets.append(obj)
+        return objets
+
+    # Parcourt toutes les lignes de la table sans les charger d'un coup
+    # (mémoire constante, quel que soit le nombre de lignes)
+    @classmethod
+    def iter_all(cls, batch_size: int = 1000, where: Optional[str] = None, params=()) -> Iterator:
+        for row in iter_rows(cls.TABLE_NAME, where=where, params=params, batch_size=batch_size, pk=cls.PK):
+            yield cls.from_trusted_row(row)
+
+    # Page de `limit` objets d'id > after_id (pagination par clé :
+    # la page suivante commence après l'id du dernier objet retourné)
+    @classmethod
+    def page(cls, after_id: Optional[int] = None, limit: int = 50) -> List:
+        return cls.from_trusted_rows(
+            iter_rows(cls.TABLE_NAME, after_id=after_id, limit=limit, batch_size=limit, pk=cls.PK)
+        )
+
+    # Intercepte les affectations pour noter les colonnes modifiées
+    def __setattr__(self, nom, valeur):
+        # Hors colonnes ou pendant __init__ (suivi pas encore actif) : affectation simple
+        if nom not in self.colonnes() or self._modifies is None:
+            object.__setattr__(self, nom, valeur)
+            return
+        modifies = self._modifies
+
+        # Valeur comparée après affectation (un setter peut la normaliser)
+        ancienne = getattr(self, nom)
+        object.__setattr__(self, nom, valeur)
+        if getattr(self, nom) != ancienne:
+            modifies.add(nom)
+
+    # Oublie les modifications (objet identique à la ligne en base)
+    def marquer_propre(self) -> None:
+        object.__setattr__(self, "_modifies", set())
+
+    # Vrai si au moins une colonne a changé depuis le chargement
+    @property
+    def est_modifie(self) -> bool:
+        return bool(self._modifies)
+
+    # Colonnes modifiées et leur valeur SQL (format de to_dict)
+    def champs_modifies(self) -> dict:
+        return {k: v for k, v in self.to_dict().items() if k in self._modifies}
+
+    # Sauvegarde uniquement les colonnes modifiées.
+    # Retourne True si un UPDATE a été envoyé.
+    def save(self) -> bool:
+        id_ = getattr(self, self.PK)
+        if id_ is None:
+            return False
+
+        data = self.champs_modifies()
+        if not data:
+            return False
+
+        update(self.TABLE_NAME, id_, data, pk=self.PK)
+
+        # Une autre instance en cache pour cet id serait désormais périmée
+        identity_map.invalidate(self.TABLE_NAME, id_, sauf=self)
+
+        # Colonnes envoyées oubliées une fois l'écriture validée (tout de suite
+        # hors transaction) ; si la transaction est annulée, elles restent à
+        # écrire. Une colonne modifiée de nouveau entre-temps reste suivie.
+        def valider():
+            actuels = self.champs_modifies()
+            self._modifies.difference_update(
+                [k for k, v in data.items() if k in actuels and actuels[k] == v]
+            )
+
+        apres_commit(valider)
+        return True
+
+    # Met à jour dynamiquement plusieurs attributs puis sauvegarde
+    def update(self, **kwargs) -> bool:
+        for key, value in kwargs.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+        return self.save()
+
+    # Valeurs SQL à écrire pour un UPDATE par id (colonnes inconnues ignorées)
+    @classmethod
+    def valeurs_sql(cls, data: dict) -> dict:
+        colonnes = cls.colonnes()
+        return cls.normaliser_valeurs({k: v for k, v in data.items() if k in colonnes})
+
+    # Conversions propres au modèle (redéfini par les sous-classes)
+    @classmethod
+    def normaliser_valeurs(cls, valeurs: dict) -> dict:
+        return valeurs
+
+    # Met à jour une ligne par son id en une seule requête, sans la charger.
+    # Retourne False si la ligne n'existe pas.
+    @classmethod
+    def maj_par_id(cls, id_: int, data: dict) -> bool:
+        valeurs = cls.valeurs_sql(data)
+
+        # Rien à écrire : seule l'existence de la ligne est vérifiée
+        if not valeurs:
+            return get_by_id(cls.TABLE_NAME, id_, pk=cls.PK) is not None
+
+        existe = update(cls.TABLE_NAME, id_, valeurs, pk=cls.PK) > 0
+
+        # L'instance en cache ne reflète plus la ligne
+        identity_map.invalidate(cls.TABLE_NAME, id_)
+        return existe
+
+    # Met à jour plusieurs lignes par id en une seule transaction.
+    # changements : {id: {colonne: valeur}} ; retourne le nombre de lignes modifiées
+    @classmethod
+    def maj_lot(cls, changements: dict) -> int:
+        lignes = [(id_, cls.valeurs_sql(data)) for id_, data in changements.items()]
+        lignes = [(id_, valeurs) for id_, valeurs in lignes if valeurs]
+        if not lignes:
+            return 0
+
+        modifiees = update_many(cls.TABLE_NAME, lignes, pk=cls.PK)
+
+        # Les instances en cache ne reflètent plus les lignes
+        for id_, _ in lignes:
+            identity_map.invalidate(cls.TABLE_NAME, id_)
+        return modifiees
+
+    # Met à jour par id : via l'instance en cache si elle existe (seules les
+    # colonnes réellement changées sont écrites), sinon directement en base
+    @classmethod
+    def maj(cls, id_: int, data: dict) -> bool:
+        obj: Optional[SuiviModifications] = identity_map.get(cls.TABLE_NAME, id_)
+        if obj is None:
+            return cls.maj_par_id(id_, data)
+
+        obj.update(**data)
+        return True
@@ -11,7 +11,13 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 # Fonctions utilitaires DB
-from database import insert, get_all, get_by_id, update, delete
+from database import insert, insert_many, get_all, get_by_id, delete
+
+# Cache des instances déjà chargées (même id -> même objet)
+from backend.identity_map import identity_map
+
+# Suivi des colonnes modifiées (save() n'écrit que celles-ci)
+from backend.suivi import SuiviModifications
 
 
 # Exception personnalisée pour validation du suspect
@@ -33,8 +39,8 @@ def ensure_bool(func):
 
 
 # Représente un suspect
-@dataclass
-class Suspect:
+@dataclass(slots=True)
+class Suspect(SuiviModifications):
     # Identifiant unique du suspect
     id_suspect: Optional[int]
 
@@ -54,6 +60,7 @@ class Suspect:
 
     # Nom de la table SQL
     TABLE_NAME = "Suspect"
+    PK = "id_suspect"
 
     # Alias pour l'id
     @property
@@ -65,10 +72,10 @@ class Suspect:
     def uid(self):
         return f"S{self.id_suspect}"
 
-    # Getter du casier
+    # Getter du casier (lu en base, le casier est l'entier 0/1)
     @property
     def a_casier(self) -> bool:
-        return self.casier
+        return bool(self.casier)
 
     # Setter du casier avec validation via décorateur
     @a_casier.setter
@@ -120,36 +127,49 @@ class Suspect:
         new_id = insert(cls.TABLE_NAME, data)
         return cls(new_id, nom, prenom, age, adresse, description, casier)
 
+    # Crée plusieurs suspects en une transaction
+    # suspects : liste de dicts avec les paramètres de create()
+    @classmethod
+    def create_many(cls, suspects) -> List["Suspect"]:
+        objets = [cls(None, **s) for s in suspects]
+        ids = insert_many(cls.TABLE_NAME, [o.to_dict() for o in objets])
+        for o, new_id in zip(objets, ids):
+            o.id_suspect = new_id
+        return objets
+
     # Récupère un suspect par id
     @classmethod
     def get(cls, id_suspect: int) -> Optional["Suspect"]:
+        suspect = identity_map.get(cls.TABLE_NAME, id_suspect)
+        if suspect is not None:
+            return suspect
+
         row = get_by_id(cls.TABLE_NAME, id_suspect, pk="id_suspect")
-        return cls.from_row(row) if row else None
+        if not row:
+            return None
+        return identity_map.add(cls.TABLE_NAME, id_suspect, cls.from_trusted_row(row))
 
     # Récupère tous les suspects
     @classmethod
     def all(cls) -> List["Suspect"]:
-        return [cls.from_row(r) for r in get_all(cls.TABLE_NAME)]
+        return cls.from_trusted_rows(get_all(cls.TABLE_NAME))
 
-    # Met à jour les champs du suspect
-    def update(self, **kwargs):
-        for k, v in kwargs.items():
-            if hasattr(self, k):
-                setattr(self, k, v)
-        update(self.TABLE_NAME, self.id_suspect, self.to_dict(), pk="id_suspect")
+    # Valeurs SQL d'une mise à jour par id (casier stocké en entier)
+    @classmethod
+    def normaliser_valeurs(cls, valeurs: dict) -> dict:
+        if "casier" in valeurs:
+            valeurs["casier"] = int(bool(valeurs["casier"]))
+        return valeurs
 
     # Met à jour la position graphique
+    # (seules les coordonnées modifiées sont écrites)
     def update_position(self, x, y):
         self.pos_x = x
         self.pos_y = y
-        update(
-            self.TABLE_NAME,
-            self.id_suspect,
-            {"pos_x": x, "pos_y": y},
-            pk="id_suspect"
-        )
+        self.save()
 
     # Supprime le suspect
     def delete(self):
         delete(self.TABLE_NAME, self.id_suspect, pk="id_suspect")
+        identity_map.invalidate(self.TABLE_NAME, self.id_suspect)
         self.id_suspect = None
@@ -0,0 +1,59 @@
+"""
+
+Tampon d'écriture des positions graphiques (affaires, suspects).
+
+Les déplacements sont regroupés par entité : seule la dernière position
+connue de chaque affaire ou suspect est conservée, puis toutes sont
+écrites d'un coup (executemany, une seule transaction) lors du vidage.
+Un glisser-déposer ou une réorganisation du mur ne coûte ainsi qu'une
+transaction, quel que soit le nombre de mouvements.
+
+"""
+
+# Verrou : des positions peuvent être ajoutées depuis un autre thread
+import threading
+
+# Types pour annotations
+from typing import Dict, Tuple
+
+
+class TamponPositions:
+
+    # Entités acceptées
+    ENTITES = ("affaire", "suspect")
+
+    def __init__(self):
+        # entité -> {id: (x, y)}
+        self._positions: Dict[str, Dict[int, Tuple[int, int]]] = {e: {} for e in self.ENTITES}
+        self._lock = threading.Lock()
+
+    # Nombre de positions en attente d'écriture
+    def __len__(self):
+        with self._lock:
+            return sum(len(p) for p in self._positions.values())
+
+    # Enregistre une position (remplace la précédente pour la même entité)
+    def ajouter(self, entite: str, id_: int, x: int, y: int) -> None:
+        if entite not in self._positions:
+            raise ValueError(f"Entité inconnue pour une position : {entite}")
+        with self._lock:
+            self._positions[entite][id_] = (int(x), int(y))
+
+    # Position en attente pour une entité (None si aucune)
+    def en_attente(self, entite: str, id_: int):
+        with self._lock:
+            return self._positions.get(entite, {}).get(id_)
+
+    # Retire et retourne toutes les positions en attente : {entité: {id: (x, y)}}
+    def extraire(self) -> Dict[str, Dict[int, Tuple[int, int]]]:
+        with self._lock:
+            positions = self._positions
+            self._positions = {e: {} for e in self.ENTITES}
+        return positions
+
+    # Remet des positions extraites (écriture échouée), sans écraser les plus récentes
+    def restaurer(self, positions: Dict[str, Dict[int, Tuple[int, int]]]) -> None:
+        with self._lock:
+            for entite, par_id in positions.items():
+                for id_, xy in par_id.items():
+                    self._positions[entite].setdefault(id_, xy)
@@ -0,0 +1,157 @@
+"""
+
+Banc de mesure des chemins critiques du backend, à différentes échelles.
+
+Utilisation :
+    python -m bench.benchmark --echelles 1000 10000 --sortie bench_resultats.json
+
+Pour chaque échelle, une base neuve est générée (bench.generateur), puis
+chaque opération est chronométrée plusieurs fois. Les résultats sont écrits
+en JSON pour être comparés d'une version à l'autre.
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+import os
+from datetime import datetime
+
+from bench.generateur import base_neuve, generer
+from backend import GestionEnquetes
+from backend.affaire import Affaire
+from database import get_all
+
+
+def chronometrer(fonction, repetitions: int) -> dict:
+    """
+    Exécute `fonction` plusieurs fois et retourne les temps en secondes.
+    """
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        temps.append(time.perf_counter() - debut)
+    return {
+        "min": min(temps),
+        "moyenne": sum(temps) / len(temps),
+        "repetitions": repetitions,
+    }
+
+
+def operations(gestion: GestionEnquetes, rng: random.Random) -> dict:
+    """
+    Opérations mesurées : {nom: fonction sans argument}.
+    Les filtres reproduisent ceux de gui/filtre_popup.py.
+    """
+    suspects = gestion.get_suspects()
+    armes = gestion.get_armes()
+    affaires = gestion.get_affaires()
+    suspect = rng.choice(suspects)
+    arme = rng.choice(armes)
+    a_deplacer = rng.sample(affaires, min(200, len(affaires)))
+    lignes = get_all("Affaire")
+
+    def filtre_statut(statut):
+        return gestion.filtre().statut(statut).affaires()
+
+    def filtre_suspect():
+        return gestion.filtre().suspect(suspect.id_suspect).affaires()
+
+    def filtre_arme():
+        return gestion.filtre().arme(arme.id_arme).affaires()
+
+    def filtre_dates():
+        return gestion.filtre().entre_dates(datetime(2018, 1, 1), datetime(2019, 12, 31)).affaires()
+
+    def filtre_combine():
+        return gestion.filtre().en_cours().suspect(suspect.id_suspect).entre_dates(
+            datetime(2018, 1, 1), datetime(2019, 12, 31)
+        ).affaires()
+
+    def creation_en_lot():
+        gestion.creer_suspects([
+            {"nom": f"Bench{i}", "prenom": "Lot"} for i in range(1000)
+        ])
+
+    def maj_positions():
+        for a in a_deplacer:
+            gestion.maj_position_affaire_differee(a.id_affaire, a.pos_x + 1, a.pos_y + 1)
+        gestion.vider_positions()
+
+    return {
+        "get_affaires": gestion.get_affaires,
+        "get_affaires_relations": lambda: gestion.get_affaires(with_relations=True),
+        "liens": gestion.get_liens,
+        "paires_liees": gestion.get_paires_liees,
+        "filtre_en_cours": lambda: filtre_statut("en cours"),
+        "filtre_classees": lambda: filtre_statut("classée"),
+        "filtre_texte": lambda: gestion.filtre().texte("vol musee").affaires(),
+        "filtre_suspect": filtre_suspect,
+        "filtre_arme": filtre_arme,
+        "filtre_dates": filtre_dates,
+        "filtre_combine": filtre_combine,
+        "chronologie_2018": lambda: gestion.chronologie(datetime(2018, 1, 1), datetime(2018, 12, 31)),
+        "table_affaires": gestion.get_table_affaires,
+        "construction_from_row": lambda: [Affaire.from_row(r) for r in lignes],
+        "construction_trusted": lambda: Affaire.from_trusted_rows(lignes),
+        "creation_en_lot_1000_suspects": creation_en_lot,
+        "maj_positions_200": maj_positions,
+    }
+
+
+def executer(echelles, repetitions: int, dossier: str, graine: int = 42) -> dict:
+    resultats = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "repetitions": repetitions,
+        },
+        "echelles": {},
+    }
+
+    for echelle in echelles:
+        base_neuve(os.path.join(dossier, f"bench_{echelle}.db"))
+
+        debut = time.perf_counter()
+        compte = generer(echelle, graine)
+        duree_generation = time.perf_counter() - debut
+
+        gestion = GestionEnquetes()
+        mesures = {}
+        for nom, fonction in operations(gestion, random.Random(graine)).items():
+            mesures[nom] = chronometrer(fonction, repetitions)
+            print(f"[{echelle:>7}] {nom:32} {mesures[nom]['min'] * 1000:10.1f} ms")
+
+        resultats["echelles"][str(echelle)] = {
+            "lignes": compte,
+            "generation_s": duree_generation,
+            "mesures": mesures,
+        }
+
+    return resultats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de mesure du backend detectives.")
+    parser.add_argument("--echelles", type=int, nargs="+", default=[1000], help="nombres d'affaires")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", default="bench_resultats.json", help="fichier JSON de résultats")
+    parser.add_argument("--dossier", default=None, help="dossier des bases générées (temporaire par défaut)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resultats = executer(args.echelles, args.repetitions, args.dossier or tmp)
+
+    with open(args.sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
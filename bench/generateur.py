@@ -0,0 +1,163 @@
+"""
+
+Générateur de jeux de données synthétiques pour mesurer l'application à l'échelle.
+
+Utilisation :
+    python -m bench.generateur --echelle 10000 --db bench.db
+
+"""
+
+import argparse
+import os
+import random
+from datetime import date, timedelta
+
+import database
+from database import init_db, insert_many, transaction, get_connection
+
+# Vocabulaire utilisé pour fabriquer des données réalistes
+TYPES_AFFAIRE = ["Vol", "Meurtre", "Cambriolage", "Disparition", "Fraude", "Incendie", "Agression", "Enlèvement"]
+LIEUX_AFFAIRE = ["au château", "à la gare", "au musée", "sur le port", "à la banque", "au manoir", "au parc", "à l'entrepôt"]
+PRENOMS = ["Jean", "Marie", "Paul", "Sophie", "Luc", "Emma", "Hugo", "Léa", "Louis", "Chloé", "Jules", "Alice"]
+NOMS = ["Dupont", "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand", "Leroy", "Moreau", "Simon", "Laurent"]
+TYPES_ARME = ["Couteau", "Revolver", "Fusil", "Corde", "Poison", "Chandelier", "Clé anglaise", "Batte"]
+NOMS_LIEU = ["Entrepôt", "Ruelle", "Appartement", "Parking", "Quai", "Bureau", "Cave", "Jardin"]
+NOMS_VILLE = ["Bruxelles", "Namur", "Liège", "Mons", "Charleroi", "Louvain", "Wavre", "Gand", "Bruges", "Arlon"]
+
+
+def _choix_biaise(rng: random.Random, n: int) -> int:
+    """
+    Index dans [0, n) : 30 % des tirages tombent dans les 10 % premiers
+    index (entités récurrentes, qui créent des liens), le reste est uniforme.
+    Le nombre de paires liées reste ainsi proportionnel à l'échelle.
+    """
+    if rng.random() < 0.3:
+        return rng.randrange(max(1, n // 10))
+    return rng.randrange(n)
+
+
+def base_neuve(chemin: str):
+    """
+    Supprime chemin (et ses fichiers WAL) puis y crée une base vide.
+    """
+    database.close_pool()
+    for suffixe in ("", "-wal", "-shm"):
+        if os.path.exists(chemin + suffixe):
+            os.remove(chemin + suffixe)
+    database.DB_NAME = chemin
+    init_db()
+
+
+def generer(echelle: int, graine: int = 42) -> dict:
+    """
+    Remplit la base courante (database.DB_NAME) avec `echelle` affaires,
+    et des suspects, armes, lieux et villes en proportion.
+    Retourne le nombre de lignes créées par table.
+    """
+    rng = random.Random(graine)
+
+    nb_villes = max(10, echelle // 50)
+    nb_suspects = max(10, echelle // 2)
+    nb_armes = max(10, echelle // 3)
+    nb_lieux = max(10, echelle // 3)
+
+    with transaction():
+        # Villes
+        villes = [
+            {"code_postal": str(1000 + i), "nom": f"{NOMS_VILLE[i % len(NOMS_VILLE)]} {i // len(NOMS_VILLE) or ''}".strip()}
+            for i in range(nb_villes)
+        ]
+        insert_many("Ville", villes)
+
+        # Affaires (dates sur 10 ans, ~70 % en cours, positions en grille)
+        debut = date(2015, 1, 1)
+        affaires = []
+        for i in range(echelle):
+            ville = villes[_choix_biaise(rng, nb_villes)]
+            jour = debut + timedelta(days=rng.randrange(3650))
+            affaires.append({
+                "titre": f"{rng.choice(TYPES_AFFAIRE)} {rng.choice(LIEUX_AFFAIRE)} #{i}",
+                "date": jour.strftime("%d-%m-%Y"),
+                "lieu": ville["nom"],
+                "code_postal": ville["code_postal"],
+                "statut": "en cours" if rng.random() < 0.7 else "classée",
+                "description": rng.choice([None, "Témoin principal introuvable", "Indices relevés sur place"]),
+                "pos_x": 40 + (i % 40) * 240,
+                "pos_y": 40 + (i // 40) * 240,
+            })
+        ids_affaires = insert_many("Affaire", affaires)
+
+        # Suspects, armes et lieux
+        ids_suspects = insert_many("Suspect", [
+            {
+                "nom": rng.choice(NOMS),
+                "prenom": rng.choice(PRENOMS),
+                "description": None,
+                "casier": int(rng.random() < 0.3),
+            }
+            for _ in range(nb_suspects)
+        ])
+        ids_armes = insert_many("Arme", [
+            {
+                "type": rng.choice(TYPES_ARME),
+                "description": None,
+                "numero_serie": f"SN-{rng.randrange(10 ** 6):06d}" if rng.random() < 0.5 else None,
+                "id_affaire": rng.choice(ids_affaires),
+            }
+            for _ in range(nb_armes)
+        ])
+        ids_lieux = insert_many("Lieu", [
+            {
+                "nom": rng.choice(NOMS_LIEU),
+                "adresse": f"{rng.randrange(1, 200)} rue {rng.choice(NOMS)}",
+                "type": None,
+                "id_affaire": rng.choice(ids_affaires),
+            }
+            for _ in range(nb_lieux)
+        ])
+
+        # Liaisons : 0 à 3 suspects, 0 à 2 armes et 0 à 2 lieux par affaire
+        liaisons = {"AffaireSuspect": set(), "AffaireArme": set(), "AffaireLieu": set()}
+        for id_affaire in ids_affaires:
+            for _ in range(rng.randint(0, 3)):
+                liaisons["AffaireSuspect"].add((id_affaire, ids_suspects[_choix_biaise(rng, nb_suspects)]))
+            for _ in range(rng.randint(0, 2)):
+                liaisons["AffaireArme"].add((id_affaire, ids_armes[_choix_biaise(rng, nb_armes)]))
+            for _ in range(rng.randint(0, 2)):
+                liaisons["AffaireLieu"].add((id_affaire, ids_lieux[_choix_biaise(rng, nb_lieux)]))
+
+        conn = get_connection()
+        for table, colonne in (("AffaireSuspect", "id_suspect"), ("AffaireArme", "id_arme"), ("AffaireLieu", "id_lieu")):
+            conn.executemany(
+                f"INSERT INTO {table} (id_affaire, {colonne}) VALUES (?, ?)",
+                sorted(liaisons[table]),
+            )
+        conn.close()
+
+    return {
+        "Ville": nb_villes,
+        "Affaire": echelle,
+        "Suspect": nb_suspects,
+        "Arme": nb_armes,
+        "Lieu": nb_lieux,
+        "AffaireSuspect": len(liaisons["AffaireSuspect"]),
+        "AffaireArme": len(liaisons["AffaireArme"]),
+        "AffaireLieu": len(liaisons["AffaireLieu"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère une base detectives synthétique.")
+    parser.add_argument("--echelle", type=int, default=1000, help="nombre d'affaires")
+    parser.add_argument("--db", default="bench.db", help="fichier SQLite à (re)créer")
+    parser.add_argument("--graine", type=int, default=42)
+    args = parser.parse_args()
+
+    base_neuve(args.db)
+    compte = generer(args.echelle, args.graine)
+    for table, n in compte.items():
+        print(f"{table:15} {n}")
+
+
+if __name__ == "__main__":
+    main()
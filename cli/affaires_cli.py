@@ -1,8 +1,8 @@
 from backend import GestionEnquetes
 from datetime import datetime
+from itertools import chain
 import re
 from typing import Optional
-from filtre_affaires import FiltreAffairesCLI
 
 gestion = GestionEnquetes()
 
@@ -76,15 +76,21 @@ def saisie_statut() -> str:
 
 
 def lister_affaires_court():
-    affaires = gestion.get_affaires()
-    if not affaires:
+    # Lecture en continu des seules colonnes affichées
+    nb = 0
+    lignes = gestion.iter_colonnes_affaires(("id_affaire", "titre", "code_postal", "lieu", "statut"))
+    for id_affaire, titre, code_postal, lieu, statut in lignes:
+        if nb == 0:
+            print("\n📂 Affaires :")
+        nb += 1
+        ville_str = f"{code_postal or '----'} {lieu or ''}".strip()
+        print(f"🆔 {id_affaire} | {titre} | {ville_str} | {statut}")
+
+    if nb == 0:
         print("❌ Aucune affaire trouvée.")
-        return []
-    print(f"\n📂 {len(affaires)} affaire(s) :")
-    for a in affaires:
-        ville_str = f"{a.code_postal or '----'} {a.lieu or ''}".strip()
-        print(f"🆔 {a.id_affaire} | {a.titre} | {ville_str} | {a.statut}")
-    return affaires
+    else:
+        print(f"📂 {nb} affaire(s)")
+    return nb
 
 
 
@@ -371,28 +377,28 @@ def afficher_menu():
 # ================================
 
 def action_lister():
-    affaires = gestion.get_affaires()
-    if not affaires:
+    # Affaires lues page par page, suspects, armes et lieux préchargés par page
+    affaires = gestion.iter_affaires(with_relations=True)
+    premiere = next(affaires, None)
+    if premiere is None:
         print("❌ Aucune affaire trouvée.")
         return
 
+    villes = dict(gestion.get_villes())
+
     print("\n" + "═" * 60)
     print("📂 LISTE DES AFFAIRES")
     print("═" * 60)
 
-    for a in affaires:
+    for a in chain((premiere,), affaires):
         suspects = a.get_suspects()
         armes = a.get_armes()
         lieux = a.get_lieux()
 
         # Ville (nom + CP)
         ville_str = "Non définie"
-        if a.code_postal:
-            vrows = gestion.get_villes()
-            for cp, nom in vrows:
-                if cp == a.code_postal:
-                    ville_str = f"{nom} ({cp})"
-                    break
+        if a.code_postal in villes:
+            ville_str = f"{villes[a.code_postal]} ({a.code_postal})"
 
         if lieux:
             texte_lieux = []
@@ -454,88 +460,46 @@ def action_lister():
 
 
 
-def action_filtre():
-    print("\n📋 AFFAIRES DISPONIBLES :")
-    lister_affaires_court()
-
-
-    print("\n🔍 FILTRES DISPONIBLES:")
-    print("1. Affaires en cours")
-    print("2. Affaires classées")
-    print("3. Rechercher un mot (titre/lieu/ville)")
-    print("4. Entre deux dates")
-    print("5. Par suspect")
-    print("6. Par arme")
-    print("0. Retour")
-    print()
-
-    choix = input("Votre choix : ").strip()
-
-    if choix == "0":
-        return
-
-    affaires = gestion.get_affaires()
-    filtre = FiltreAffairesCLI(affaires)
-
-
-
+def ajouter_critere(filtre, choix: str) -> bool:
+    """Ajoute au filtre le critère choisi dans le menu ; False si annulé."""
     if choix == "1":
-        affaires = filtre.en_cours()
+        filtre.en_cours()
 
     elif choix == "2":
-        affaires = filtre.classees()
+        filtre.classees()
 
     elif choix == "3":
-        texte = input("Mot à chercher : ").strip().lower()
-        resultats = []
-        for a in affaires:
-            # titre + champ lieu
-            haystack = [a.titre.lower(), (a.lieu or "").lower()]
-
-            # ajouter le nom de ville si on le trouve
-            nom_ville = None
-            if a.code_postal:
-                villes = gestion.get_villes()
-                for cp, nom in villes:
-                    if cp == a.code_postal:
-                        nom_ville = nom
-                        break
-            if nom_ville:
-                haystack.append(nom_ville.lower())
-
-            if any(texte in h for h in haystack):
-                resultats.append(a)
-        affaires = resultats
+        texte = input("Mot à chercher : ").strip()
+        # Index plein texte : titre, description, lieu, ville, suspects, armes, lieux
+        filtre.texte(texte)
 
     elif choix == "4":
         dmin = input("Date minimum (JJ-MM-AAAA, Entrée pour annuler) : ").strip()
         if dmin and not valider_date_fr(dmin):
             print("❌ Date minimum invalide, filtre annulé.")
-            return
+            return False
 
         dmax = input("Date maximum (JJ-MM-AAAA, Entrée pour annuler) : ").strip()
         if dmax and not valider_date_fr(dmax):
             print("❌ Date maximum invalide, filtre annulé.")
-            return
+            return False
 
         # si les deux sont vides, on annule aussi
         if not dmin and not dmax:
             print("ℹ️ Aucun intervalle fourni, retour au menu.")
-            return
-
-        # appliquer le filtre
-        if dmin:
-            affaires = [a for a in affaires if a.date >= dmin]
-        if dmax:
-            affaires = [a for a in affaires if a.date <= dmax]
+            return False
 
+        filtre.entre_dates(
+            datetime.strptime(dmin, "%d-%m-%Y") if dmin else None,
+            datetime.strptime(dmax, "%d-%m-%Y") if dmax else None,
+        )
 
     elif choix == "5":
 
         tous_suspects = gestion.get_suspects()
         if not tous_suspects:
             print("❌ Aucun suspect dans la base.")
-            return
+            return False
 
         print("\n👥 SUSPECTS DISPONIBLES :")
         for s in tous_suspects:
@@ -546,22 +510,16 @@ def action_filtre():
             sid = int(id_str)
         except ValueError:
             print("❌ ID invalide.")
-            return
+            return False
 
-
-        resultats = []
-        for a in affaires:
-            ids = {s.id_suspect for s in a.get_suspects()}
-            if sid in ids:
-                resultats.append(a)
-        affaires = resultats
+        filtre.suspect(sid)
 
     elif choix == "6":
         # Lister TOUTES les armes disponibles
         toutes_armes = gestion.get_armes()
         if not toutes_armes:
             print("❌ Aucune arme dans la base.")
-            return
+            return False
 
         print("\n🔪 ARMES DISPONIBLES :")
         for ar in toutes_armes:
@@ -575,20 +533,80 @@ def action_filtre():
             aid = int(id_str)
         except ValueError:
             print("❌ ID invalide.")
-            return
+            return False
+
+        filtre.arme(aid)
+
+    elif choix == "7":
+        tous_lieux = gestion.get_lieux()
+        if not tous_lieux:
+            print("❌ Aucun lieu dans la base.")
+            return False
 
-        # Filtrer les affaires qui ont cette arme liée
-        resultats = []
-        for a in affaires:
-            ids = {ar.id_arme for ar in a.get_armes()}
-            if aid in ids:
-                resultats.append(a)
-        affaires = resultats
+        print("\n📍 LIEUX DISPONIBLES :")
+        for l in tous_lieux:
+            adr = f" ({l.adresse})" if l.adresse else ""
+            print(f"[{l.id_lieu}] {l.nom}{adr}")
 
+        id_str = input("ID du lieu à filtrer : ").strip()
+        try:
+            lid = int(id_str)
+        except ValueError:
+            print("❌ ID invalide.")
+            return False
+
+        filtre.lieu(lid)
+
+    elif choix == "8":
+        code_postal = input("Code postal : ").strip()
+        if not code_postal:
+            print("❌ Code postal vide.")
+            return False
+
+        filtre.code_postal(code_postal)
 
     else:
         print("❌ Choix invalide.")
-        return
+        return False
+
+    return True
+
+
+def action_filtre():
+    print("\n📋 AFFAIRES DISPONIBLES :")
+    lister_affaires_court()
+
+    # Les critères choisis se cumulent puis sont exécutés en une seule requête
+    filtre = gestion.filtre()
+
+    while True:
+        print("\n🔍 FILTRES DISPONIBLES:")
+        if not filtre.est_vide():
+            print(f"   (critères actifs : {filtre.libelle()})")
+        print("1. Affaires en cours")
+        print("2. Affaires classées")
+        print("3. Rechercher un mot (titre/lieu/ville/suspects/armes...)")
+        print("4. Entre deux dates")
+        print("5. Par suspect")
+        print("6. Par arme")
+        print("7. Par lieu")
+        print("8. Par code postal")
+        print("0. Retour")
+        print()
+
+        choix = input("Votre choix : ").strip()
+
+        if choix == "0":
+            return
+
+        if not ajouter_critere(filtre, choix):
+            return
+
+        encore = input("Ajouter un autre critère ? (o/N) : ").strip().lower()
+        if encore != "o":
+            break
+
+    affaires = filtre.affaires()
 
     if not affaires:
         print("❌ Aucun résultat.")
@@ -768,14 +786,8 @@ def action_liens():
         print("❌ Affaire introuvable.")
         return
 
-    # Prépare les infos de référence
-    lieux_ref = affaire_ref.get_lieux()
-    suspects_ref = affaire_ref.get_suspects()
-    armes_ref = affaire_ref.get_armes()
-
-    ids_lieux_ref = {l.id_lieu for l in lieux_ref}
-    ids_suspects_ref = {s.id_suspect for s in suspects_ref}
-    ids_armes_ref = {a.id_arme for a in armes_ref}
+    # Entités communes (suspects, armes, lieux) calculées par le moteur de liens
+    liens_entites = gestion.get_liens_affaire(id_affaire)
 
     liens = []
     toutes = gestion.get_affaires()
@@ -798,29 +810,20 @@ def action_liens():
         if autre.lieu and affaire_ref.lieu and autre.lieu.lower() == affaire_ref.lieu.lower():
             communs.append(f"📍 Lieu principal: {affaire_ref.lieu}")
 
-        # Lieux liés communs
-        lieux_autre = autre.get_lieux()
-        ids_lieux_autre = {l.id_lieu for l in lieux_autre}
-        lieux_communs_ids = ids_lieux_ref & ids_lieux_autre
-        if lieux_communs_ids:
-            noms = [l.nom for l in lieux_autre if l.id_lieu in lieux_communs_ids]
-            communs.append("📍 Lieux liés: " + ", ".join(noms))
-
-        # Suspects communs
-        suspects_autre = autre.get_suspects()
-        ids_suspects_autre = {s.id_suspect for s in suspects_autre}
-        suspects_communs_ids = ids_suspects_ref & ids_suspects_autre
-        if suspects_communs_ids:
-            noms = [f"{s.prenom} {s.nom}" for s in suspects_autre if s.id_suspect in suspects_communs_ids]
-            communs.append("👥 Suspects: " + ", ".join(noms))
-
-        # Armes communes
-        armes_autre = autre.get_armes()
-        ids_armes_autre = {a.id_arme for a in armes_autre}
-        armes_communes_ids = ids_armes_ref & ids_armes_autre
-        if armes_communes_ids:
-            types = [a.type for a in armes_autre if a.id_arme in armes_communes_ids]
-            communs.append("🔪 Armes: " + ", ".join(types))
+        lien = liens_entites.get(autre.id_affaire)
+        if lien:
+            # Lieux liés communs
+            if lien.lieux:
+                communs.append("📍 Lieux liés: " + ", ".join(l.nom for l in lien.lieux))
+
+            # Suspects communs
+            if lien.suspects:
+                noms = [f"{s.prenom} {s.nom}" for s in lien.suspects]
+                communs.append("👥 Suspects: " + ", ".join(noms))
+
+            # Armes communes
+            if lien.armes:
+                communs.append("🔪 Armes: " + ", ".join(a.type for a in lien.armes))
 
         if communs:
             liens.append((autre, communs))
@@ -1,21 +1,351 @@
+import atexit
+import configparser
+import os
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from sqlite3 import Connection
-from typing import Optional
+from typing import Dict, List, Optional
 
 DB_NAME = "detectives.db"
 
+# Nombre maximum de connexions inactives conservées par le pool
+POOL_SIZE = int(os.environ.get("DETECTIVES_POOL_SIZE", "4"))
+
+
+# ---------------------------------------------------------------------------
+# PROFILS DE PRAGMAS SQLITE
+# ---------------------------------------------------------------------------
+# Appliqués une fois à l'ouverture de chaque connexion du pool.
+#
+# Sélection et surcharge (de la plus faible à la plus forte priorité) :
+#   1. profil choisi (clé "profil" du fichier de config ou DETECTIVES_DB_PROFILE)
+#   2. section [sqlite] du fichier de config (DETECTIVES_DB_CONFIG,
+#      par défaut detectives.ini dans le dossier courant)
+#   3. variable DETECTIVES_DB_PRAGMAS, ex. "cache_size=-64000;busy_timeout=10000"
+
+PROFILS_PRAGMAS = {
+    # Poste de travail : WAL (lectures non bloquées par une écriture),
+    # fsync allégé, cache et mmap généreux
+    "poste": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-20000",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+    },
+    # Lecteur réseau partagé : WAL n'y est pas supporté (mémoire partagée),
+    # on garde le journal classique et une attente de verrou plus longue
+    "partage": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": "-8000",
+        "mmap_size": "0",
+        "temp_store": "MEMORY",
+        "busy_timeout": "30000",
+    },
+}
+
+PROFIL_DEFAUT = "poste"
+
+_PRAGMAS_AUTORISES = {"journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout"}
+_VALEUR_PRAGMA = re.compile(r"^-?\w+$")
+
+
+def _verifier_pragmas(pragmas: Dict[str, str]) -> Dict[str, str]:
+    for nom, valeur in pragmas.items():
+        if nom not in _PRAGMAS_AUTORISES:
+            raise ValueError(f"Pragma SQLite non supporté : {nom}")
+        if not _VALEUR_PRAGMA.match(str(valeur)):
+            raise ValueError(f"Valeur invalide pour le pragma {nom} : {valeur!r}")
+    return pragmas
+
+
+def charger_pragmas() -> Dict[str, str]:
+    """
+    Retourne les pragmas à appliquer (profil + fichier de config + environnement).
+    """
+    config = configparser.ConfigParser()
+    config.read(os.environ.get("DETECTIVES_DB_CONFIG", "detectives.ini"), encoding="utf-8")
+    section = dict(config["sqlite"]) if config.has_section("sqlite") else {}
+
+    profil = section.pop("profil", PROFIL_DEFAUT)
+    profil = os.environ.get("DETECTIVES_DB_PROFILE", profil)
+    if profil not in PROFILS_PRAGMAS:
+        raise ValueError(f"Profil SQLite inconnu : {profil}")
+
+    pragmas = dict(PROFILS_PRAGMAS[profil])
+    pragmas.update(section)
+
+    for couple in os.environ.get("DETECTIVES_DB_PRAGMAS", "").split(";"):
+        if couple.strip():
+            nom, _, valeur = couple.partition("=")
+            pragmas[nom.strip()] = valeur.strip()
+
+    return _verifier_pragmas(pragmas)
+
+
+# ---------------------------------------------------------------------------
+# POOL DE CONNEXIONS
+# ---------------------------------------------------------------------------
+
+class PooledConnection(Connection):
+    """
+    Connexion SQLite empruntée au pool.
+    close() rend la connexion au pool au lieu de la fermer réellement.
+
+    Pendant une transaction ambiante (voir transaction()), commit(),
+    rollback() et close() sont sans effet : la transaction est validée
+    ou annulée une seule fois, à sa sortie.
+    """
+
+    pool = None
+
+    # True tant que la connexion porte une transaction ambiante
+    ambiante = False
+
+    def commit(self):
+        if not self.ambiante:
+            super().commit()
+
+    def rollback(self):
+        # L'exception remonte jusqu'à transaction(), qui annule tout
+        if not self.ambiante:
+            super().rollback()
+
+    def close(self):
+        if self.ambiante:
+            return
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def fermer(self):
+        """Ferme réellement la connexion SQLite."""
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Pool borné de connexions SQLite réutilisables.
+
+    - acquire() rend une connexion inactive, ou en ouvre une nouvelle
+      si aucune n'est disponible (pas de blocage)
+    - release() remet la connexion dans le pool, ou la ferme si le pool
+      contient déjà `size` connexions inactives
+    - close_all() ferme toutes les connexions inactives
+    """
+
+    def __init__(self, db_name: str, size: int = POOL_SIZE, pragmas: Optional[Dict[str, str]] = None):
+        if size < 0:
+            raise ValueError("La taille du pool doit être positive.")
+        self.db_name = db_name
+        self.size = size
+        self.pragmas = _verifier_pragmas(dict(pragmas or {}))
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _ouvrir(self) -> PooledConnection:
+        # check_same_thread=False : une connexion n'est utilisée que par
+        # un seul thread à la fois, mais peut changer de thread entre deux prêts
+        conn = sqlite3.connect(
+            self.db_name,
+            factory=PooledConnection,
+            check_same_thread=False,
+        )
+        # Active les clés étrangères une seule fois par connexion physique
+        conn.execute("PRAGMA foreign_keys = ON;")
+
+        # Profil de performance (WAL, cache, mmap, ...)
+        for nom, valeur in self.pragmas.items():
+            conn.execute(f"PRAGMA {nom} = {valeur};")
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._ouvrir()
+        conn.pool = self
+        return conn
+
+    def release(self, conn: PooledConnection):
+        if conn.pool is not self:
+            # Connexion déjà rendue (double close) : rien à faire
+            return
+        conn.pool = None
+
+        # Une transaction non validée ne doit pas fuiter vers l'emprunteur suivant
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.fermer()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.fermer()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Retourne le pool associé à DB_NAME (recréé si DB_NAME a changé).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.db_name != DB_NAME:
+            if _pool is not None:
+                _pool.close_all()
+            _pool = ConnectionPool(DB_NAME, POOL_SIZE, charger_pragmas())
+        return _pool
+
+
+def configure_pool(size: int):
+    """
+    Modifie le nombre de connexions inactives conservées par le pool.
+    """
+    global POOL_SIZE
+    if size < 0:
+        raise ValueError("La taille du pool doit être positive.")
+    POOL_SIZE = size
+    pool = get_pool()
+    pool.size = size
+    # Ferme les connexions excédentaires
+    with pool._lock:
+        excedent = pool._idle[size:]
+        del pool._idle[size:]
+    for conn in excedent:
+        conn.fermer()
+
+
+def close_pool():
+    """
+    Ferme toutes les connexions du pool (appelé automatiquement à la sortie).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+atexit.register(close_pool)
+
+
+# ---------------------------------------------------------------------------
+# TRANSACTIONS (UNITÉ DE TRAVAIL)
+# ---------------------------------------------------------------------------
+
+# Connexion de la transaction ambiante, propre à chaque thread
+_ambiante = threading.local()
+
 
 def get_connection() -> Connection:
-    conn = sqlite3.connect(DB_NAME)
-    # Active les clés étrangères pour chaque connexion
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    # Dans une transaction ambiante, tous les appels partagent sa connexion
+    conn = getattr(_ambiante, "conn", None)
+    if conn is not None:
+        return conn
+
+    # Sinon emprunte une connexion au pool : conn.close() la rend au pool
+    return get_pool().acquire()
+
+
+@contextmanager
+def transaction():
+    """
+    Regroupe plusieurs écritures dans une seule transaction :
+
+        with transaction():
+            insert(...)
+            update(...)
+
+    Toutes les fonctions passant par get_connection() réutilisent la même
+    connexion ; un seul commit est fait à la sortie, ou un rollback si une
+    exception est levée. Une transaction imbriquée devient un SAVEPOINT.
+    """
+    conn = getattr(_ambiante, "conn", None)
+
+    # Transaction imbriquée : point de sauvegarde dans la transaction en cours
+    if conn is not None:
+        _ambiante.profondeur += 1
+        nom = f"sp_{_ambiante.profondeur}"
+        # Les fonctions différées enregistrées dans ce bloc sont oubliées s'il est annulé
+        differees = len(_ambiante.apres_commit)
+        conn.execute(f"SAVEPOINT {nom}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {nom}")
+            conn.execute(f"RELEASE {nom}")
+            del _ambiante.apres_commit[differees:]
+            raise
+        else:
+            conn.execute(f"RELEASE {nom}")
+        finally:
+            _ambiante.profondeur -= 1
+        return
+
+    conn = get_pool().acquire()
+    # IMMEDIATE : verrou d'écriture pris dès le début (pas de SQLITE_BUSY en cours de route)
+    conn.execute("BEGIN IMMEDIATE")
+    conn.ambiante = True
+    _ambiante.conn = conn
+    _ambiante.profondeur = 0
+    _ambiante.apres_commit = []
+    try:
+        yield conn
+    except BaseException:
+        conn.ambiante = False
+        conn.rollback()
+        raise
+    else:
+        conn.ambiante = False
+        conn.commit()
+    finally:
+        conn.ambiante = False
+        _ambiante.conn = None
+        differees, _ambiante.apres_commit = _ambiante.apres_commit, []
+        conn.close()
+
+    # Validée : exécute les fonctions différées (hors transaction)
+    for fonction in differees:
+        fonction()
+
+
+def apres_commit(fonction):
+    """
+    Exécute `fonction` (sans argument) une fois les écritures validées :
+    immédiatement hors transaction, à la sortie du bloc `transaction()`
+    sinon. Rien n'est exécuté si la transaction (ou le SAVEPOINT
+    englobant) est annulée.
+    """
+    if getattr(_ambiante, "conn", None) is None:
+        fonction()
+    else:
+        _ambiante.apres_commit.append(fonction)
 
 
-def init_db():
-    conn = get_connection()
-    cursor = conn.cursor()
+# ---------------------------------------------------------------------------
+# SCHÉMA ET MIGRATIONS
+# ---------------------------------------------------------------------------
+# Chaque migration fait passer la base de la version N-1 à N.
+# La version courante est stockée dans PRAGMA user_version : une base déjà
+# à jour n'exécute plus aucun DDL au démarrage.
 
+def _migration_tables(cursor):
     # ============================
     #   TABLE Ville
     # ============================
@@ -144,9 +474,308 @@ def init_db():
                    """)
 
 
+def _migration_index(cursor):
+    # ============================
+    #   INDEX DES TABLES N-N (recherches inverses : entité -> affaires)
+    # ============================
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affairesuspect_suspect ON AffaireSuspect (id_suspect, id_affaire);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affairearme_arme ON AffaireArme (id_arme, id_affaire);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affairelieu_lieu ON AffaireLieu (id_lieu, id_affaire);")
+
+    # ============================
+    #   INDEX DES FILTRES
+    # ============================
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affaire_statut ON Affaire (statut);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affaire_date ON Affaire (date);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affaire_code_postal ON Affaire (code_postal);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_arme_numero_serie ON Arme (numero_serie);")
+
+    # ============================
+    #   INDEX DES CLÉS ÉTRANGÈRES (suppressions en cascade)
+    # ============================
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_arme_affaire ON Arme (id_affaire);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lieu_affaire ON Lieu (id_affaire);")
+
+
+def _sql_indexer_affaires(ids: str) -> str:
+    """
+    Requêtes (ré)indexant dans RechercheAffaire les affaires dont l'id est
+    dans la liste SQL `ids` (ex. "NEW.id_affaire" ou une sous-requête).
+    """
+    return f"""
+        DELETE FROM RechercheAffaire WHERE rowid IN ({ids});
+        INSERT INTO RechercheAffaire (rowid, titre, description, lieu, ville, suspects, armes, lieux)
+        SELECT a.id_affaire,
+               a.titre,
+               a.description,
+               a.lieu,
+               (SELECT v.nom FROM Ville v WHERE v.code_postal = a.code_postal),
+               (SELECT group_concat(s.prenom || ' ' || s.nom || ' ' || coalesce(s.description, ''), ' ')
+                FROM AffaireSuspect j JOIN Suspect s ON s.id_suspect = j.id_suspect
+                WHERE j.id_affaire = a.id_affaire),
+               (SELECT group_concat(r.type || ' ' || coalesce(r.numero_serie, '') || ' ' || coalesce(r.description, ''), ' ')
+                FROM AffaireArme j JOIN Arme r ON r.id_arme = j.id_arme
+                WHERE j.id_affaire = a.id_affaire),
+               (SELECT group_concat(l.nom || ' ' || coalesce(l.adresse, ''), ' ')
+                FROM AffaireLieu j JOIN Lieu l ON l.id_lieu = j.id_lieu
+                WHERE j.id_affaire = a.id_affaire)
+        FROM Affaire a
+        WHERE a.id_affaire IN ({ids});
+    """
+
+
+def _migration_recherche(cursor):
+    # ============================
+    #   INDEX PLEIN TEXTE (FTS5) — rowid = id_affaire
+    # ============================
+    cursor.execute("""
+                   CREATE VIRTUAL TABLE IF NOT EXISTS RechercheAffaire USING fts5(
+                       titre, description, lieu, ville, suspects, armes, lieux,
+                       tokenize = "unicode61 remove_diacritics 2"
+                   );
+                   """)
+
+    # (nom du trigger, événement, affaires à réindexer)
+    triggers = [
+        ("recherche_affaire_ins", "AFTER INSERT ON Affaire", "NEW.id_affaire"),
+        ("recherche_affaire_upd", "AFTER UPDATE OF titre, description, lieu, code_postal ON Affaire", "NEW.id_affaire"),
+        ("recherche_suspect_ins", "AFTER INSERT ON AffaireSuspect", "NEW.id_affaire"),
+        ("recherche_suspect_del", "AFTER DELETE ON AffaireSuspect", "OLD.id_affaire"),
+        ("recherche_arme_ins", "AFTER INSERT ON AffaireArme", "NEW.id_affaire"),
+        ("recherche_arme_del", "AFTER DELETE ON AffaireArme", "OLD.id_affaire"),
+        ("recherche_lieu_ins", "AFTER INSERT ON AffaireLieu", "NEW.id_affaire"),
+        ("recherche_lieu_del", "AFTER DELETE ON AffaireLieu", "OLD.id_affaire"),
+        ("recherche_suspect_upd", "AFTER UPDATE OF nom, prenom, description ON Suspect",
+         "SELECT id_affaire FROM AffaireSuspect WHERE id_suspect = NEW.id_suspect"),
+        ("recherche_arme_upd", "AFTER UPDATE OF type, numero_serie, description ON Arme",
+         "SELECT id_affaire FROM AffaireArme WHERE id_arme = NEW.id_arme"),
+        ("recherche_lieu_upd", "AFTER UPDATE OF nom, adresse ON Lieu",
+         "SELECT id_affaire FROM AffaireLieu WHERE id_lieu = NEW.id_lieu"),
+        ("recherche_ville_ins", "AFTER INSERT ON Ville",
+         "SELECT id_affaire FROM Affaire WHERE code_postal = NEW.code_postal"),
+        ("recherche_ville_upd", "AFTER UPDATE OF nom ON Ville",
+         "SELECT id_affaire FROM Affaire WHERE code_postal = NEW.code_postal"),
+    ]
+    for nom, evenement, ids in triggers:
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_{nom} {evenement}
+                       BEGIN
+                           {_sql_indexer_affaires(ids)}
+                       END;
+                       """)
+
+    cursor.execute("""
+                   CREATE TRIGGER IF NOT EXISTS trg_recherche_affaire_del AFTER DELETE ON Affaire
+                   BEGIN
+                       DELETE FROM RechercheAffaire WHERE rowid = OLD.id_affaire;
+                   END;
+                   """)
+
+    # Indexation des affaires existantes
+    for requete in _sql_indexer_affaires("SELECT id_affaire FROM Affaire").split(";"):
+        if requete.strip():
+            cursor.execute(requete)
+
+
+def _migration_date_iso(cursor):
+    # ============================
+    #   DATE ISO (AAAA-MM-JJ) — triable, pour les intervalles de dates
+    # ============================
+    # Colonne générée à partir de `date` (JJ-MM-AAAA, format affiché) :
+    # toujours synchronisée à l'écriture, NULL si la date est mal formée.
+    cursor.execute("""
+                   ALTER TABLE Affaire ADD COLUMN date_iso TEXT GENERATED ALWAYS AS (
+                       CASE
+                           WHEN date GLOB '[0-9][0-9]-[0-9][0-9]-[0-9][0-9][0-9][0-9]'
+                               THEN substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)
+                       END
+                   ) VIRTUAL;
+                   """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_affaire_date_iso ON Affaire (date_iso);")
+
+    # L'index sur le texte JJ-MM-AAAA ne sert à aucun tri ni intervalle
+    cursor.execute("DROP INDEX IF EXISTS idx_affaire_date;")
+
+
+# (table N-N, clé de l'entité, compteur de LienAffaire)
+_RELATIONS_LIENS = [
+    ("AffaireSuspect", "id_suspect", "nb_suspects"),
+    ("AffaireArme", "id_arme", "nb_armes"),
+    ("AffaireLieu", "id_lieu", "nb_lieux"),
+]
+
+
+def _sql_paires_liees(jointure: str, pk: str, ligne: str, colonnes: str = "") -> str:
+    """
+    Paires (id_a, id_b) formées par l'affaire de la ligne `ligne` (NEW ou
+    OLD d'un trigger) et les autres affaires liées à la même entité.
+    """
+    return f"""
+        SELECT min({ligne}.id_affaire, j.id_affaire), max({ligne}.id_affaire, j.id_affaire){colonnes}
+        FROM {jointure} j
+        WHERE j.{pk} = {ligne}.{pk} AND j.id_affaire <> {ligne}.id_affaire
+    """
+
+
+def _migration_liens(cursor):
+    # ============================
+    #   TABLE LienAffaire — paires d'affaires partageant des entités
+    # ============================
+    # Une ligne par paire (id_a < id_b) avec le nombre de suspects, armes et
+    # lieux communs ; tenue à jour par les triggers des tables N-N.
+    cursor.execute("""
+                   CREATE TABLE IF NOT EXISTS LienAffaire (
+                       id_a INTEGER NOT NULL,
+                       id_b INTEGER NOT NULL,
+                       nb_suspects INTEGER NOT NULL DEFAULT 0,
+                       nb_armes INTEGER NOT NULL DEFAULT 0,
+                       nb_lieux INTEGER NOT NULL DEFAULT 0,
+                       PRIMARY KEY (id_a, id_b),
+                       CHECK (id_a < id_b)
+                   ) WITHOUT ROWID;
+                   """)
+
+    # Liens d'une affaire : clé primaire (id_a = ?) + cet index (id_b = ?)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_lienaffaire_b ON LienAffaire (id_b, id_a);")
+
+    for jointure, pk, compteur in _RELATIONS_LIENS:
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_lien_{jointure.lower()}_ins AFTER INSERT ON {jointure}
+                       BEGIN
+                           INSERT INTO LienAffaire (id_a, id_b, {compteur})
+                           {_sql_paires_liees(jointure, pk, "NEW", ", 1")}
+                           ON CONFLICT (id_a, id_b) DO UPDATE SET {compteur} = {compteur} + 1;
+                       END;
+                       """)
+
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_lien_{jointure.lower()}_del AFTER DELETE ON {jointure}
+                       BEGIN
+                           UPDATE LienAffaire SET {compteur} = {compteur} - 1
+                           WHERE (id_a, id_b) IN ({_sql_paires_liees(jointure, pk, "OLD")});
+                           DELETE FROM LienAffaire
+                           WHERE nb_suspects = 0 AND nb_armes = 0 AND nb_lieux = 0
+                             AND (id_a, id_b) IN ({_sql_paires_liees(jointure, pk, "OLD")});
+                       END;
+                       """)
+
+    # Remplissage à partir des liaisons existantes
+    selections = " UNION ALL ".join(
+        f"""
+        SELECT x.id_affaire AS id_a, y.id_affaire AS id_b,
+               {int(compteur == "nb_suspects")} AS s, {int(compteur == "nb_armes")} AS a, {int(compteur == "nb_lieux")} AS l
+        FROM {jointure} x
+                 JOIN {jointure} y ON y.{pk} = x.{pk} AND y.id_affaire > x.id_affaire
+        """
+        for jointure, pk, compteur in _RELATIONS_LIENS
+    )
+    cursor.execute(f"""
+                   INSERT INTO LienAffaire (id_a, id_b, nb_suspects, nb_armes, nb_lieux)
+                   SELECT id_a, id_b, sum(s), sum(a), sum(l)
+                   FROM ({selections})
+                   GROUP BY id_a, id_b;
+                   """)
+
+
+def _migration_version_affaire(cursor):
+    # ============================
+    #   VERSION D'AFFICHAGE DES AFFAIRES
+    # ============================
+    # Incrémentée à chaque modification de l'affaire (hors position), de ses
+    # liaisons ou d'une entité liée : un post-it dont la version n'a pas
+    # changé peut être réaffiché sans relire ni remesurer son texte.
+    cursor.execute("ALTER TABLE Affaire ADD COLUMN version INTEGER NOT NULL DEFAULT 0;")
+
+    # (nom du trigger, événement, affaires concernées)
+    triggers = [
+        ("version_affaire_upd", "AFTER UPDATE OF titre, date, lieu, code_postal, statut, description ON Affaire",
+         "NEW.id_affaire"),
+        ("version_suspect_ins", "AFTER INSERT ON AffaireSuspect", "NEW.id_affaire"),
+        ("version_suspect_del", "AFTER DELETE ON AffaireSuspect", "OLD.id_affaire"),
+        ("version_arme_ins", "AFTER INSERT ON AffaireArme", "NEW.id_affaire"),
+        ("version_arme_del", "AFTER DELETE ON AffaireArme", "OLD.id_affaire"),
+        ("version_lieu_ins", "AFTER INSERT ON AffaireLieu", "NEW.id_affaire"),
+        ("version_lieu_del", "AFTER DELETE ON AffaireLieu", "OLD.id_affaire"),
+        ("version_suspect_upd", "AFTER UPDATE OF nom, prenom ON Suspect",
+         "SELECT id_affaire FROM AffaireSuspect WHERE id_suspect = NEW.id_suspect"),
+        ("version_arme_upd", "AFTER UPDATE OF type, numero_serie ON Arme",
+         "SELECT id_affaire FROM AffaireArme WHERE id_arme = NEW.id_arme"),
+        ("version_lieu_upd", "AFTER UPDATE OF nom, adresse ON Lieu",
+         "SELECT id_affaire FROM AffaireLieu WHERE id_lieu = NEW.id_lieu"),
+    ]
+    for nom, evenement, ids in triggers:
+        cursor.execute(f"""
+                       CREATE TRIGGER IF NOT EXISTS trg_{nom} {evenement}
+                       BEGIN
+                           UPDATE Affaire SET version = version + 1 WHERE id_affaire IN ({ids});
+                       END;
+                       """)
+
+
+def statut_canonique(statut) -> str:
+    # Forme enregistrée du statut d'une affaire : « classée » (avec ou sans
+    # accent, toute casse, espaces ignorés), sinon « en cours ». Seule règle
+    # de normalisation : modèle Affaire, filtres, AffaireTable et migration.
+    v = str(statut).strip().lower()
+    return "classée" if v in ("classée", "classee") else "en cours"
+
+
+def _migration_statut(cursor):
+    # ============================
+    #   STATUTS CANONIQUES
+    # ============================
+    # Les anciennes versions enregistraient le statut tel que saisi
+    # (« En cours », « Classee », valeurs invalides...). Les lignes relues
+    # sans validation (from_trusted_row) doivent pourtant correspondre aux
+    # comparaisons « statut = ? » : une seule réécriture, par valeur distincte.
+    valeurs = [r[0] for r in cursor.execute("SELECT DISTINCT statut FROM Affaire").fetchall()]
+    for valeur in valeurs:
+        canonique = statut_canonique(valeur)
+        if valeur != canonique:
+            cursor.execute("UPDATE Affaire SET statut = ? WHERE statut = ?", (canonique, valeur))
+
+
+# Liste ordonnée des migrations : la position (à partir de 1) est la version
+MIGRATIONS = [
+    _migration_tables,
+    _migration_index,
+    _migration_recherche,
+    _migration_date_iso,
+    _migration_liens,
+    _migration_version_affaire,
+    _migration_statut,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def init_db():
+    conn = get_connection()
+    version = get_schema_version(conn)
+
+    # Base déjà à jour : aucun DDL
+    if version >= SCHEMA_VERSION:
+        conn.close()
+        return
+
+    cursor = conn.cursor()
+    try:
+        for numero in range(version + 1, SCHEMA_VERSION + 1):
+            # Une transaction par migration, version incluse
+            cursor.execute("BEGIN")
+            MIGRATIONS[numero - 1](cursor)
+            cursor.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
-    conn.commit()
-    conn.close()
     print("✅ Base SQLite initialisée avec succès !")
 
 
@@ -170,6 +799,45 @@ def insert(table: str, data) -> int:
     return inserted_id
 
 
+def insert_many(table: str, rows) -> List[int]:
+    """
+    Insère plusieurs lignes en une seule transaction (requête préparée
+    une fois) et retourne les ids générés, dans l'ordre des lignes.
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+
+    colonnes = list(rows[0].keys())
+    for row in rows:
+        if list(row.keys()) != colonnes:
+            raise ValueError("insert_many : toutes les lignes doivent avoir les mêmes colonnes.")
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cols = ", ".join(colonnes)
+    placeholders = ", ".join(["?"] * len(colonnes))
+    query = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
+
+    # Une ligne à la fois, dans la même transaction : les rowid générés ne
+    # sont pas forcément consécutifs (rowid maximal atteint, lignes
+    # supprimées), chaque id est donc relu avec lastrowid
+    ids = []
+    try:
+        for row in rows:
+            cursor.execute(query, tuple(row.values()))
+            ids.append(cursor.lastrowid)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return ids
+
+
 def get_all(table: str):
     conn = get_connection()
     cursor = conn.cursor()
@@ -181,6 +849,54 @@ def get_all(table: str):
     return rows
 
 
+# Parcourt les lignes d'une table par lots (fetchmany) sans tout charger.
+# columns : colonnes à lire (projection), toutes par défaut
+# where / params : condition SQL optionnelle et ses paramètres
+# after_id / limit : pagination par clé (lignes d'id > after_id, au plus limit)
+def iter_rows(
+        table: str,
+        columns=None,
+        where: Optional[str] = None,
+        params=(),
+        batch_size: int = 1000,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        pk: Optional[str] = None,
+):
+    if pk is None:
+        pk = f"id_{table.lower()}"
+
+    colonnes = ", ".join(columns) if columns else "*"
+    conditions = []
+    valeurs = list(params)
+
+    if where:
+        conditions.append(f"({where})")
+    if after_id is not None:
+        conditions.append(f"{pk} > ?")
+        valeurs.append(after_id)
+
+    query = f"SELECT {colonnes} FROM {table}"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {pk}"
+    if limit is not None:
+        query += " LIMIT ?"
+        valeurs.append(limit)
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, valeurs)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
 def get_by_id(table: str, row_id: int, pk: Optional[str] = None):
     conn = get_connection()
     cursor = conn.cursor()
@@ -207,10 +923,48 @@ def update(table: str, row_id: int, data, pk: Optional[str] = None):
 
     query = f"UPDATE {table} SET {champs} WHERE {pk} = ?"
     cursor.execute(query, values)
+    modifiees = cursor.rowcount
 
     conn.commit()
     conn.close()
 
+    # Nombre de lignes modifiées (0 si l'id n'existe pas)
+    return modifiees
+
+
+def update_many(table: str, rows, pk: Optional[str] = None) -> int:
+    """
+    Met à jour plusieurs lignes en une seule transaction (executemany).
+    rows : paires (id, {colonne: valeur}) ; les lignes ayant les mêmes
+    colonnes partagent une même requête. Retourne le nombre de lignes modifiées.
+    """
+    if pk is None:
+        pk = f"id_{table.lower()}"
+
+    # Une requête par jeu de colonnes
+    par_colonnes = {}
+    for row_id, data in rows:
+        par_colonnes.setdefault(tuple(data.keys()), []).append(tuple(data.values()) + (row_id,))
+    if not par_colonnes:
+        return 0
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    modifiees = 0
+    try:
+        for colonnes, valeurs in par_colonnes.items():
+            champs = ", ".join(f"{c} = ?" for c in colonnes)
+            cursor.executemany(f"UPDATE {table} SET {champs} WHERE {pk} = ?", valeurs)
+            modifiees += cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return modifiees
+
 
 def delete(table: str, row_id: int, pk: Optional[str] = None):
     conn = get_connection()
@@ -37,6 +37,10 @@ class AffaireForm(tk.Toplevel):
         self.affaire = affaire
         self.on_close = on_close
 
+        # Les onglets modifient les liaisons : relations relues en DB
+        if affaire is not None:
+            affaire.invalider_relations()
+
         # Configuration de la fenêtre
         self.title("🗂️ Affaire")
         self.geometry("420x650")
@@ -212,42 +216,47 @@ class AffaireForm(tk.Toplevel):
 
         ville_existante = self.gestion.get_ville(cp)
 
-        if ville_existante:
-            # Le code postal existe déjà
-            if ville_existante["nom"] != ville:
-                return messagebox.showerror(
-                    "Erreur",
-                    f"Le code postal {cp} existe déjà pour la ville "
-                    f"« {ville_existante['nom']} ».\n"
-                    "Veuillez sélectionner la ville existante."
-                )
-        else:
-            # Création d’une nouvelle ville
-            self.gestion.creer_ville(cp, ville)
-
-        # Mise à jour ou création de l’affaire
-        if self.affaire:
-            self.gestion.maj_affaire(
-                self.affaire.id_affaire,
-                {
-                    "titre": self.var_titre.get(),
-                    "date": date_str,
-                    "lieu": ville,
-                    "code_postal": cp,
-                    "statut": self.var_statut.get(),
-                    "description": self.var_desc.get() or None
-                }
-            )
-        else:
-            self.affaire = self.gestion.creer_affaire(
-                self.var_titre.get(),
-                date_str,
-                ville,
-                cp,
-                self.var_statut.get(),
-                self.var_desc.get() or None
+        # Le code postal existe déjà pour une autre ville
+        if ville_existante and ville_existante["nom"] != ville:
+            return messagebox.showerror(
+                "Erreur",
+                f"Le code postal {cp} existe déjà pour la ville "
+                f"« {ville_existante['nom']} ».\n"
+                "Veuillez sélectionner la ville existante."
             )
 
+        creation = self.affaire is None
+
+        # Ville + affaire enregistrées en une seule transaction
+        with self.gestion.transaction():
+            if not ville_existante:
+                # Création d’une nouvelle ville
+                self.gestion.creer_ville(cp, ville)
+
+            # Mise à jour ou création de l’affaire
+            if not creation:
+                self.gestion.maj_affaire(
+                    self.affaire.id_affaire,
+                    {
+                        "titre": self.var_titre.get(),
+                        "date": date_str,
+                        "lieu": ville,
+                        "code_postal": cp,
+                        "statut": self.var_statut.get(),
+                        "description": self.var_desc.get() or None
+                    }
+                )
+            else:
+                self.affaire = self.gestion.creer_affaire(
+                    self.var_titre.get(),
+                    date_str,
+                    ville,
+                    cp,
+                    self.var_statut.get(),
+                    self.var_desc.get() or None
+                )
+
+        if creation:
             messagebox.showinfo(
                 "Affaire créée",
                 f"Affaire #{self.affaire.id_affaire} créée.\n"
@@ -9,12 +9,35 @@ Certaines parties du code ont été générées ou assistées par une intelligen
 import tkinter as tk
 from gui.affaire_form import AffaireForm
 from gui.styles import POSTIT_WIDTH, POSTIT_HEIGHT, COLOR_EN_COURS, COLOR_CLASSEE
+from gui.styles import ZOOM_TITRE, ZOOM_COMPLET
+
+
+# Niveaux de détail d’un post-it selon le zoom du mur
+COMPACT = "compact"    # rectangle coloré et numéro de l’affaire
+TITRE = "titre"        # titre seul
+COMPLET = "complet"    # texte complet (suspects, armes, lieux)
+
+
+def niveau_detail(zoom):
+    """
+    Niveau de détail des post-it pour un facteur de zoom donné.
+    """
+    if zoom < ZOOM_TITRE:
+        return COMPACT
+    if zoom < ZOOM_COMPLET:
+        return TITRE
+    return COMPLET
 
 
 class AffaireWidget:
     """
     Représente graphiquement une affaire sous forme de « post-it » sur le mur d’enquête.
     Cette classe gère l’affichage, les interactions utilisateur et la mise à jour des liens.
+
+    Les positions de l’affaire sont celles du mur ; sur le canvas elles
+    sont multipliées par le zoom du parent. Le texte complet n’est
+    construit et mesuré qu’au niveau de détail COMPLET, puis conservé
+    dans le cache du parent tant que la version de l’affaire ne change pas.
     """
 
     def __init__(self, canvas, affaire, gestion, parent):
@@ -24,7 +47,7 @@ class AffaireWidget:
         canvas  : canvas Tkinter sur lequel le post-it est dessiné
         affaire : instance du modèle Affaire
         gestion : instance de GestionEnquetes (logique métier)
-        parent  : CanvasView (utilisé pour redessiner les liens)
+        parent  : CanvasView (utilisé pour redessiner les liens et pour le zoom)
         """
         self.canvas = canvas
         self.affaire = affaire
@@ -38,21 +61,15 @@ class AffaireWidget:
         # Référence vers la fenêtre d’édition (AffaireForm)
         self.form_window = None
 
-        # Choix de la couleur en fonction du statut de l’affaire
-        color = COLOR_EN_COURS if affaire.statut == "en cours" else COLOR_CLASSEE
-
-        # Position initiale récupérée depuis la base de données
-        x = affaire.pos_x
-        y = affaire.pos_y
+        # Niveau de détail et zoom du dernier affichage
+        self.niveau = None
+        self.zoom = None
 
         # -----------------------------
         # Création du rectangle (post-it)
         # -----------------------------
         self.rect = canvas.create_rectangle(
-            x, y,
-            x + POSTIT_WIDTH,
-            y + POSTIT_HEIGHT,
-            fill=color,
+            0, 0, 0, 0,
             outline="black",
             tags=("postit",)
         )
@@ -61,31 +78,13 @@ class AffaireWidget:
         # Création du texte du post-it
         # -----------------------------
         self.text = canvas.create_text(
-            x + 10,
-            y + 10,
+            0, 0,
             anchor="nw",
-            width=POSTIT_WIDTH - 20,
-            font=("Segoe UI", 10),
-            text=self._build_text(),
             tags=("postit",)
         )
 
-        # Ajustement automatique de la taille du post-it
-        bbox = canvas.bbox(self.text)
-        if bbox:
-            tx1, ty1, tx2, ty2 = bbox
-            text_width = tx2 - tx1
-            text_height = ty2 - ty1
-
-            new_width = max(POSTIT_WIDTH, text_width + 20)
-            new_height = max(POSTIT_HEIGHT, text_height + 20)
-
-            canvas.coords(
-                self.rect,
-                x, y,
-                x + new_width,
-                y + new_height
-            )
+        # Contenu, position et taille selon le zoom courant
+        self.afficher()
 
         # =====================
         # ÉVÉNEMENTS SOURIS
@@ -120,17 +119,18 @@ class AffaireWidget:
         self.start_x = event.x
         self.start_y = event.y
 
-        # Redessine les liens en temps réel
-        self.parent.redraw_links()
+        # Déplace en temps réel les seules lignes reliées à ce post-it
+        self.parent.deplacer_liens(self.affaire.id_affaire)
 
     def on_release(self, event):
         """
-        Sauvegarde la nouvelle position du post-it en base de données.
+        Enregistre la nouvelle position du post-it (écriture groupée en base).
         """
         x1, y1, _, _ = self.canvas.coords(self.rect)
 
-        # Mise à jour de la position dans le modèle Affaire
-        self.affaire.update_position(int(x1), int(y1))
+        # Position mise en tampon : écrite avec les déplacements suivants
+        zoom = self.parent.zoom
+        self.parent.deplacer_affaire(self.affaire.id_affaire, round(x1 / zoom), round(y1 / zoom))
 
     def on_double_click(self, event):
         """
@@ -151,21 +151,141 @@ class AffaireWidget:
     def _on_form_close(self):
         """
         Callback appelé à la fermeture du formulaire d’édition.
+        Les modifications ont déjà été répercutées sur le mur
+        par le flux de changements (voir CanvasView.on_changement).
         """
         self.form_window = None
-        self.parent.refresh()
+
+    # ------------------------------------------------
+    # MISE À JOUR INCRÉMENTALE
+    # ------------------------------------------------
+
+    def afficher(self, reconstruire=False):
+        """
+        Dessine le post-it au zoom courant du parent.
+        Le texte n’est recalculé que si le niveau de détail change
+        (ou si reconstruire est vrai, après une modification de l’affaire) ;
+        sinon seuls la police, la position et la taille sont adaptées.
+        """
+        zoom = self.parent.zoom
+        niveau = niveau_detail(zoom)
+
+        color = COLOR_EN_COURS if self.affaire.statut == "en cours" else COLOR_CLASSEE
+        self.canvas.itemconfigure(self.rect, fill=color)
+
+        if reconstruire or niveau != self.niveau:
+            if niveau == COMPLET:
+                texte = self._texte_complet()
+            elif niveau == TITRE:
+                texte = f"🗂️ {self.affaire.titre}"
+            else:
+                texte = f"#{self.affaire.id_affaire}"
+            self.canvas.itemconfigure(self.text, text=texte)
+
+        # Police à l’échelle ; le numéro reste lisible à faible zoom
+        taille_police = 7 if niveau == COMPACT else max(6, round(10 * zoom))
+        marge = 10 * zoom
+        self.canvas.itemconfigure(
+            self.text,
+            font=("Segoe UI", taille_police),
+            width=max(1, (POSTIT_WIDTH - 20) * zoom),
+        )
+
+        x = (self.affaire.pos_x or 0) * zoom
+        y = (self.affaire.pos_y or 0) * zoom
+        self.canvas.coords(self.text, x + marge, y + marge)
+        self.canvas.coords(self.rect, x, y, x + POSTIT_WIDTH * zoom, y + POSTIT_HEIGHT * zoom)
+
+        # Seul le texte complet est mesuré (taille variable)
+        if niveau == COMPLET:
+            self._ajuster_taille(x, y)
+
+        self.niveau = niveau
+        self.zoom = zoom
+
+    def mettre_a_jour(self, affaire):
+        """
+        Réaffiche le post-it pour une version rechargée de l’affaire,
+        en réutilisant le rectangle et le texte existants.
+        """
+        self.affaire = affaire
+        self.afficher(reconstruire=True)
+
+    def deplacer_vers(self, x, y):
+        """
+        Place le post-it en (x, y) (coordonnées du mur) sans reconstruire son texte.
+        """
+        zoom = self.parent.zoom
+        x1, y1, _, _ = self.canvas.coords(self.rect)
+        dx, dy = x * zoom - x1, y * zoom - y1
+        if dx or dy:
+            self.canvas.move(self.rect, dx, dy)
+            self.canvas.move(self.text, dx, dy)
+
+        self.affaire.pos_x, self.affaire.pos_y = x, y
+        self.affaire.marquer_propre()
+
+    def detruire(self):
+        """
+        Supprime les éléments du post-it du canvas.
+        """
+        if self.form_window is not None and self.form_window.winfo_exists():
+            self.form_window.destroy()
+        self.canvas.delete(self.rect, self.text)
 
     # ------------------------------------------------
     # MÉTHODES UTILITAIRES
     # ------------------------------------------------
 
+    def _ajuster_taille(self, x, y):
+        """
+        Agrandit le rectangle pour contenir le texte (taille minimale POSTIT_*,
+        à l’échelle du zoom). La mesure du texte est reprise du cache
+        si la même version a déjà été mesurée à ce zoom.
+        """
+        zoom = self.parent.zoom
+        cache = self.parent.cache_postits
+        id_affaire, version = self.affaire.id_affaire, self.affaire.version
+
+        taille = cache.taille(id_affaire, version, zoom)
+        if taille is None:
+            bbox = self.canvas.bbox(self.text)
+            if not bbox:
+                return
+            tx1, ty1, tx2, ty2 = bbox
+            taille = (tx2 - tx1, ty2 - ty1)
+            cache.enregistrer_taille(id_affaire, version, zoom, taille)
+
+        text_width, text_height = taille
+        new_width = max(POSTIT_WIDTH * zoom, text_width + 20 * zoom)
+        new_height = max(POSTIT_HEIGHT * zoom, text_height + 20 * zoom)
+
+        self.canvas.coords(
+            self.rect,
+            x, y,
+            x + new_width,
+            y + new_height
+        )
+
     def center(self):
         """
-        Retourne le centre du post-it (utilisé pour dessiner les liens).
+        Retourne le centre du post-it sur le canvas (utilisé pour dessiner les liens).
         """
         x1, y1, x2, y2 = self.canvas.coords(self.rect)
         return (x1 + x2) // 2, (y1 + y2) // 2
 
+    def _texte_complet(self):
+        """
+        Texte complet du post-it, repris du cache si la version de
+        l’affaire n’a pas changé (sinon construit puis mis en cache).
+        """
+        cache = self.parent.cache_postits
+        texte = cache.texte(self.affaire.id_affaire, self.affaire.version)
+        if texte is None:
+            texte = self._build_text()
+            cache.enregistrer_texte(self.affaire.id_affaire, self.affaire.version, texte)
+        return texte
+
     def _build_text(self):
         """
         Construit le texte affiché dans le post-it à partir des données de l’affaire.
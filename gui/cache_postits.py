@@ -0,0 +1,105 @@
+"""
+
+Cache du rendu des post-it du mur d’enquête.
+
+Pour chaque affaire, le texte complet du post-it (trois lectures de
+relations) et la taille mesurée de ce texte (canvas.bbox) sont conservés
+avec la version d’affichage de l’affaire. Tant que la version ne change
+pas, un refresh ou un retour dans la vue réaffiche le post-it sans
+requête ni mesure ; toute modification de l’affaire ou de ses liaisons
+incrémente la version et invalide l’entrée.
+
+"""
+
+from collections import OrderedDict
+
+
+class CachePostits:
+    """
+    Associe à chaque affaire (id, version) son texte et ses tailles mesurées.
+    Les entrées les moins récemment utilisées sont oubliées au-delà de
+    `capacite` affaires.
+    """
+
+    # Tailles conservées par affaire (une par zoom récent)
+    TAILLES_MAX = 4
+
+    def __init__(self, capacite=5000):
+        """
+        capacite : nombre maximal d’affaires en cache
+        """
+        self.capacite = capacite
+
+        # id_affaire -> [version, texte, {zoom: (largeur, hauteur)}]
+        self.entrees = OrderedDict()
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def _entree(self, id_affaire, version):
+        """
+        Entrée valide pour cette version (None si absente ou périmée).
+        """
+        if version is None:
+            return None
+        entree = self.entrees.get(id_affaire)
+        if entree is None or entree[0] != version:
+            return None
+        self.entrees.move_to_end(id_affaire)
+        return entree
+
+    def texte(self, id_affaire, version):
+        """
+        Texte complet du post-it (None s’il doit être reconstruit).
+        """
+        entree = self._entree(id_affaire, version)
+        return entree[1] if entree is not None else None
+
+    def taille(self, id_affaire, version, zoom):
+        """
+        Taille (largeur, hauteur) du texte mesurée à ce zoom (None si inconnue).
+        """
+        entree = self._entree(id_affaire, version)
+        return entree[2].get(zoom) if entree is not None else None
+
+    def tailles(self, id_affaire, version):
+        """
+        Copie {zoom: (largeur, hauteur)} des tailles mesurées pour cette version.
+        """
+        entree = self._entree(id_affaire, version)
+        return dict(entree[2]) if entree is not None else {}
+
+    def enregistrer_texte(self, id_affaire, version, texte):
+        """
+        Mémorise le texte d’une version (remplace une version antérieure).
+        """
+        if version is None:
+            return
+        self.entrees[id_affaire] = [version, texte, {}]
+        self.entrees.move_to_end(id_affaire)
+        while len(self.entrees) > self.capacite:
+            self.entrees.popitem(last=False)
+
+    def enregistrer_taille(self, id_affaire, version, zoom, taille):
+        """
+        Mémorise la taille mesurée du texte à un zoom donné.
+        """
+        entree = self._entree(id_affaire, version)
+        if entree is None:
+            return
+        tailles = entree[2]
+        tailles[zoom] = taille
+        if len(tailles) > self.TAILLES_MAX:
+            del tailles[next(iter(tailles))]
+
+    def versions(self):
+        """
+        Copie {id_affaire: version} des entrées (lue par le thread de chargement).
+        """
+        return {id_affaire: entree[0] for id_affaire, entree in self.entrees.items()}
+
+    def oublier(self, id_affaire):
+        """
+        Retire une affaire du cache (ex. affaire supprimée).
+        """
+        self.entrees.pop(id_affaire, None)
@@ -5,49 +5,115 @@ Certaines parties du code ont été générées ou assistées par une intelligen
 
 """
 
+import math
 import tkinter as tk
+from tkinter import messagebox
 
-from gui.affaire_widget import AffaireWidget
+from gui.affaire_widget import AffaireWidget, niveau_detail, COMPACT, COMPLET
+from gui.cache_postits import CachePostits
+from gui.chargeur_mur import ChargeurMur
+from gui.grille_spatiale import GrilleSpatiale
 from gui.liens_popup import LiensPopup
 from gui.affaire_form import AffaireForm
 from gui.filtre_popup import FiltrePopup
 from gui.styles import COLOR_BG, COLOR_LINK
 from gui.styles import POSTIT_WIDTH, POSTIT_HEIGHT
+from gui.styles import ZOOM_MIN, ZOOM_MAX
 
 
 class CanvasView(tk.Canvas):
     """
     Canvas principal représentant le « mur d’enquête ».
     Il affiche les affaires sous forme de post-it et les liens entre elles.
+
+    Seuls les post-it proches de la zone visible existent sur le canvas :
+    ils sont créés et détruits au fil des déplacements de la vue.
+
+    Les positions des affaires (et la grille spatiale) sont en coordonnées
+    du mur ; sur le canvas elles sont multipliées par le zoom. Le niveau
+    de détail des post-it et des liens dépend du zoom (voir niveau_detail).
     """
 
-    def __init__(self, parent, gestion):
+    # Marge (pixels) autour de la zone visible où les post-it sont déjà créés
+    MARGE_VUE = 300
+
+    # Délai (ms) sans nouveau déplacement avant d’écrire les positions en base
+    DELAI_POSITIONS = 1000
+
+    # Facteur appliqué par cran de molette
+    PAS_ZOOM = 1.15
+
+    # Côté (mur) des cases regroupant les liens au niveau COMPACT
+    CASE_AGREGAT = 1000
+
+    def __init__(self, parent, gestion, on_progress=None):
         """
         Constructeur du canvas.
 
-        parent  : widget parent (MainWindow)
-        gestion : instance de GestionEnquetes (logique métier)
+        parent      : widget parent (MainWindow)
+        gestion     : instance de GestionEnquetes (logique métier)
+        on_progress : callback(fraction, texte) de la barre de progression,
+                      connu dès le premier chargement
         """
         super().__init__(parent, bg=COLOR_BG)
 
         # Référence vers la logique métier
         self.gestion = gestion
 
-        # Dictionnaire id_affaire -> AffaireWidget
+        # Affaires du mur (filtre appliqué) : id_affaire -> Affaire
+        self.affaires = {}
+
+        # Emprise de chaque affaire sur le mur (affichée ou non)
+        self.grille = GrilleSpatiale()
+
+        # Graphe des liens : id_affaire -> ids des affaires liées
+        self.voisins = {}
+
+        # Post-it présents sur le canvas : id_affaire -> AffaireWidget
         self.widgets = {}
 
-        # Liste des identifiants de lignes (liens entre affaires)
-        self.liens = []
+        # (id_a, id_b) -> identifiant de la ligne reliant les deux affaires
+        self.liens = {}
+
+        # Index id_affaire -> [(id de ligne, id de l'affaire à l'autre bout)]
+        # utilisé pour ne déplacer que les lignes du post-it glissé
+        self.liens_par_affaire = {}
 
         # Liste des affaires filtrées (None = pas de filtre)
         self.affaires_filtrees = None
 
+        # Filtre composite ayant produit cette liste (relancé à chaque refresh)
+        self.filtre_actif = None
+
         # Texte affiché dans la sidebar pour indiquer le filtre actif
         self.filter_text = "Aucun"
 
         # Callback pour informer la sidebar d’un changement de filtre
         self.on_filter_changed = None
 
+        # Callback pour afficher la progression du chargement dans la sidebar
+        self.on_progress = on_progress
+
+        # Les données du mur sont lues hors du thread Tk
+        self.chargeur = ChargeurMur(self, gestion)
+
+        # La disposition par liens a son propre chargeur : un refresh ne l’écarte pas
+        self.chargeur_disposition = ChargeurMur(self, gestion)
+
+        # Texte et taille des post-it par version d’affaire (conservés d’un refresh à l’autre)
+        self.cache_postits = CachePostits()
+
+        # Changements reçus du backend, appliqués ensemble au prochain idle
+        self._a_recharger = set()
+        self._a_deplacer = set()
+        self._a_supprimer = set()
+        self._liens_a_revoir = set()
+        self._patch_prevu = None
+
+        # Le mur ne se redessine qu'en partie après une écriture
+        self.gestion.abonner(self.on_changement)
+        self.bind("<Destroy>", self._on_destroy)
+
         # =====================
         # Déplacement du mur (PAN)
         # =====================
@@ -55,6 +121,27 @@ class CanvasView(tk.Canvas):
         self.bind("<ButtonPress-3>", self.start_pan)
         self.bind("<B3-Motion>", self.do_pan)
 
+        # Post-it visibles recalculés après un déplacement ou un redimensionnement
+        self._vue_prevue = None
+        self.bind("<Configure>", lambda e: self.planifier_vue())
+
+        # Écriture différée des positions (glisser-déposer)
+        self._ecriture_prevue = None
+
+        # =====================
+        # Zoom à la molette
+        # =====================
+        self.zoom = 1.0
+
+        # Crans de molette cumulés, appliqués en une fois au prochain idle
+        self._zoom_cible = 1.0
+        self._point_zoom = (0, 0)
+        self._zoom_prevu = None
+
+        self.bind("<MouseWheel>", self.on_molette)
+        self.bind("<Button-4>", self.on_molette)
+        self.bind("<Button-5>", self.on_molette)
+
         # Initialisation de l’affichage
         self.refresh()
 
@@ -77,6 +164,56 @@ class CanvasView(tk.Canvas):
         Déplace la vue du canvas lors du déplacement de la souris.
         """
         self.scan_dragto(event.x, event.y, gain=1)
+        self.planifier_vue()
+
+    # ------------------------------------------------
+    # ZOOM DU MUR
+    # ------------------------------------------------
+
+    def niveau_detail(self):
+        """
+        Niveau de détail courant des post-it (COMPACT, TITRE ou COMPLET).
+        """
+        return niveau_detail(self.zoom)
+
+    def on_molette(self, event):
+        """
+        Zoom avant / arrière autour du pointeur.
+        Windows et macOS : <MouseWheel> (event.delta) ; X11 : boutons 4 et 5.
+        """
+        avant = event.num == 4 or getattr(event, "delta", 0) > 0
+        facteur = self.PAS_ZOOM if avant else 1 / self.PAS_ZOOM
+
+        self._zoom_cible = min(ZOOM_MAX, max(ZOOM_MIN, self._zoom_cible * facteur))
+        self._point_zoom = (event.x, event.y)
+
+        if self._zoom_prevu is None:
+            self._zoom_prevu = self.after_idle(self._appliquer_zoom)
+
+    def _appliquer_zoom(self):
+        """
+        Applique le zoom demandé : le point du mur sous le pointeur reste
+        en place, les post-it et les liens sont redessinés à la nouvelle
+        échelle (et au niveau de détail correspondant).
+        """
+        self._zoom_prevu = None
+        if self._zoom_cible == self.zoom:
+            return
+
+        ex, ey = self._point_zoom
+        mx = self.canvasx(ex) / self.zoom
+        my = self.canvasy(ey) / self.zoom
+        self.zoom = self._zoom_cible
+
+        # Décalage de la vue pour garder (mx, my) sous le pointeur
+        dx = round(mx * self.zoom - self.canvasx(ex))
+        dy = round(my * self.zoom - self.canvasy(ey))
+        self.scan_mark(0, 0)
+        self.scan_dragto(-dx, -dy, gain=1)
+
+        # Lignes recréées à la nouvelle échelle, post-it réaffichés
+        self._effacer_liens()
+        self.mettre_a_jour_vue()
 
     # ------------------------------------------------
     # ORGANISATION DU MUR
@@ -97,6 +234,7 @@ class CanvasView(tk.Canvas):
         spacing_y = POSTIT_HEIGHT + 40
         max_per_row = 4  # nombre de post-it par ligne
 
+        positions = {}
         for index, affaire in enumerate(affaires):
             row = index // max_per_row
             col = index % max_per_row
@@ -104,11 +242,69 @@ class CanvasView(tk.Canvas):
             x = margin_x + col * spacing_x
             y = margin_y + row * spacing_y
 
-            # Mise à jour de la position de l’affaire
-            affaire.update_position(int(x), int(y))
+            positions[affaire.id_affaire] = (int(x), int(y))
 
+        # Une seule transaction ; le mur suit via le flux de changements
+        self.gestion.maj_positions_affaires(positions)
+        self.reset_view()
+
+    def disposer_par_liens(self):
+        """
+        Réorganise les post-it du mur selon leurs liens (disposition par
+        forces : les affaires liées se rapprochent). Le calcul se fait en
+        arrière-plan ; les positions sont enregistrées en une seule
+        transaction puis le mur est mis à jour par le flux de changements.
+        Le calcul utilise un chargeur distinct de celui du mur : un refresh
+        lancé pendant le calcul ne le rend pas obsolète.
+        """
+        if not self.affaires or self.chargeur_disposition.en_cours:
+            return
+
+        ids = list(self.affaires)
+        tailles = self._tailles_mur(ids)
+        self.chargeur_disposition.lancer(
+            lambda progres, obsolete: self.gestion.calculer_disposition(ids, tailles),
+            on_termine=self._appliquer_disposition,
+            on_progres=self._progression,
+            texte="Calcul de la disposition…",
+        )
+
+    def _tailles_mur(self, ids):
+        """
+        Taille (mur) de chaque post-it pour la disposition : la plus grande
+        entre son emprise actuelle et celles de son texte mesuré aux zooms
+        récents (cache des post-it). La police est arrondie à chaque zoom :
+        sans ce maximum, des post-it disposés sans chevauchement à un zoom
+        pourraient se recouvrir à un autre.
+        """
+        tailles = {}
+        for id_affaire in ids:
+            largeur, hauteur = POSTIT_WIDTH, POSTIT_HEIGHT
+            rect = self.grille.rect(id_affaire)
+            if rect is not None:
+                x1, y1, x2, y2 = rect
+                largeur, hauteur = max(largeur, x2 - x1), max(hauteur, y2 - y1)
+
+            # Même calcul que AffaireWidget._ajuster_taille, ramené au zoom 1
+            affaire = self.affaires.get(id_affaire)
+            version = affaire.version if affaire is not None else None
+            for zoom, (l, h) in self.cache_postits.tailles(id_affaire, version).items():
+                largeur = max(largeur, l / zoom + 20)
+                hauteur = max(hauteur, h / zoom + 20)
+
+            tailles[id_affaire] = (largeur, hauteur)
+        return tailles
+
+    def _appliquer_disposition(self, positions):
+        """
+        Enregistre la disposition calculée et ramène la vue en haut à gauche.
+        """
+        if isinstance(positions, Exception):
+            messagebox.showerror("Erreur", f"Disposition impossible :\n{positions}")
+            return
+
+        self.gestion.maj_positions_affaires(positions)
         self.reset_view()
-        self.refresh()
 
     # ------------------------------------------------
     # RAFRAÎCHISSEMENT
@@ -116,74 +312,519 @@ class CanvasView(tk.Canvas):
 
     def refresh(self):
         """
-        Rafraîchit complètement le canvas :
+        Rafraîchit complètement le canvas.
+        Les affaires (filtre appliqué), les relations des post-it visibles
+        et les liens sont lus en arrière-plan ; le mur actuel reste affiché
+        et utilisable jusqu’à l’arrivée des données (voir _installer).
+        Un refresh demandé pendant un chargement remplace celui-ci.
+        """
+        # Les déplacements en attente doivent être lus par le chargement
+        self._ecrire_positions_maintenant()
+
+        # Le thread de travail ne reçoit que des ids : il lit ses propres
+        # instances au lieu de compléter celles affichées par le mur
+        filtre = self.filtre_actif.copie() if self.filtre_actif is not None else None
+        ids_filtres = None
+        if filtre is None and self.affaires_filtrees:
+            ids_filtres = [a.id_affaire for a in self.affaires_filtrees]
+
+        self.chargeur.charger(
+            filtre,
+            ids_filtres,
+            self.zone_visible() if self.niveau_detail() == COMPLET else None,
+            on_termine=self._installer,
+            on_progres=self._progression,
+            en_cache=self.cache_postits.versions(),
+        )
+
+    def _installer(self, resultat):
+        """
+        Remplace le contenu du mur par les données chargées :
         - suppression des widgets existants
-        - recréation des post-it
-        - redessin des liens
+        - reprise de la grille spatiale et du graphe des liens
+        - création des seuls post-it visibles
         """
+        if isinstance(resultat, Exception):
+            messagebox.showerror("Erreur", f"Chargement du mur impossible :\n{resultat}")
+            return
+
         self.delete("all")
         self.widgets.clear()
         self.liens.clear()
+        self.liens_par_affaire.clear()
+
+        self.affaires = {a.id_affaire: a for a in resultat.affaires}
+        self.grille = resultat.grille
+        self.voisins = resultat.voisins
+        if self.filtre_actif is not None:
+            self.affaires_filtrees = resultat.affaires
+
+        self.mettre_a_jour_vue()
 
-        # Utilise les affaires filtrées si un filtre est actif
-        affaires = self.affaires_filtrees or self.gestion.get_affaires()
+        # Changements reçus pendant le chargement
+        if self._a_recharger or self._a_deplacer or self._a_supprimer or self._liens_a_revoir:
+            self._appliquer_changements()
 
-        for a in affaires:
+    def _progression(self, fraction, texte):
+        """
+        Transmet la progression du chargement à la sidebar (None : terminé).
+        La barre reste affichée tant que l’autre chargeur travaille encore.
+        """
+        if fraction is None and (self.chargeur.en_cours or self.chargeur_disposition.en_cours):
+            return
+        if self.on_progress:
+            self.on_progress(fraction, texte)
+
+    # ------------------------------------------------
+    # ZONE VISIBLE
+    # ------------------------------------------------
+
+    def _emprise_estimee(self, affaire):
+        """
+        Rectangle (mur) d’un post-it pas encore créé (taille minimale).
+        """
+        x, y = affaire.pos_x or 0, affaire.pos_y or 0
+        return x, y, x + POSTIT_WIDTH, y + POSTIT_HEIGHT
+
+    def zone_visible(self):
+        """
+        Zone du mur affichée, élargie de MARGE_VUE pixels (coordonnées du mur).
+        """
+        z = self.zoom
+        x1 = (self.canvasx(0) - self.MARGE_VUE) / z
+        y1 = (self.canvasy(0) - self.MARGE_VUE) / z
+        x2 = (self.canvasx(self.winfo_width()) + self.MARGE_VUE) / z
+        y2 = (self.canvasy(self.winfo_height()) + self.MARGE_VUE) / z
+        return x1, y1, x2, y2
+
+    def planifier_vue(self):
+        """
+        Demande une mise à jour des post-it visibles au prochain idle
+        (un seul recalcul pour une rafale d’événements de déplacement).
+        """
+        if self._vue_prevue is None:
+            self._vue_prevue = self.after_idle(self.mettre_a_jour_vue)
+
+    def mettre_a_jour_vue(self):
+        """
+        Crée les post-it entrés dans la zone visible, détruit ceux
+        qui en sont sortis, réaffiche ceux dessinés à un autre zoom,
+        puis ajuste les lignes en conséquence.
+        Les relations (suspects, armes, lieux) ne sont lues que pour
+        les post-it affichés au niveau COMPLET.
+        """
+        if self._vue_prevue is not None:
+            self.after_cancel(self._vue_prevue)
+            self._vue_prevue = None
+
+        visibles = self.grille.dans(*self.zone_visible())
+
+        # Post-it sortis de la vue (conservés si leur formulaire est ouvert)
+        for id_affaire in self.widgets.keys() - visibles:
+            widget = self.widgets[id_affaire]
+            if widget.form_window is not None and widget.form_window.winfo_exists():
+                continue
+            del self.widgets[id_affaire]
+            widget.detruire()
+
+        nouveaux = [self.affaires[i] for i in visibles - self.widgets.keys()]
+        a_redessiner = [w for w in self.widgets.values() if w.zoom != self.zoom]
+
+        # Versions et relations lues en une fois pour le lot
+        if self.niveau_detail() == COMPLET:
+            self._preparer_complet(
+                nouveaux + [w.affaire for w in a_redessiner if w.niveau != COMPLET]
+            )
+
+        # Post-it dessinés à un autre zoom
+        for widget in a_redessiner:
+            widget.afficher()
+            self.maj_emprise(widget.affaire.id_affaire)
+
+        # Post-it entrés dans la vue
+        for a in nouveaux:
             self.widgets[a.id_affaire] = AffaireWidget(self, a, self.gestion, self)
+            self.maj_emprise(a.id_affaire)
 
         self.dessiner_liens()
 
+    def _preparer_complet(self, affaires):
+        """
+        Prépare l’affichage complet d’un lot de post-it : versions lues en
+        une requête, puis relations lues pour les seules affaires dont le
+        texte n’est pas déjà en cache pour cette version.
+        """
+        self.gestion.charger_versions([a for a in affaires if a.version is None])
+        self.gestion.charger_relations([
+            a for a in affaires
+            if not a.relations_chargees
+            and self.cache_postits.texte(a.id_affaire, a.version) is None
+        ])
+
+    def deplacer_affaire(self, id_affaire, x, y):
+        """
+        Enregistre la position d’un post-it déposé par l’utilisateur.
+        L’écriture en base est regroupée avec les déplacements suivants
+        (voir planifier_ecriture_positions).
+        """
+        affaire = self.affaires.get(id_affaire)
+        if affaire is not None:
+            affaire.pos_x, affaire.pos_y = x, y
+            affaire.marquer_propre()
+
+        self.maj_emprise(id_affaire)
+        self.gestion.maj_position_affaire_differee(id_affaire, x, y)
+        self.planifier_ecriture_positions()
+
+        # Liens regroupés : recalculés avec la vue
+        if self.niveau_detail() == COMPACT:
+            self.planifier_vue()
+
+    def planifier_ecriture_positions(self):
+        """
+        Écrit les positions en attente DELAI_POSITIONS ms après le dernier
+        déplacement (plusieurs glisser-déposer = une seule transaction).
+        """
+        if self._ecriture_prevue is not None:
+            self.after_cancel(self._ecriture_prevue)
+        self._ecriture_prevue = self.after(self.DELAI_POSITIONS, self._ecrire_positions)
+
+    def _ecrire_positions(self):
+        """
+        Vide le tampon de positions de la logique métier.
+        """
+        self._ecriture_prevue = None
+        self.gestion.vider_positions()
+
+    def _ecrire_positions_maintenant(self):
+        """
+        Écrit sans attendre les positions en attente (refresh, fermeture).
+        """
+        if self._ecriture_prevue is not None:
+            self.after_cancel(self._ecriture_prevue)
+        self._ecrire_positions()
+
+    def maj_emprise(self, id_affaire):
+        """
+        Enregistre dans la grille la position et la taille réelles d’un post-it
+        (après création, modification ou glisser-déposer).
+        """
+        widget = self.widgets.get(id_affaire)
+        if widget is not None:
+            z = self.zoom
+            self.grille.placer(id_affaire, *(c / z for c in self.coords(widget.rect)))
+
+    def centre(self, id_affaire):
+        """
+        Centre d’un post-it sur le canvas, qu’il soit créé ou non
+        (extrémité des lignes).
+        """
+        widget = self.widgets.get(id_affaire)
+        if widget is not None:
+            return widget.center()
+        x1, y1, x2, y2 = self.grille.rect(id_affaire)
+        return (x1 + x2) * self.zoom / 2, (y1 + y2) * self.zoom / 2
+
+    # ------------------------------------------------
+    # MISE À JOUR INCRÉMENTALE (FLUX DE CHANGEMENTS)
+    # ------------------------------------------------
+
+    def on_changement(self, evenement):
+        """
+        Reçoit un événement du backend (création, modification,
+        suppression, liaison...). Les événements sont regroupés puis
+        appliqués une seule fois quand Tk est inactif : un formulaire qui
+        enchaîne plusieurs écritures ne provoque qu'une mise à jour.
+        """
+        if evenement.entite == "affaire" and evenement.action == evenement.SUPPRESSION:
+            self._a_supprimer.update(evenement.affaires)
+        elif evenement.action == evenement.POSITION:
+            # Simple déplacement : ni texte ni relations à relire
+            self._a_deplacer.update(evenement.affaires)
+        else:
+            self._a_recharger.update(evenement.affaires)
+
+        if evenement.touche_liens:
+            self._liens_a_revoir.update(evenement.affaires)
+
+        if self._patch_prevu is None and evenement.affaires:
+            self._patch_prevu = self.after_idle(self._appliquer_changements)
+
+    def _appliquer_changements(self):
+        """
+        Met à jour uniquement les post-it et les lignes concernés
+        par les événements reçus depuis le dernier passage.
+        """
+        self._patch_prevu = None
+
+        # Un chargement est en cours : appliqué après son installation
+        if self.chargeur.en_cours:
+            return
+
+        supprimees = self._a_supprimer
+        a_recharger = self._a_recharger - supprimees
+        a_deplacer = (self._a_deplacer - supprimees - a_recharger) & self.affaires.keys()
+        liens = self._liens_a_revoir
+        self._a_supprimer, self._a_recharger, self._a_deplacer = set(), set(), set()
+        self._liens_a_revoir = set()
+
+        for id_affaire in supprimees:
+            self._retirer_affaire(id_affaire)
+
+        # Déplacements : seules les positions sont relues, les post-it sont
+        # glissés sans reconstruire leur texte
+        for a in self.gestion.get_affaires_par_ids(sorted(a_deplacer)):
+            widget = self.widgets.get(a.id_affaire)
+            if widget is not None:
+                widget.deplacer_vers(a.pos_x or 0, a.pos_y or 0)
+                self.maj_emprise(a.id_affaire)
+                self.deplacer_liens(a.id_affaire)
+            else:
+                affaire = self.affaires[a.id_affaire]
+                affaire.pos_x, affaire.pos_y = a.pos_x, a.pos_y
+                affaire.marquer_propre()
+                self.grille.placer(a.id_affaire, *self._emprise_estimee(affaire))
+                self._deplacer_liens_hors_vue(a.id_affaire)
+
+        if a_recharger:
+            # Affaires à afficher parmi celles qui ont changé
+            if self.filtre_actif is not None:
+                visibles = set(self.filtre_actif.copie().parmi(a_recharger).ids())
+            elif self.affaires_filtrees:
+                # Filtre figé : seules les affaires déjà sur le mur restent
+                visibles = a_recharger & self.affaires.keys()
+            else:
+                visibles = a_recharger
+
+            # Celles qui ne correspondent plus au filtre quittent le mur
+            for id_affaire in a_recharger - visibles:
+                if id_affaire in self.affaires:
+                    self._retirer_affaire(id_affaire)
+                    liens.discard(id_affaire)
+
+            affaires = self.gestion.get_affaires_par_ids(sorted(visibles))
+            if self.niveau_detail() == COMPLET:
+                self._preparer_complet([a for a in affaires if a.id_affaire in self.widgets])
+
+            for a in affaires:
+                if a.id_affaire not in self.affaires:
+                    # Nouvelle affaire (ou entrée dans le filtre) : liens à lire
+                    liens.add(a.id_affaire)
+                self.affaires[a.id_affaire] = a
+
+                widget = self.widgets.get(a.id_affaire)
+                if widget is None:
+                    self.grille.placer(a.id_affaire, *self._emprise_estimee(a))
+                else:
+                    # Post-it existant : texte, couleur et taille mis à jour sur place
+                    widget.mettre_a_jour(a)
+                    self.maj_emprise(a.id_affaire)
+                    self.deplacer_liens(a.id_affaire)
+
+        # Liens relus seulement pour les affaires dont les liaisons ont changé
+        for id_affaire in liens - supprimees:
+            self._relire_voisins(id_affaire)
+
+        # Création des nouveaux post-it visibles et des lignes manquantes
+        self.mettre_a_jour_vue()
+
+    def _retirer_affaire(self, id_affaire):
+        """
+        Retire une affaire du mur : post-it, emprise et lignes.
+        """
+        self.affaires.pop(id_affaire, None)
+        self.grille.retirer(id_affaire)
+        self.cache_postits.oublier(id_affaire)
+
+        widget = self.widgets.pop(id_affaire, None)
+        if widget is not None:
+            widget.detruire()
+
+        for autre in self.voisins.pop(id_affaire, ()):
+            self.voisins.get(autre, set()).discard(id_affaire)
+        self._supprimer_liens_de(id_affaire)
+
+        if self.affaires_filtrees:
+            self.affaires_filtrees = [a for a in self.affaires_filtrees if a.id_affaire != id_affaire]
+
+    def _relire_voisins(self, id_affaire):
+        """
+        Relit les paires liées d'une seule affaire (table LienAffaire,
+        lecture indexée) ; ses lignes sont redessinées par dessiner_liens.
+        """
+        for autre in self.voisins.pop(id_affaire, ()):
+            self.voisins.get(autre, set()).discard(id_affaire)
+        self._supprimer_liens_de(id_affaire)
+
+        if id_affaire not in self.affaires:
+            return
+        for paire in self.gestion.get_paires_affaire(id_affaire):
+            autre = paire.autre(id_affaire)
+            if autre in self.affaires:
+                self.voisins.setdefault(id_affaire, set()).add(autre)
+                self.voisins.setdefault(autre, set()).add(id_affaire)
+
+    def _on_destroy(self, event):
+        """
+        Se désabonne du backend à la destruction du canvas.
+        """
+        if event.widget is self:
+            self.gestion.desabonner(self.on_changement)
+            self.chargeur.annuler()
+            self.chargeur_disposition.annuler()
+
+            # Derniers déplacements écrits sans attendre le délai
+            self._ecrire_positions_maintenant()
+
     # ------------------------------------------------
     # LIENS ENTRE AFFAIRES
     # ------------------------------------------------
 
     def dessiner_liens(self):
         """
-        Dessine les liens entre les affaires ayant des éléments communs
-        (suspects, armes, lieux).
+        Fait correspondre les lignes aux post-it créés : une ligne existe
+        pour chaque lien dont au moins une extrémité est affichée
+        (l’autre extrémité peut être hors de la vue).
+        Au niveau COMPACT, les liens sont regroupés (voir _dessiner_agregats).
         """
-        self.liens = []
+        self.delete("agregat")
+        if self.niveau_detail() == COMPACT:
+            for id_a, id_b in list(self.liens):
+                self._supprimer_ligne(id_a, id_b)
+            self._dessiner_agregats()
+            return
+
+        # Lignes dont aucune extrémité n'est plus affichée
+        for (id_a, id_b), line in list(self.liens.items()):
+            if id_a not in self.widgets and id_b not in self.widgets:
+                self._supprimer_ligne(id_a, id_b)
+
+        for id_affaire in self.widgets:
+            for autre in self.voisins.get(id_affaire, ()):
+                self._dessiner_paire(min(id_affaire, autre), max(id_affaire, autre))
+
+    def _dessiner_paire(self, id_a, id_b):
+        """
+        Dessine la ligne entre deux affaires (si elle n'existe pas déjà).
+        """
+        if (id_a, id_b) in self.liens:
+            return
+
+        # Centre des deux post-it
+        x1, y1 = self.centre(id_a)
+        x2, y2 = self.centre(id_b)
 
-        affaires = (
-            self.affaires_filtrees
-            if self.affaires_filtrees is not None
-            else self.gestion.get_affaires()
+        # Création de la ligne de lien (plus fine si le texte n’est pas affiché)
+        line = self.create_line(
+            x1, y1, x2, y2,
+            fill=COLOR_LINK,
+            width=2 if self.niveau_detail() == COMPLET else 1,
+            tags=("lien",)
         )
 
-        for a in affaires:
-            for autre in affaires:
-                # Évite les doublons et les auto-liens
-                if a.id_affaire >= autre.id_affaire:
-                    continue
-
-                communs = self._communs(a, autre)
-                if communs:
-                    if a.id_affaire not in self.widgets or autre.id_affaire not in self.widgets:
-                        continue
-
-                    # Centre des deux post-it
-                    x1, y1 = self.widgets[a.id_affaire].center()
-                    x2, y2 = self.widgets[autre.id_affaire].center()
-
-                    # Création de la ligne de lien
-                    line = self.create_line(
-                        x1, y1, x2, y2,
-                        fill=COLOR_LINK,
-                        width=2,
-                        tags=("lien",)
-                    )
-
-                    # Place le lien sous les post-it
-                    self.tag_lower(line)
-
-                    # Clic sur le lien → popup des éléments communs
-                    self.tag_bind(
-                        line,
-                        "<Button-1>",
-                        lambda e, c=communs: self.show_liens_popup(c)
-                    )
-
-                    self.liens.append(line)
+        # Place le lien sous les post-it
+        self.tag_lower(line)
+
+        # Clic sur le lien → détail des éléments communs, chargé à la demande
+        self.tag_bind(
+            line,
+            "<Button-1>",
+            lambda e, a=id_a, b=id_b: self.show_liens_popup(
+                self.gestion.get_lien(a, b).communs()
+            )
+        )
+
+        self.liens[(id_a, id_b)] = line
+        self.liens_par_affaire.setdefault(id_a, []).append((line, id_b))
+        self.liens_par_affaire.setdefault(id_b, []).append((line, id_a))
+
+    def _dessiner_agregats(self):
+        """
+        Niveau COMPACT : les liens partant des post-it affichés sont
+        regroupés par paire de cases du mur (CASE_AGREGAT). Une seule ligne,
+        d’autant plus épaisse que les liens sont nombreux, relie le centre
+        moyen des extrémités de chaque groupe ; les liens internes à une
+        case ne sont pas dessinés.
+        """
+        case = self.CASE_AGREGAT * self.zoom
+
+        paires = set()
+        for id_affaire in self.widgets:
+            for autre in self.voisins.get(id_affaire, ()):
+                paires.add((min(id_affaire, autre), max(id_affaire, autre)))
+
+        # (case a, case b) -> [nombre, somme xa, somme ya, somme xb, somme yb]
+        groupes = {}
+        for id_a, id_b in paires:
+            xa, ya = self.centre(id_a)
+            xb, yb = self.centre(id_b)
+            ca = (int(xa // case), int(ya // case))
+            cb = (int(xb // case), int(yb // case))
+            if ca == cb:
+                continue
+            if cb < ca:
+                ca, cb, xa, ya, xb, yb = cb, ca, xb, yb, xa, ya
+
+            groupe = groupes.setdefault((ca, cb), [0, 0, 0, 0, 0])
+            groupe[0] += 1
+            groupe[1] += xa
+            groupe[2] += ya
+            groupe[3] += xb
+            groupe[4] += yb
+
+        for n, sxa, sya, sxb, syb in groupes.values():
+            line = self.create_line(
+                sxa / n, sya / n, sxb / n, syb / n,
+                fill=COLOR_LINK,
+                width=min(6, 1 + int(math.log2(n))),
+                tags=("lien", "agregat")
+            )
+            self.tag_lower(line)
+
+    def _supprimer_ligne(self, id_a, id_b):
+        """
+        Supprime la ligne entre deux affaires et ses entrées d’index.
+        """
+        line = self.liens.pop((id_a, id_b), None)
+        if line is None:
+            return
+        self.delete(line)
+        for id_affaire in (id_a, id_b):
+            restants = [(l, a) for l, a in self.liens_par_affaire.get(id_affaire, ()) if l != line]
+            if restants:
+                self.liens_par_affaire[id_affaire] = restants
+            else:
+                self.liens_par_affaire.pop(id_affaire, None)
+
+    def _supprimer_liens_de(self, id_affaire):
+        """
+        Supprime les lignes reliées au post-it id_affaire.
+        """
+        for line, autre in list(self.liens_par_affaire.get(id_affaire, ())):
+            self._supprimer_ligne(min(id_affaire, autre), max(id_affaire, autre))
+
+    def deplacer_liens(self, id_affaire):
+        """
+        Met à jour uniquement les lignes reliées au post-it id_affaire
+        (pendant un glisser-déposer : pas d'accès DB, pas de recalcul).
+        """
+        widget = self.widgets.get(id_affaire)
+        if widget is None:
+            return
+
+        x1, y1 = widget.center()
+        for line, autre in self.liens_par_affaire.get(id_affaire, ()):
+            x2, y2 = self.centre(autre)
+            self.coords(line, x1, y1, x2, y2)
+
+    def _deplacer_liens_hors_vue(self, id_affaire):
+        """
+        Recale les lignes partant d’un post-it non créé (extrémité hors vue).
+        """
+        x1, y1 = self.centre(id_affaire)
+        for line, autre in self.liens_par_affaire.get(id_affaire, ()):
+            x2, y2 = self.centre(autre)
+            self.coords(line, x1, y1, x2, y2)
 
     def show_liens_popup(self, communs):
         """
@@ -200,69 +841,16 @@ class CanvasView(tk.Canvas):
         """
         Supprime et redessine tous les liens.
         """
-        for line in self.liens:
-            self.delete(line)
-
+        self._effacer_liens()
         self.dessiner_liens()
 
-    # ------------------------------------------------
-    # DÉTECTION DES ÉLÉMENTS COMMUNS
-    # ------------------------------------------------
-
-    def _communs(self, a1, a2):
-        """
-        Détecte les éléments communs entre deux affaires :
-        - suspects
-        - armes
-        - lieux
-
-        Retourne une liste de chaînes descriptives.
-        """
-        communs = []
-
-        # -------------------------
-        # SUSPECTS COMMUNS
-        # -------------------------
-        suspects1 = {s.id_suspect: s for s in a1.get_suspects()}
-        suspects2 = {s.id_suspect: s for s in a2.get_suspects()}
-
-        ids_communs = suspects1.keys() & suspects2.keys()
-        if ids_communs:
-            for sid in ids_communs:
-                s = suspects1[sid]
-                communs.append(f"👥 Suspect commun : {s.prenom} {s.nom}")
-
-        # -------------------------
-        # ARMES COMMUNES
-        # -------------------------
-        armes1 = {a.id_arme: a for a in a1.get_armes()}
-        armes2 = {a.id_arme: a for a in a2.get_armes()}
-
-        ids_communs = armes1.keys() & armes2.keys()
-        if ids_communs:
-            for aid in ids_communs:
-                a = armes1[aid]
-                label = a.type
-                if a.numero_serie:
-                    label += f" (n° {a.numero_serie})"
-                communs.append(f"🔪 Arme commune : {label}")
-
-        # -------------------------
-        # LIEUX COMMUNS
-        # -------------------------
-        lieux1 = {l.id_lieu: l for l in a1.get_lieux()}
-        lieux2 = {l.id_lieu: l for l in a2.get_lieux()}
-
-        ids_communs = lieux1.keys() & lieux2.keys()
-        if ids_communs:
-            for lid in ids_communs:
-                l = lieux1[lid]
-                label = l.nom
-                if l.adresse:
-                    label += f" ({l.adresse})"
-                communs.append(f"📍 Lieu commun : {label}")
-
-        return communs
+    def _effacer_liens(self):
+        """
+        Supprime toutes les lignes du canvas (liens et regroupements).
+        """
+        self.delete("lien")
+        self.liens = {}
+        self.liens_par_affaire = {}
 
     # ------------------------------------------------
     # ACTIONS UTILISATEUR
@@ -278,8 +866,8 @@ class CanvasView(tk.Canvas):
             return
 
         def _closed():
+            # La nouvelle affaire est ajoutée au mur par on_changement
             self.form_creation = None
-            self.refresh()
 
         self.form_creation = AffaireForm(self, self.gestion, on_close=_closed)
 
@@ -294,17 +882,33 @@ class CanvasView(tk.Canvas):
         Applique un filtre sur les affaires affichées.
         """
         self.affaires_filtrees = affaires
+        self.filtre_actif = None
         self.filter_text = label
         self.refresh()
 
         if self.on_filter_changed:
             self.on_filter_changed(label)
 
+    def appliquer_filtre_composite(self, filtre):
+        """
+        Applique un FiltreAffaires : la requête est exécutée au refresh,
+        puis relancée à chaque refresh suivant (affaires créées ou
+        modifiées prises en compte). Le filtre peut ensuite être
+        combiné avec d'autres critères depuis la popup.
+        """
+        self.filtre_actif = filtre
+        self.filter_text = filtre.libelle()
+        self.refresh()
+
+        if self.on_filter_changed:
+            self.on_filter_changed(self.filter_text)
+
     def reset_filtre(self):
         """
         Supprime le filtre actif.
         """
         self.affaires_filtrees = None
+        self.filtre_actif = None
         self.filter_text = "Aucun"
         self.refresh()
 
@@ -317,3 +921,4 @@ class CanvasView(tk.Canvas):
         """
         self.xview_moveto(0)
         self.yview_moveto(0)
+        self.planifier_vue()
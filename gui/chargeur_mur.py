@@ -0,0 +1,246 @@
+"""
+
+Chargement des données du mur d’enquête dans un thread de travail.
+
+Les lectures en base (affaires, relations des post-it visibles, liens) se
+font hors du thread Tk : la fenêtre reste réactive. Le thread dépose sa
+progression et son résultat dans une file, relevée par `after()` depuis la
+boucle Tk. Chaque chargement porte un numéro de génération : le résultat
+d’un chargement dépassé par un plus récent est ignoré.
+
+Le thread ne reçoit que des données simples (filtre copié, ids) et lit ses
+propres instances d’Affaire : il ne modifie jamais un objet que le thread
+Tk est en train d’afficher.
+
+"""
+
+import queue
+import threading
+
+from gui.grille_spatiale import GrilleSpatiale
+from gui.styles import POSTIT_WIDTH, POSTIT_HEIGHT
+
+
+class ResultatChargement:
+    """
+    Données préparées par le thread de travail, prêtes à être affichées.
+    """
+
+    def __init__(self, affaires, grille, voisins):
+        """
+        affaires : liste d’Affaire (relations chargées pour la zone visible)
+        grille   : GrilleSpatiale des emprises estimées
+        voisins  : id_affaire -> ensemble des ids d’affaires liées
+        """
+        self.affaires = affaires
+        self.grille = grille
+        self.voisins = voisins
+
+
+class ChargeurMur:
+    """
+    Lance les chargements du mur (ou d’autres calculs longs, comme la
+    disposition par liens) en arrière-plan et transmet les résultats au
+    thread Tk (seul autorisé à toucher aux widgets).
+    """
+
+    # Intervalle de relève de la file (ms)
+    INTERVALLE = 50
+
+    # Affaires lues par page (progression affichée entre deux pages)
+    TAILLE_PAGE = 2000
+
+    def __init__(self, widget, gestion):
+        """
+        widget  : widget Tk servant à planifier la relève (after)
+        gestion : instance de GestionEnquetes
+        """
+        self.widget = widget
+        self.gestion = gestion
+        self.file = queue.Queue()
+
+        # Numéro du dernier chargement demandé
+        self.generation = 0
+
+        # Callbacks du chargement en cours
+        self._on_progres = None
+        self._on_termine = None
+        self._releve_prevue = None
+
+    @property
+    def en_cours(self):
+        """
+        Vrai tant que le dernier travail lancé n’est pas terminé.
+        """
+        return self._on_termine is not None
+
+    def lancer(self, travail, on_termine, on_progres=None, texte="Chargement…"):
+        """
+        Exécute travail(progres, obsolete) dans un thread de travail ;
+        un travail précédent encore en cours est abandonné (son résultat
+        sera ignoré).
+
+        travail    : fonction sans accès à Tk ; progres(fraction, texte)
+                     signale l’avancement, obsolete() devient vrai quand
+                     un travail plus récent a été lancé
+        on_termine : appelé dans le thread Tk avec le résultat (ou l’exception)
+        on_progres : appelé avec (fraction entre 0 et 1, texte), puis (None, "")
+        """
+        self.generation += 1
+        self._on_termine = on_termine
+        self._on_progres = on_progres
+
+        threading.Thread(
+            target=self._executer,
+            args=(self.generation, travail),
+            daemon=True,
+        ).start()
+
+        self._progres(0.0, texte)
+        if self._releve_prevue is None:
+            self._releve_prevue = self.widget.after(self.INTERVALLE, self._relever)
+
+    def charger(self, filtre, ids_filtres, zone, on_termine, on_progres=None, en_cache=None):
+        """
+        Lance le chargement des données du mur.
+
+        filtre            : FiltreAffaires à exécuter (ou None)
+        ids_filtres       : ids d’une liste figée d’affaires (ou None),
+                            relues par le thread de travail
+        zone              : (x1, y1, x2, y2) visible, relations préchargées dedans
+                            (None : aucune, post-it affichés sans leur texte complet)
+        on_termine        : appelé avec un ResultatChargement (ou une exception)
+        en_cache          : {id_affaire: version} des post-it dont le texte est
+                            en cache (relations non relues si la version est la même)
+        """
+        self.lancer(
+            lambda progres, obsolete: self._lire_mur(
+                filtre, ids_filtres, zone, en_cache or {}, progres, obsolete
+            ),
+            on_termine,
+            on_progres,
+            "Chargement des affaires…",
+        )
+
+    # ------------------------------------------------
+    # THREAD DE TRAVAIL (aucun accès à Tk)
+    # ------------------------------------------------
+
+    def _executer(self, generation, travail):
+        """
+        Exécute le travail et dépose son résultat dans la file.
+        """
+        def progres(fraction, texte):
+            self.file.put((generation, "progres", (fraction, texte)))
+
+        def obsolete():
+            return generation != self.generation
+
+        try:
+            resultat = travail(progres, obsolete)
+        except Exception as e:
+            self.file.put((generation, "erreur", e))
+            return
+
+        if not obsolete():
+            self.file.put((generation, "resultat", resultat))
+
+    def _lire_mur(self, filtre, ids_filtres, zone, en_cache, progres, obsolete):
+        """
+        Lit les données du mur (None si le chargement devient obsolète).
+        """
+        if filtre is not None:
+            affaires = filtre.affaires()
+        elif ids_filtres:
+            affaires = self.gestion.get_affaires_par_ids(ids_filtres)
+        else:
+            # Lecture par pages : la progression avance au fil du parcours
+            total = self.gestion.filtre().compter() or 1
+            affaires = []
+            for a in self.gestion.iter_affaires(taille_page=self.TAILLE_PAGE):
+                affaires.append(a)
+                if len(affaires) % self.TAILLE_PAGE == 0:
+                    if obsolete():
+                        return None
+                    progres(0.6 * len(affaires) / total, "Chargement des affaires…")
+
+        if obsolete():
+            return None
+        progres(0.6, "Chargement des relations…")
+
+        # Emprises estimées (taille minimale du post-it)
+        grille = GrilleSpatiale()
+        for a in affaires:
+            x, y = a.pos_x or 0, a.pos_y or 0
+            grille.placer(a.id_affaire, x, y, x + POSTIT_WIDTH, y + POSTIT_HEIGHT)
+
+        # Relations des seuls post-it de la zone visible dont le texte
+        # n’est pas en cache pour leur version actuelle
+        if zone is not None:
+            ids_visibles = grille.dans(*zone)
+            visibles = [a for a in affaires if a.id_affaire in ids_visibles]
+            self.gestion.charger_versions(visibles)
+            self.gestion.charger_relations([
+                a for a in visibles if en_cache.get(a.id_affaire) != a.version
+            ])
+
+        if obsolete():
+            return None
+        progres(0.8, "Chargement des liens…")
+
+        ids = {a.id_affaire for a in affaires}
+        voisins = {}
+        for paire in self.gestion.get_paires_liees(ids):
+            if paire.id_a in ids and paire.id_b in ids:
+                voisins.setdefault(paire.id_a, set()).add(paire.id_b)
+                voisins.setdefault(paire.id_b, set()).add(paire.id_a)
+
+        return ResultatChargement(affaires, grille, voisins)
+
+    # ------------------------------------------------
+    # RELÈVE DANS LE THREAD TK
+    # ------------------------------------------------
+
+    def _relever(self):
+        """
+        Traite les messages du thread de travail ; ceux d’une génération
+        dépassée sont ignorés.
+        """
+        self._releve_prevue = None
+
+        while True:
+            try:
+                generation, nature, contenu = self.file.get_nowait()
+            except queue.Empty:
+                break
+
+            if generation != self.generation or self._on_termine is None:
+                continue
+
+            if nature == "progres":
+                self._progres(*contenu)
+            else:
+                on_termine = self._on_termine
+                self._on_termine = None
+                self._progres(None, "")
+                on_termine(contenu)
+
+        if self.en_cours:
+            self._releve_prevue = self.widget.after(self.INTERVALLE, self._relever)
+
+    def _progres(self, fraction, texte):
+        """
+        Transmet la progression (None : chargement terminé).
+        """
+        if self._on_progres:
+            self._on_progres(fraction, texte)
+
+    def annuler(self):
+        """
+        Abandonne le travail en cours (ex. fermeture de la fenêtre).
+        """
+        self.generation += 1
+        self._on_termine = None
+        if self._releve_prevue is not None:
+            self.widget.after_cancel(self._releve_prevue)
+            self._releve_prevue = None
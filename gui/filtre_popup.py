@@ -16,7 +16,10 @@ class FiltrePopup(tk.Toplevel):
     """
     Fenêtre popup permettant de filtrer les affaires affichées
     dans le mur d’enquête selon différents critères :
-    statut, texte, suspect, arme ou période de dates.
+    statut, texte, suspect, arme, lieu, code postal ou période de dates.
+
+    Les critères peuvent se cumuler avec le filtre déjà actif ; l'ensemble
+    est exécuté en une seule requête SQL (FiltreAffaires).
     """
 
     def __init__(self, parent, gestion, canvas_view):
@@ -32,7 +35,7 @@ class FiltrePopup(tk.Toplevel):
 
         # Configuration de la fenêtre
         self.title("🔍 Filtrer les affaires")
-        self.geometry("300x360")
+        self.geometry("300x480")
         self.resizable(False, False)
         self.grab_set()  # fenêtre modale
 
@@ -54,14 +57,50 @@ class FiltrePopup(tk.Toplevel):
         tk.Button(self, text="🔪 Par arme", command=self.filtre_arme) \
             .pack(fill="x", pady=5, padx=10)
 
+        tk.Button(self, text="📍 Par lieu", command=self.filtre_lieu) \
+            .pack(fill="x", pady=5, padx=10)
+
+        tk.Button(self, text="🏙 Par code postal", command=self.filtre_code_postal) \
+            .pack(fill="x", pady=5, padx=10)
+
         tk.Button(self, text="📅 Entre deux dates", command=self.filtre_dates) \
             .pack(fill="x", pady=5, padx=10)
 
+        # Cumul avec le filtre actif (proposé seulement s'il y en a un)
+        self.combiner = tk.BooleanVar(value=canvas_view.filtre_actif is not None)
+        if canvas_view.filtre_actif is not None:
+            tk.Checkbutton(
+                self,
+                text="Combiner avec le filtre actif",
+                variable=self.combiner
+            ).pack(pady=5)
+
         # Bouton de remise à zéro
         tk.Label(self, text="").pack()
         tk.Button(self, text="♻️ Réinitialiser", command=self.reset) \
             .pack(fill="x", pady=5, padx=10)
 
+    # ==================================================
+    # CONSTRUCTION / APPLICATION DU FILTRE
+    # ==================================================
+
+    def _nouveau_filtre(self):
+        """
+        Filtre de départ : copie du filtre actif si l'utilisateur
+        veut combiner les critères, sinon un filtre vide.
+        """
+        actif = self.canvas_view.filtre_actif
+        if actif is not None and self.combiner.get():
+            return actif.copie()
+        return self.gestion.filtre()
+
+    def _appliquer(self, filtre):
+        """
+        Applique le filtre au mur (exécuté en une requête).
+        """
+        self.canvas_view.appliquer_filtre_composite(filtre)
+        self.destroy()
+
     # ==================================================
     # FILTRES SIMPLES
     # ==================================================
@@ -70,48 +109,43 @@ class FiltrePopup(tk.Toplevel):
         """
         Filtre toutes les affaires ayant le statut 'en cours'.
         """
-        affaires = [
-            a for a in self.gestion.get_affaires()
-            if a.statut == "en cours"
-        ]
-        self.canvas_view.appliquer_filtre(affaires, "Affaires en cours")
-        self.destroy()
+        self._appliquer(self._nouveau_filtre().en_cours())
 
     def filtre_classees(self):
         """
         Filtre toutes les affaires ayant le statut 'classée'.
         """
-        affaires = [
-            a for a in self.gestion.get_affaires()
-            if a.statut == "classée"
-        ]
-        self.canvas_view.appliquer_filtre(affaires, "Affaires classées")
-        self.destroy()
+        self._appliquer(self._nouveau_filtre().classees())
 
     def filtre_texte(self):
         """
-        Recherche textuelle simple dans le titre et le lieu d’une affaire.
+        Recherche plein texte (index FTS) dans les affaires :
+        titre, description, lieu, ville, suspects, armes et lieux liés.
         """
         texte = simpledialog.askstring("Recherche", "Mot à chercher :")
         if not texte:
             return
 
-        texte_low = texte.lower()
-        resultats = []
+        self._appliquer(self._nouveau_filtre().texte(texte))
 
-        for a in self.gestion.get_affaires():
-            champs = [
-                a.titre.lower(),
-                (a.lieu or "").lower()
-            ]
-            if any(texte_low in c for c in champs):
-                resultats.append(a)
+    def filtre_code_postal(self):
+        """
+        Filtre les affaires d'une ville (code postal) sélectionnée.
+        """
+        villes = self.gestion.get_villes()
+        if not villes:
+            return messagebox.showinfo("Info", "Aucune ville.")
 
-        self.canvas_view.appliquer_filtre(resultats, f"Texte : {texte}")
-        self.destroy()
+        self._select_popup(
+            title="Filtrer par code postal",
+            label="Choisir une ville :",
+            items=villes,
+            display=lambda v: f"{v[0]} {v[1]}",
+            on_select=lambda v: self._appliquer(self._nouveau_filtre().code_postal(v[0]))
+        )
 
     # ==================================================
-    # FILTRE PAR SÉLECTION (SUSPECT / ARME)
+    # FILTRE PAR SÉLECTION (SUSPECT / ARME / LIEU)
     # ==================================================
 
     def filtre_suspect(self):
@@ -134,15 +168,9 @@ class FiltrePopup(tk.Toplevel):
         """
         Applique le filtre après sélection d’un suspect.
         """
-        resultats = [
-            a for a in self.gestion.get_affaires()
-            if s.id_suspect in {x.id_suspect for x in a.get_suspects()}
-        ]
-        self.canvas_view.appliquer_filtre(
-            resultats,
-            f"Par suspect : {s.prenom} {s.nom}"
+        self._appliquer(
+            self._nouveau_filtre().suspect(s.id_suspect, f"Par suspect : {s.prenom} {s.nom}")
         )
-        self.destroy()
 
     def filtre_arme(self):
         """
@@ -168,17 +196,29 @@ class FiltrePopup(tk.Toplevel):
         """
         Applique le filtre après sélection d’une arme.
         """
-        resultats = [
-            a for a in self.gestion.get_affaires()
-            if arme.id_arme in {x.id_arme for x in a.get_armes()}
-        ]
-
         label = arme.type
         if getattr(arme, "numero_serie", None):
             label += f" (n° {arme.numero_serie})"
 
-        self.canvas_view.appliquer_filtre(resultats, f"Par arme : {label}")
-        self.destroy()
+        self._appliquer(self._nouveau_filtre().arme(arme.id_arme, f"Par arme : {label}"))
+
+    def filtre_lieu(self):
+        """
+        Filtre les affaires liées à un lieu sélectionné.
+        """
+        lieux = self.gestion.get_lieux()
+        if not lieux:
+            return messagebox.showinfo("Info", "Aucun lieu.")
+
+        self._select_popup(
+            title="Filtrer par lieu",
+            label="Choisir un lieu :",
+            items=lieux,
+            display=lambda l: f"{l.nom} ({l.adresse})" if l.adresse else l.nom,
+            on_select=lambda l: self._appliquer(
+                self._nouveau_filtre().lieu(l.id_lieu, f"Par lieu : {l.nom}")
+            )
+        )
 
     # ==================================================
     # FILTRE PAR DATES
@@ -211,29 +251,10 @@ class FiltrePopup(tk.Toplevel):
                 "Date invalide.\nFormat attendu : JJ-MM-AAAA"
             )
 
-        resultats = []
-        for a in self.gestion.get_affaires():
-            try:
-                date_affaire = datetime.strptime(a.date, "%d-%m-%Y")
-            except ValueError:
-                continue
-
-            if date_min and date_affaire < date_min:
-                continue
-            if date_max and date_affaire > date_max:
-                continue
-
-            resultats.append(a)
-
-        fmt = "%d-%m-%Y"
-        smin = date_min.strftime(fmt) if date_min else "—"
-        smax = date_max.strftime(fmt) if date_max else "—"
+        if not date_min and not date_max:
+            return
 
-        self.canvas_view.appliquer_filtre(
-            resultats,
-            f"Entre : {smin} -> {smax}"
-        )
-        self.destroy()
+        self._appliquer(self._nouveau_filtre().entre_dates(date_min, date_max))
 
     # ==================================================
     # POPUP GÉNÉRIQUE DE SÉLECTION
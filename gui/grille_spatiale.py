@@ -0,0 +1,101 @@
+"""
+
+Index spatial en grille pour le mur d’enquête.
+
+Le mur est découpé en cases carrées ; chaque post-it est enregistré dans
+les cases que couvre son emprise. Trouver les post-it visibles revient à
+parcourir les seules cases de la zone affichée, quelle que soit la taille
+de l’archive.
+
+"""
+
+
+class GrilleSpatiale:
+    """
+    Associe des identifiants à des rectangles (x1, y1, x2, y2) et retrouve
+    rapidement ceux qui intersectent une zone donnée.
+    """
+
+    def __init__(self, taille_case=400):
+        """
+        taille_case : côté d’une case en pixels (de l’ordre de deux post-it)
+        """
+        self.taille_case = taille_case
+
+        # (colonne, ligne) -> ensemble d’identifiants
+        self.cases = {}
+
+        # identifiant -> rectangle enregistré
+        self.rects = {}
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, ident):
+        return ident in self.rects
+
+    def _cases_de(self, x1, y1, x2, y2):
+        """
+        Coordonnées des cases couvertes par un rectangle.
+        """
+        t = self.taille_case
+        for cx in range(int(x1 // t), int(x2 // t) + 1):
+            for cy in range(int(y1 // t), int(y2 // t) + 1):
+                yield cx, cy
+
+    def placer(self, ident, x1, y1, x2, y2):
+        """
+        Enregistre (ou déplace) le rectangle d’un identifiant.
+        """
+        if ident in self.rects:
+            self.retirer(ident)
+
+        self.rects[ident] = (x1, y1, x2, y2)
+        for case in self._cases_de(x1, y1, x2, y2):
+            self.cases.setdefault(case, set()).add(ident)
+
+    def retirer(self, ident):
+        """
+        Retire un identifiant de la grille (sans effet s’il est absent).
+        """
+        rect = self.rects.pop(ident, None)
+        if rect is None:
+            return
+
+        for case in self._cases_de(*rect):
+            contenu = self.cases.get(case)
+            if contenu is not None:
+                contenu.discard(ident)
+                if not contenu:
+                    del self.cases[case]
+
+    def rect(self, ident):
+        """
+        Rectangle enregistré pour un identifiant (None s’il est absent).
+        """
+        return self.rects.get(ident)
+
+    def dans(self, x1, y1, x2, y2):
+        """
+        Identifiants dont le rectangle intersecte la zone (x1, y1, x2, y2).
+        """
+        trouves = set()
+        for case in self._cases_de(x1, y1, x2, y2):
+            contenu = self.cases.get(case)
+            if contenu:
+                trouves.update(contenu)
+
+        # Les cases débordent de la zone : test exact sur les candidats
+        rects = self.rects
+        return {
+            i for i in trouves
+            if rects[i][0] <= x2 and rects[i][2] >= x1
+            and rects[i][1] <= y2 and rects[i][3] >= y1
+        }
+
+    def clear(self):
+        """
+        Vide la grille.
+        """
+        self.cases.clear()
+        self.rects.clear()
@@ -66,8 +66,9 @@ class MainWindow(tk.Tk):
         self.sidebar = Sidebar(self)
         self.sidebar.pack(side=tk.LEFT, fill=tk.Y)
 
-        # Canvas (mur d'enquête)
-        self.canvas_view = CanvasView(self, gestion)
+        # Canvas (mur d'enquête) : la progression est transmise dès la
+        # construction, le premier chargement l'affiche déjà
+        self.canvas_view = CanvasView(self, gestion, on_progress=self.sidebar.set_progress)
         self.canvas_view.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
         self.canvas_view.on_filter_changed = self.sidebar.set_filter_text
@@ -81,7 +82,8 @@ class MainWindow(tk.Tk):
             on_filter=self.canvas_view.filtrer_affaires,
             on_center=self.canvas_view.reset_view,
             on_reset_layout=self.canvas_view.relayout_affaires,
-            on_help=self._help
+            on_help=self._help,
+            on_force_layout=self.canvas_view.disposer_par_liens
         )
 
 
@@ -158,7 +160,8 @@ class MainWindow(tk.Tk):
         messagebox.showinfo(
             "Aide – Utilisation de l'application",
             "🧱 Mur d'enquête\n"
-            "• Clic droit + glisser : déplacer le mur\n\n"
+            "• Clic droit + glisser : déplacer le mur\n"
+            "• Molette : zoomer (vue d'ensemble en dézoomant)\n\n"
 
             "📌 Post-it (affaires)\n"
             "• Clic gauche + glisser : déplacer une affaire\n"
@@ -7,6 +7,7 @@ Certaines parties du code ont été générées ou assistées par une intelligen
 """
 
 import tkinter as tk
+from tkinter import ttk
 
 
 class Sidebar(tk.Frame):
@@ -56,6 +57,10 @@ class Sidebar(tk.Frame):
         self.btn_reset_layout = tk.Button(self, text="🧩 Réorganiser le mur")
         self.btn_reset_layout.pack(fill="x", padx=10, pady=5)
 
+        # Bouton pour rapprocher les post-it liés (disposition par forces)
+        self.btn_force_layout = tk.Button(self, text="🕸️ Disposer par liens")
+        self.btn_force_layout.pack(fill="x", padx=10, pady=5)
+
         # ========================
         # SÉPARATEUR VISUEL
         # ========================
@@ -81,6 +86,25 @@ class Sidebar(tk.Frame):
         )
         self.lbl_filter.pack(fill="x", padx=10, pady=(0, 10))
 
+        # ========================
+        # PROGRESSION DU CHARGEMENT
+        # ========================
+        # Cadre toujours présent : son contenu n’est affiché que pendant un chargement
+        self.frame_progress = tk.Frame(self, bg="#bbb")
+        self.frame_progress.pack(fill="x", padx=10)
+
+        self.lbl_progress = tk.Label(
+            self.frame_progress,
+            text="",
+            bg="#bbb",
+            anchor="w"
+        )
+        self.bar_progress = ttk.Progressbar(
+            self.frame_progress,
+            mode="determinate",
+            maximum=1.0
+        )
+
         # ========================
         # BOUTON AIDE
         # ========================
@@ -97,7 +121,8 @@ class Sidebar(tk.Frame):
             on_filter=None,
             on_center=None,
             on_reset_layout=None,
-            on_help=None
+            on_help=None,
+            on_force_layout=None
     ):
         """
         Associe les fonctions passées en paramètre
@@ -117,6 +142,8 @@ class Sidebar(tk.Frame):
             self.btn_reset_layout.config(command=on_reset_layout)
         if on_help:
             self.btn_help.config(command=on_help)
+        if on_force_layout:
+            self.btn_force_layout.config(command=on_force_layout)
 
     # ------------------------------------------------
     # MISE À JOUR DU FILTRE
@@ -128,3 +155,24 @@ class Sidebar(tk.Frame):
         le filtre actuellement actif.
         """
         self.lbl_filter.config(text=text or "Aucun")
+
+    # ------------------------------------------------
+    # PROGRESSION DU CHARGEMENT
+    # ------------------------------------------------
+
+    def set_progress(self, fraction, text: str = ""):
+        """
+        Affiche l’avancement d’un chargement (fraction entre 0 et 1),
+        ou masque l’indicateur si fraction vaut None.
+        """
+        if fraction is None:
+            self.lbl_progress.pack_forget()
+            self.bar_progress.pack_forget()
+            return
+
+        if not self.bar_progress.winfo_ismapped():
+            self.lbl_progress.pack(fill="x")
+            self.bar_progress.pack(fill="x", pady=(0, 10))
+
+        self.lbl_progress.config(text=text)
+        self.bar_progress.config(value=fraction)
@@ -5,3 +5,9 @@ COLOR_EN_COURS = "#c97a1b"
 COLOR_CLASSEE = "#7a7a7a"
 COLOR_BG = "#e6e6e6"
 COLOR_LINK = "#3b82f6"
+
+# Zoom du mur et niveaux de détail des post-it
+ZOOM_MIN = 0.1
+ZOOM_MAX = 2.0
+ZOOM_TITRE = 0.4      # en dessous : rectangle coloré et numéro
+ZOOM_COMPLET = 0.75   # à partir de : texte complet
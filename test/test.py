@@ -1,8 +1,11 @@
 import unittest
 import os
+from datetime import date
+from unittest.mock import patch
 
 from backend.gestion_enquete import GestionEnquetes
-from database import init_db
+import database
+from database import init_db, close_pool
 
 
 class TestGestionEnquetes(unittest.TestCase):
@@ -10,6 +13,8 @@ class TestGestionEnquetes(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         # On supprime la base existante pour repartir sur un état propre
+        # (les connexions du pool pointeraient sinon vers l'ancien fichier)
+        close_pool()
         if os.path.exists("detectives.db"):
             os.remove("detectives.db")
 
@@ -90,6 +95,654 @@ class TestGestionEnquetes(unittest.TestCase):
         with self.assertRaises(Exception):
             self.g.creer_ville("1000", "AutreVille")
 
+    # ==================================================
+    # TEST 3 — PRÉCHARGEMENT DES RELATIONS
+    # ==================================================
+    def test_get_affaires_with_relations(self):
+        """
+        Fonction testée : get_affaires(with_relations=True)
+
+        PRE :
+        - Une affaire est liée à un suspect, une arme et un lieu
+
+        POST :
+        - Les relations sont attachées aux objets Affaire
+        - Les accesseurs ne relisent plus la base
+        """
+        affaire = self.g.creer_affaire("Relations", "02-02-2025", "Ville", "9998", "en cours")
+        s = self.g.creer_suspect("Dupont", "Jean")
+        ar = self.g.creer_arme("Couteau", None, "X1", affaire.id_affaire)
+        l = self.g.creer_lieu("Entrepôt", "Rue 1", None, affaire.id_affaire)
+        self.g.lier_suspect_affaire(affaire.id_affaire, s.id_suspect)
+        self.g.lier_arme_affaire(affaire.id_affaire, ar.id_arme)
+        self.g.lier_lieu_affaire(affaire.id_affaire, l.id_lieu)
+
+        affaires = self.g.get_affaires(with_relations=True)
+        a = next(x for x in affaires if x.id_affaire == affaire.id_affaire)
+
+        with patch("backend.affaire.get_connection") as mock_conn:
+            self.assertEqual([x.id_suspect for x in a.get_suspects()], [s.id_suspect])
+            self.assertEqual([x.id_arme for x in a.get_armes()], [ar.id_arme])
+            self.assertEqual([x.id_lieu for x in a.get_lieux()], [l.id_lieu])
+            mock_conn.assert_not_called()
+
+        # Relations oubliées : relues au prochain accès
+        a.invalider_relations()
+        self.assertFalse(a.est_modifie)
+        self.assertEqual([x.id_suspect for x in a.get_suspects()], [s.id_suspect])
+
+        self.g.supprimer_affaire(affaire.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 4 — MOTEUR DE LIENS
+    # ==================================================
+    def test_liens_entites_communes(self):
+        """
+        Fonction testée : get_liens / get_liens_affaire
+
+        PRE :
+        - A et B partagent un suspect, B et C partagent une arme
+
+        POST :
+        - Seules les paires (A, B) et (B, C) sont retournées
+        - Chaque lien porte les entités communes
+        """
+        a = self.g.creer_affaire("Lien A", "03-03-2025", "Ville", "9997", "en cours")
+        b = self.g.creer_affaire("Lien B", "03-03-2025", "Ville", "9997", "en cours")
+        c = self.g.creer_affaire("Lien C", "03-03-2025", "Ville", "9997", "classée")
+        s = self.g.creer_suspect("Martin", "Paul")
+        ar = self.g.creer_arme("Revolver", None, "R-1", b.id_affaire)
+
+        self.g.lier_suspect_affaire(a.id_affaire, s.id_suspect)
+        self.g.lier_suspect_affaire(b.id_affaire, s.id_suspect)
+        self.g.lier_arme_affaire(b.id_affaire, ar.id_arme)
+        self.g.lier_arme_affaire(c.id_affaire, ar.id_arme)
+
+        ids = [a.id_affaire, b.id_affaire, c.id_affaire]
+        liens = {(l.id_a, l.id_b): l for l in self.g.get_liens(ids)}
+
+        self.assertEqual(set(liens), {(a.id_affaire, b.id_affaire), (b.id_affaire, c.id_affaire)})
+        self.assertEqual([x.id_suspect for x in liens[(a.id_affaire, b.id_affaire)].suspects], [s.id_suspect])
+        self.assertEqual([x.id_arme for x in liens[(b.id_affaire, c.id_affaire)].armes], [ar.id_arme])
+
+        liens_b = self.g.get_liens_affaire(b.id_affaire)
+        self.assertEqual(set(liens_b), {a.id_affaire, c.id_affaire})
+
+        for x in (a, b, c):
+            self.g.supprimer_affaire(x.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 5 — CRÉATION ET LIAISON EN LOT
+    # ==================================================
+    def test_creation_et_liaison_en_lot(self):
+        """
+        Fonction testée : creer_suspects / lier_suspects_affaire
+
+        PRE :
+        - Une liste de suspects à créer
+
+        POST :
+        - Les ids générés sont retournés dans l'ordre
+        - Les suspects sont liés à l'affaire en un appel
+        - Seules les liaisons réellement créées sont comptées (doublons ignorés)
+        """
+        affaire = self.g.creer_affaire("Lot", "04-04-2025", "Ville", "9996", "en cours")
+        suspects = self.g.creer_suspects([
+            {"nom": f"Nom{i}", "prenom": f"Prenom{i}", "casier": i % 2 == 0}
+            for i in range(5)
+        ])
+
+        self.assertEqual(len(suspects), 5)
+        for i, s in enumerate(suspects):
+            self.assertEqual(self.g.get_suspect(s.id_suspect).nom, f"Nom{i}")
+
+        self.assertEqual(self.g.lier_suspects_affaire(affaire.id_affaire, [s.id_suspect for s in suspects[:3]]), 3)
+        self.assertEqual(self.g.lier_suspects_affaire(affaire.id_affaire, [s.id_suspect for s in suspects]), 2)
+        self.assertEqual(
+            sorted(s.id_suspect for s in self.g.get_affaire(affaire.id_affaire).get_suspects()),
+            [s.id_suspect for s in suspects]
+        )
+
+        self.g.supprimer_affaire(affaire.id_affaire)
+        for s in suspects:
+            self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 6 — RECHERCHE PLEIN TEXTE
+    # ==================================================
+    def test_rechercher(self):
+        """
+        Fonction testée : rechercher
+
+        PRE :
+        - Une affaire liée à un suspect « Moriarty »
+
+        POST :
+        - L'affaire est trouvée par son titre (préfixe, sans accent)
+        - L'affaire est trouvée par le nom du suspect lié
+        - Le retrait du lien met l'index à jour
+        """
+        affaire = self.g.creer_affaire("Vol au musée", "05-05-2025", "Ville", "9995", "en cours")
+        s = self.g.creer_suspect("Moriarty", "James")
+        self.g.lier_suspect_affaire(affaire.id_affaire, s.id_suspect)
+
+        self.assertIn(affaire.id_affaire, self.g.rechercher("muse"))
+        self.assertIn(affaire.id_affaire, self.g.rechercher("moriarty"))
+
+        self.g.del_suspect_affaire(affaire.id_affaire, s.id_suspect)
+        self.assertNotIn(affaire.id_affaire, self.g.rechercher("moriarty"))
+        self.assertEqual(self.g.rechercher("   "), [])
+
+        self.g.supprimer_affaire(affaire.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 7 — CARTE D'IDENTITÉ (CACHE DE SESSION)
+    # ==================================================
+    def test_identity_map(self):
+        """
+        Fonction testée : get_suspect / maj_suspect / supprimer_suspect
+
+        PRE :
+        - Un suspect existe en base
+
+        POST :
+        - Deux lectures du même id renvoient la même instance, sans requête
+        - Une modification est visible à la lecture suivante
+        - Après suppression, la lecture renvoie None
+        """
+        s = self.g.creer_suspect("Lupin", "Arsène")
+
+        premier = self.g.get_suspect(s.id_suspect)
+        with patch("backend.suspect.get_by_id") as get_by_id:
+            second = self.g.get_suspect(s.id_suspect)
+            get_by_id.assert_not_called()
+        self.assertIs(premier, second)
+
+        self.g.maj_suspect(s.id_suspect, {"description": "Gentleman cambrioleur"})
+        self.assertEqual(self.g.get_suspect(s.id_suspect).description, "Gentleman cambrioleur")
+
+        self.g.supprimer_suspect(s.id_suspect)
+        self.assertIsNone(self.g.get_suspect(s.id_suspect))
+
+    # ==================================================
+    # TEST 8 — ÉCRITURE DES SEULS CHAMPS MODIFIÉS
+    # ==================================================
+    def test_suivi_modifications(self):
+        """
+        Fonction testée : save / maj_affaire
+
+        PRE :
+        - Une affaire existe en base
+
+        POST :
+        - save() sans modification n'envoie aucune requête
+        - save() n'écrit que les colonnes modifiées
+        - maj_affaire sur un id absent du cache met à jour la ligne
+        - maj_affaire sur un id inexistant retourne False
+        - invalider_relations() conserve les modifications en attente
+        - save() dans une transaction annulée laisse les colonnes à écrire
+        """
+        affaire = self.g.creer_affaire("Suivi", "06-06-2025", "Ville", "9994", "en cours", "Longue description")
+
+        with patch("backend.suivi.update") as update:
+            self.assertFalse(affaire.save())
+            update.assert_not_called()
+
+            affaire.statut = "classée"
+            self.assertTrue(affaire.save())
+            update.assert_called_once_with("Affaire", affaire.id_affaire, {"statut": "classée"}, pk="id_affaire")
+        self.assertFalse(affaire.est_modifie)
+
+        # Une liaison qui invalide les relations ne perd pas un titre non sauvegardé
+        affaire.titre = "Suivi en attente"
+        affaire.invalider_relations()
+        self.assertTrue(affaire.est_modifie)
+        self.assertTrue(affaire.save())
+        self.g.vider_cache()
+        self.assertEqual(self.g.get_affaire(affaire.id_affaire).titre, "Suivi en attente")
+
+        # Transaction annulée : l'objet reste modifié, le save() suivant réécrit
+        affaire = self.g.get_affaire(affaire.id_affaire)
+        with self.assertRaises(RuntimeError):
+            with database.transaction():
+                affaire.titre = "Suivi annulé"
+                self.assertTrue(affaire.save())
+                self.assertTrue(affaire.est_modifie)
+                raise RuntimeError("annulation")
+        self.assertTrue(affaire.est_modifie)
+        self.assertTrue(affaire.save())
+        self.assertFalse(affaire.est_modifie)
+        self.g.vider_cache()
+        self.assertEqual(self.g.get_affaire(affaire.id_affaire).titre, "Suivi annulé")
+
+        self.g.vider_cache()
+        self.assertTrue(self.g.maj_affaire(affaire.id_affaire, {"titre": "Suivi modifié"}))
+        self.assertEqual(self.g.get_affaire(affaire.id_affaire).titre, "Suivi modifié")
+
+        id_affaire = affaire.id_affaire
+        self.g.supprimer_affaire(id_affaire)
+        self.assertFalse(self.g.maj_affaire(id_affaire, {"titre": "Absente"}))
+
+    # ==================================================
+    # TEST 9 — TABLE D'AFFAIRES EN COLONNES
+    # ==================================================
+    def test_table_affaires(self):
+        """
+        Fonction testée : get_table_affaires
+
+        PRE :
+        - Deux affaires de statuts différents
+
+        POST :
+        - Les modèles n'ont pas de __dict__ (slots)
+        - La table contient les affaires, statuts codés et dates en ordinaux
+        - Les filtres retournent les bons indices
+        """
+        a1 = self.g.creer_affaire("Table 1", "01-02-2020", "Ville", "9993", "en cours")
+        a2 = self.g.creer_affaire("Table 2", "15-08-2021", "Ville", "9993", "classee")
+        self.assertFalse(hasattr(a1, "__dict__"))
+
+        table = self.g.get_table_affaires()
+        i1, i2 = table.indice(a1.id_affaire), table.indice(a2.id_affaire)
+        self.assertEqual(table.statut(i1), "en cours")
+        self.assertEqual(table.statut(i2), "classée")
+        self.assertEqual(table.ligne(i2)["date"], "15-08-2021")
+        self.assertIs(table.lieux[i1], table.lieux[i2])
+
+        self.assertIn(i2, table.indices_statut("classée"))
+        self.assertNotIn(i1, table.indices_statut("classée"))
+        self.assertEqual(
+            table.ids_de(table.indices_entre_dates(date(2021, 1, 1), date(2021, 12, 31))),
+            [a2.id_affaire]
+        )
+        self.assertEqual(table.compter_par_code_postal()["9993"], 2)
+
+        self.g.supprimer_affaire(a1.id_affaire)
+        self.g.supprimer_affaire(a2.id_affaire)
+
+    # ==================================================
+    # TEST 10 — CONSTRUCTION RAPIDE DEPUIS LA BASE
+    # ==================================================
+    def test_from_trusted_row(self):
+        """
+        Fonction testée : from_trusted_row / get_affaires
+
+        PRE :
+        - Une affaire existe en base
+
+        POST :
+        - L'instance rapide est identique à celle du constructeur
+        - Elle n'est pas marquée modifiée et le suivi reste actif
+        """
+        affaire = self.g.creer_affaire("Rapide", "07-07-2025", "Ville", "9992", "classée", "Desc")
+        rapide = next(a for a in self.g.get_affaires() if a.id_affaire == affaire.id_affaire)
+
+        self.assertEqual(rapide, affaire)
+        self.assertIsNone(rapide._suspects)
+        self.assertFalse(rapide.est_modifie)
+
+        rapide.titre = "Rapide modifiée"
+        self.assertEqual(rapide.champs_modifies(), {"titre": "Rapide modifiée"})
+
+        self.g.supprimer_affaire(affaire.id_affaire)
+
+    # ==================================================
+    # TEST 11 — FILTRE COMPOSITE EN SQL
+    # ==================================================
+    def test_filtre_composite(self):
+        """
+        Fonction testée : filtre (FiltreAffaires)
+
+        PRE :
+        - Trois affaires : statuts, dates et suspects différents
+
+        POST :
+        - Les critères se cumulent (ET) en une seule requête
+        - Les variantes de statut (classee / classée) sont reconnues
+        - Le statut est enregistré sous sa forme canonique (création et mise à jour)
+        - Le filtre vide retourne toutes les affaires
+        """
+        s = self.g.creer_suspect("Fantômas", "Inconnu")
+        a1 = self.g.creer_affaire("Filtre 1", "10-01-2022", "Ville", "9991", "en cours")
+        a2 = self.g.creer_affaire("Filtre 2", "10-06-2022", "Ville", "9991", "classee")
+        a3 = self.g.creer_affaire("Filtre 3", "10-06-2023", "Ville", "9990", "en cours")
+        self.g.lier_suspect_affaire(a1.id_affaire, s.id_suspect)
+        self.g.lier_suspect_affaire(a2.id_affaire, s.id_suspect)
+
+        self.assertEqual(
+            self.g.filtre().suspect(s.id_suspect).classees().ids(),
+            [a2.id_affaire]
+        )
+        self.assertEqual(
+            self.g.filtre().code_postal("9991").entre_dates(date(2022, 3, 1), None).ids(),
+            [a2.id_affaire]
+        )
+        self.assertEqual(
+            [a.titre for a in self.g.filtre().en_cours().texte("filtre").affaires()
+             if a.id_affaire in (a1.id_affaire, a2.id_affaire, a3.id_affaire)],
+            ["Filtre 1", "Filtre 3"]
+        )
+        self.assertEqual(self.g.filtre().compter(), len(self.g.get_affaires()))
+
+        a4 = self.g.creer_affaire("Filtre 4", "10-06-2024", "Ville", "9992", " CLASSÉE ")
+        self.assertEqual(a4.statut, "classée")
+        self.assertEqual(self.g.filtre().code_postal("9992").classees().ids(), [a4.id_affaire])
+        self.g.maj_affaire(a4.id_affaire, {"statut": "En Cours"})
+        self.g.vider_cache()
+        self.assertEqual(self.g.get_affaire(a4.id_affaire).statut, "en cours")
+        self.assertEqual(self.g.filtre().code_postal("9992").en_cours().ids(), [a4.id_affaire])
+
+        for a in (a1, a2, a3, a4):
+            self.g.supprimer_affaire(a.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 12 — DATE ISO ET CHRONOLOGIE
+    # ==================================================
+    def test_chronologie(self):
+        """
+        Fonction testée : chronologie
+
+        PRE :
+        - Trois affaires dont l'ordre JJ-MM-AAAA diffère de l'ordre réel
+
+        POST :
+        - Les affaires sont triées par date réelle
+        - L'intervalle traverse correctement mois et années
+        - Le format affiché reste JJ-MM-AAAA
+        """
+        a1 = self.g.creer_affaire("Chrono 1", "31-12-2019", "Ville", "9989", "en cours")
+        a2 = self.g.creer_affaire("Chrono 2", "01-01-2020", "Ville", "9989", "en cours")
+        a3 = self.g.creer_affaire("Chrono 3", "15-06-2021", "Ville", "9989", "en cours")
+        ids = {a1.id_affaire, a2.id_affaire, a3.id_affaire}
+
+        chrono = [a.id_affaire for a in self.g.chronologie() if a.id_affaire in ids]
+        self.assertEqual(chrono, [a1.id_affaire, a2.id_affaire, a3.id_affaire])
+
+        entre = self.g.chronologie(date(2019, 12, 1), date(2020, 1, 31))
+        self.assertEqual([a.id_affaire for a in entre if a.id_affaire in ids], [a1.id_affaire, a2.id_affaire])
+        self.assertEqual(entre[-1].date, "01-01-2020")
+
+        # La date ISO suit les modifications
+        self.g.maj_affaire(a3.id_affaire, {"date": "02-01-2020"})
+        entre = self.g.chronologie(date(2020, 1, 1), date(2020, 1, 31))
+        self.assertEqual([a.id_affaire for a in entre if a.id_affaire in ids], [a2.id_affaire, a3.id_affaire])
+
+        for a in (a1, a2, a3):
+            self.g.supprimer_affaire(a.id_affaire)
+
+    # ==================================================
+    # TEST 13 — TABLE DES LIENS MATÉRIALISÉE
+    # ==================================================
+    def test_paires_liees(self):
+        """
+        Fonction testée : get_paires_liees / get_paires_affaire / get_lien
+
+        PRE :
+        - Deux affaires partageant un suspect et une arme
+
+        POST :
+        - LienAffaire est tenue à jour à chaque liaison / déliaison
+        - Les compteurs correspondent au calcul complet des liens
+        - La suppression d'une affaire retire ses paires
+        """
+        a1 = self.g.creer_affaire("Paire 1", "01-03-2024", "Ville", "9988", "en cours")
+        a2 = self.g.creer_affaire("Paire 2", "02-03-2024", "Ville", "9988", "en cours")
+        s = self.g.creer_suspect("Irène", "Adler")
+        arme = self.g.creer_arme("Revolver", None, "PAIRE-1", a1.id_affaire)
+        for a in (a1, a2):
+            self.g.lier_suspect_affaire(a.id_affaire, s.id_suspect)
+            self.g.lier_arme_affaire(a.id_affaire, arme.id_arme)
+
+        paires = self.g.get_paires_affaire(a1.id_affaire)
+        self.assertEqual([(p.autre(a1.id_affaire), p.nb_suspects, p.nb_armes) for p in paires],
+                         [(a2.id_affaire, 1, 1)])
+        self.assertEqual(
+            sorted((p.id_a, p.id_b, p.nb_suspects, p.nb_armes, p.nb_lieux) for p in self.g.get_paires_liees()),
+            sorted((l.id_a, l.id_b, len(l.suspects), len(l.armes), len(l.lieux)) for l in self.g.get_liens())
+        )
+        self.assertEqual(self.g.get_lien(a2.id_affaire, a1.id_affaire).suspects[0].nom, "Irène")
+
+        self.g.del_suspect_affaire(a2.id_affaire, s.id_suspect)
+        self.assertEqual(self.g.get_paires_affaire(a2.id_affaire)[0].nb_suspects, 0)
+
+        self.g.supprimer_affaire(a2.id_affaire)
+        self.assertEqual(self.g.get_paires_affaire(a1.id_affaire), [])
+
+        self.g.supprimer_affaire(a1.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 14 — FLUX DE CHANGEMENTS
+    # ==================================================
+    def test_flux_changements(self):
+        """
+        Fonction testée : abonner / desabonner (événements de GestionEnquetes)
+
+        PRE :
+        - Un abonné enregistre les événements reçus
+
+        POST :
+        - Création, modification, liaison et suppression sont publiées
+          avec les affaires concernées
+        - Dans une transaction, les événements arrivent après le commit
+          et sont abandonnés en cas d'annulation
+        """
+        recus = []
+        self.g.abonner(recus.append)
+
+        a = self.g.creer_affaire("Flux", "01-04-2024", "Ville", "9977", "en cours")
+        s = self.g.creer_suspect("Moriarty", "James")
+        self.g.lier_suspect_affaire(a.id_affaire, s.id_suspect)
+        self.g.maj_suspect(s.id_suspect, {"prenom": "Jim"})
+        self.assertEqual(
+            [(e.action, e.entite, e.affaires) for e in recus],
+            [
+                ("creation", "affaire", (a.id_affaire,)),
+                ("creation", "suspect", ()),
+                ("liaison", "suspect", (a.id_affaire,)),
+                ("modification", "suspect", (a.id_affaire,)),
+            ],
+        )
+        self.assertTrue(recus[2].touche_liens)
+        self.assertFalse(recus[3].touche_liens)
+
+        # Différés jusqu'au commit
+        recus.clear()
+        with self.g.transaction():
+            self.g.maj_affaire(a.id_affaire, {"titre": "Flux 2"})
+            self.assertEqual(recus, [])
+        self.assertEqual([e.action for e in recus], ["modification"])
+
+        # Abandonnés si la transaction est annulée
+        recus.clear()
+        with self.assertRaises(RuntimeError):
+            with self.g.transaction():
+                self.g.maj_affaire(a.id_affaire, {"titre": "Annulé"})
+                raise RuntimeError("annulation")
+        self.assertEqual(recus, [])
+
+        self.g.supprimer_suspect(s.id_suspect)
+        self.assertEqual((recus[-1].action, recus[-1].affaires), ("suppression", (a.id_affaire,)))
+
+        self.g.desabonner(recus.append)
+        self.g.supprimer_affaire(a.id_affaire)
+        self.assertEqual(len(recus), 1)
+
+    # ==================================================
+    # TEST 15 — DISPOSITION PAR LIENS
+    # ==================================================
+    def test_disposition_par_liens(self):
+        """
+        Fonction testée : calculer_disposition / maj_positions_affaires
+
+        PRE :
+        - Trois affaires dont deux liées par un suspect, placées en ligne
+
+        POST :
+        - Les affaires liées sont plus proches que l'affaire isolée
+        - Aucun post-it ne se chevauche
+        - Les positions sont enregistrées en un lot et publiées en un événement
+        """
+        affaires = [
+            self.g.creer_affaire(f"Dispo {i}", "01-05-2024", "Ville", "9966", "en cours")
+            for i in range(3)
+        ]
+        ids = [a.id_affaire for a in affaires]
+        s = self.g.creer_suspect("Hudson", "Martha")
+        self.g.lier_suspect_affaire(ids[0], s.id_suspect)
+        self.g.lier_suspect_affaire(ids[2], s.id_suspect)
+        self.g.maj_positions_affaires({i: (40 + 1000 * n, 40) for n, i in enumerate(ids)})
+
+        positions = self.g.calculer_disposition(ids)
+        self.assertEqual(set(positions), set(ids))
+
+        def distance(a, b):
+            (xa, ya), (xb, yb) = positions[a], positions[b]
+            return ((xa - xb) ** 2 + (ya - yb) ** 2) ** 0.5
+
+        self.assertLess(distance(ids[0], ids[2]), distance(ids[0], ids[1]))
+        for a in ids:
+            for b in ids:
+                if a < b:
+                    self.assertTrue(
+                        abs(positions[a][0] - positions[b][0]) >= 200
+                        or abs(positions[a][1] - positions[b][1]) >= 200
+                    )
+
+        recus = []
+        self.g.abonner(recus.append)
+        self.assertEqual(self.g.maj_positions_affaires(positions), 3)
+        self.g.desabonner(recus.append)
+        self.assertEqual([(e.action, set(e.affaires)) for e in recus], [("position", set(ids))])
+        self.assertEqual((self.g.get_affaire(ids[1]).pos_x, self.g.get_affaire(ids[1]).pos_y), positions[ids[1]])
+
+        for i in ids:
+            self.g.supprimer_affaire(i)
+        self.g.supprimer_suspect(s.id_suspect)
+
+
+    # ==================================================
+    # TEST 16 — TAMPON DES POSITIONS
+    # ==================================================
+    def test_tampon_positions(self):
+        """
+        Fonction testée : maj_position_affaire(_differee) / maj_position_suspect(_differee) / vider_positions
+
+        PRE :
+        - Une affaire et un suspect existants
+
+        POST :
+        - Les déplacements différés ne sont écrits en base qu'au vidage du tampon
+        - Seule la dernière position de chaque entité est conservée
+        - Le vidage publie un événement de position par type d'entité
+        - maj_position_affaire écrit tout de suite, sans écrasement par le tampon
+        """
+        a = self.g.creer_affaire("Tampon", "02-05-2024", "Ville", "9965", "en cours")
+        s = self.g.creer_suspect("Lestrade", "Giles")
+
+        recus = []
+        self.g.abonner(recus.append)
+        for x in range(10, 60, 10):
+            self.g.maj_position_affaire_differee(a.id_affaire, x, x + 1)
+        self.g.maj_position_suspect_differee(s.id_suspect, 7, 8)
+
+        self.assertEqual(recus, [])
+        self.assertEqual(len(self.g.positions), 2)
+        self.assertNotEqual(self.g.get_affaire(a.id_affaire).pos_x, 50)
+
+        self.assertEqual(self.g.vider_positions(), 2)
+        self.assertEqual(self.g.vider_positions(), 0)
+        self.g.desabonner(recus.append)
+
+        self.assertEqual([(e.action, e.entite) for e in recus], [("position", "affaire"), ("position", "suspect")])
+        self.assertEqual(recus[0].affaires, (a.id_affaire,))
+        affaire = self.g.get_affaire(a.id_affaire)
+        self.assertEqual((affaire.pos_x, affaire.pos_y), (50, 51))
+        self.assertEqual(self.g.get_suspect(s.id_suspect).pos_x, 7)
+
+        self.g.maj_position_affaire_differee(a.id_affaire, 70, 71)
+        self.assertEqual(self.g.maj_position_affaire(a.id_affaire, 80, 81), 1)
+        self.assertEqual(len(self.g.positions), 0)
+        affaire = self.g.get_affaire(a.id_affaire)
+        self.assertEqual((affaire.pos_x, affaire.pos_y), (80, 81))
+
+        self.g.supprimer_affaire(a.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+
+    # ==================================================
+    # TEST 17 — VERSION D'AFFICHAGE DES AFFAIRES
+    # ==================================================
+    def test_version_affaire(self):
+        """
+        Fonction testée : charger_versions (triggers de version)
+
+        PRE :
+        - Une affaire et un suspect existants
+
+        POST :
+        - La version change après une modification de l'affaire,
+          une liaison, une modification du suspect lié ou une déliaison
+        - Un déplacement du post-it ne change pas la version
+        """
+        a = self.g.creer_affaire("Version", "03-05-2024", "Ville", "9964", "en cours")
+        s = self.g.creer_suspect("Hooper", "Molly")
+
+        def version():
+            affaire = self.g.get_affaires_par_ids([a.id_affaire])[0]
+            self.g.charger_versions([affaire])
+            return affaire.version
+
+        versions = [version()]
+        self.g.maj_position_affaire(a.id_affaire, 300, 400)
+        self.assertEqual(version(), versions[-1])
+
+        for ecriture in (
+            lambda: self.g.maj_affaire(a.id_affaire, {"titre": "Version bis"}),
+            lambda: self.g.lier_suspect_affaire(a.id_affaire, s.id_suspect),
+            lambda: self.g.maj_suspect(s.id_suspect, {"nom": "Hooper-Watson"}),
+            lambda: self.g.del_suspect_affaire(a.id_affaire, s.id_suspect),
+        ):
+            ecriture()
+            versions.append(version())
+            self.assertGreater(versions[-1], versions[-2])
+
+        self.g.supprimer_affaire(a.id_affaire)
+        self.g.supprimer_suspect(s.id_suspect)
+
+    # ==================================================
+    # TEST 18 — CHARGEMENT DU MUR HORS DU THREAD TK
+    # ==================================================
+    def test_chargeur_mur_instances_propres(self):
+        """
+        Fonction testée : ChargeurMur._lire_mur (liste figée d'affaires)
+
+        PRE :
+        - Une affaire affichée, sans relations chargées
+
+        POST :
+        - Le thread de travail relit l'affaire depuis ses ids
+        - L'instance affichée n'est jamais modifiée par le thread
+        """
+        from gui.chargeur_mur import ChargeurMur
+
+        a = self.g.creer_affaire("Chargeur", "04-05-2024", "Ville", "9963", "en cours")
+        affichee = self.g.get_affaires_par_ids([a.id_affaire])[0]
+
+        resultat = ChargeurMur(None, self.g)._lire_mur(
+            None, [a.id_affaire], (0, 0, 10000, 10000), {}, lambda *args: None, lambda: False
+        )
+        self.assertEqual([x.id_affaire for x in resultat.affaires], [a.id_affaire])
+        self.assertIsNot(resultat.affaires[0], affichee)
+        self.assertTrue(resultat.affaires[0].relations_chargees)
+        self.assertFalse(affichee.relations_chargees)
+        self.assertIsNone(affichee.version)
+
+        self.g.supprimer_affaire(a.id_affaire)
 
 if __name__ == "__main__":
     unittest.main()
@@ -37,8 +37,8 @@ class TestAffaireUnit(unittest.TestCase):
             pos_y=40
         )
 
-        # Le statut invalide doit être remplacé par "En cours"
-        self.assertEqual(a.statut, "En cours")
+        # Le statut invalide doit être remplacé par "en cours"
+        self.assertEqual(a.statut, "en cours")
 
         # Changement vers une valeur valide
         a.statut = "classée"
@@ -112,7 +112,7 @@ class TestAffaireUnit(unittest.TestCase):
 
         # Vérifie les champs principaux
         self.assertEqual(a.titre, "Affaire OK")
-        self.assertEqual(a.statut, "En cours")
+        self.assertEqual(a.statut, "en cours")
 
 
 # Permet de lancer les tests directement via ce fichier
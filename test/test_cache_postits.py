@@ -0,0 +1,41 @@
+import unittest
+from gui.cache_postits import CachePostits
+
+
+class TestCachePostits(unittest.TestCase):
+
+    # Une entrée n'est valable que pour la version avec laquelle elle a été enregistrée
+    def test_version(self):
+        c = CachePostits()
+        c.enregistrer_texte(1, 3, "texte v3")
+        c.enregistrer_taille(1, 3, 1.0, (120, 80))
+
+        self.assertEqual(c.texte(1, 3), "texte v3")
+        self.assertEqual(c.taille(1, 3, 1.0), (120, 80))
+        self.assertIsNone(c.taille(1, 3, 0.5))
+        self.assertEqual(c.tailles(1, 3), {1.0: (120, 80)})
+        self.assertEqual(c.tailles(1, 4), {})
+        self.assertIsNone(c.texte(1, 4))
+        self.assertIsNone(c.texte(1, None))
+
+        # Nouvelle version : l'ancienne entrée (texte et tailles) est remplacée
+        c.enregistrer_texte(1, 4, "texte v4")
+        self.assertIsNone(c.texte(1, 3))
+        self.assertIsNone(c.taille(1, 4, 1.0))
+        self.assertEqual(c.versions(), {1: 4})
+
+    # Au-delà de la capacité, l'affaire la moins récemment utilisée est oubliée
+    def test_capacite(self):
+        c = CachePostits(capacite=2)
+        c.enregistrer_texte(1, 0, "a")
+        c.enregistrer_texte(2, 0, "b")
+        c.texte(1, 0)
+        c.enregistrer_texte(3, 0, "c")
+
+        self.assertEqual(set(c.versions()), {1, 3})
+        c.oublier(1)
+        self.assertEqual(len(c), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
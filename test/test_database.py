@@ -0,0 +1,211 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import database
+from database import init_db, close_pool, get_connection, get_pool
+from database import SCHEMA_VERSION, get_schema_version
+
+
+class TestDatabase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Base temporaire pour ne pas toucher à detectives.db
+        cls._ancien_nom = database.DB_NAME
+        cls._dossier = tempfile.TemporaryDirectory()
+        database.DB_NAME = os.path.join(cls._dossier.name, "test.db")
+        init_db()
+
+    @classmethod
+    def tearDownClass(cls):
+        close_pool()
+        database.DB_NAME = cls._ancien_nom
+        cls._dossier.cleanup()
+
+    # ==================================================
+    # POOL DE CONNEXIONS
+    # ==================================================
+    def test_pool_reutilise_la_connexion(self):
+        """
+        POST :
+        - close() rend la connexion au pool
+        - l'emprunt suivant réutilise la même connexion physique
+        - les clés étrangères restent actives
+        """
+        conn = get_connection()
+        conn.close()
+
+        conn2 = get_connection()
+        self.assertIs(conn, conn2)
+        self.assertEqual(conn2.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        conn2.close()
+
+    def test_pool_rollback_transaction_non_validee(self):
+        """
+        POST : une écriture non validée est annulée au retour dans le pool.
+        """
+        conn = get_connection()
+        conn.execute("INSERT INTO Ville (code_postal, nom) VALUES ('0000', 'Fantome')")
+        conn.close()
+
+        conn = get_connection()
+        row = conn.execute("SELECT * FROM Ville WHERE code_postal = '0000'").fetchone()
+        conn.close()
+        self.assertIsNone(row)
+
+    def test_pool_borne(self):
+        """
+        POST : le pool ne conserve pas plus de `size` connexions inactives.
+        """
+        pool = get_pool()
+        conns = [get_connection() for _ in range(pool.size + 3)]
+        for c in conns:
+            c.close()
+        self.assertEqual(len(pool._idle), pool.size)
+
+    def test_pragmas_profil_applique(self):
+        """
+        POST :
+        - le profil par défaut active WAL sur chaque connexion du pool
+        - DETECTIVES_DB_PRAGMAS surcharge une valeur du profil
+        """
+        conn = get_connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        conn.close()
+
+        with unittest.mock.patch.dict(os.environ, {"DETECTIVES_DB_PRAGMAS": "busy_timeout=1234"}):
+            self.assertEqual(database.charger_pragmas()["busy_timeout"], "1234")
+
+        with unittest.mock.patch.dict(os.environ, {"DETECTIVES_DB_PRAGMAS": "user_version=3"}):
+            with self.assertRaises(ValueError):
+                database.charger_pragmas()
+
+    # ==================================================
+    # TRANSACTIONS
+    # ==================================================
+    def test_transaction_commit_unique(self):
+        """
+        POST :
+        - les écritures du bloc partagent une connexion
+        - elles sont visibles après la sortie du bloc
+        """
+        with database.transaction() as conn:
+            database.insert("Ville", {"code_postal": "1111", "nom": "Un"})
+            database.insert("Ville", {"code_postal": "2222", "nom": "Deux"})
+            self.assertIs(get_connection(), conn)
+
+        self.assertIsNotNone(database.get_by_id("Ville", "1111", pk="code_postal"))
+        self.assertIsNotNone(database.get_by_id("Ville", "2222", pk="code_postal"))
+
+    def test_transaction_rollback_sur_exception(self):
+        """
+        POST : une exception dans le bloc annule toutes ses écritures,
+        y compris celles d'un bloc imbriqué déjà terminé.
+        """
+        with self.assertRaises(RuntimeError):
+            with database.transaction():
+                database.insert("Ville", {"code_postal": "3333", "nom": "Trois"})
+                with database.transaction():
+                    database.insert("Ville", {"code_postal": "4444", "nom": "Quatre"})
+                raise RuntimeError("échec")
+
+        self.assertIsNone(database.get_by_id("Ville", "3333", pk="code_postal"))
+        self.assertIsNone(database.get_by_id("Ville", "4444", pk="code_postal"))
+
+    # ==================================================
+    # MIGRATIONS
+    # ==================================================
+    def test_migrations_version_et_index(self):
+        """
+        POST :
+        - la base est à la dernière version du schéma
+        - les index secondaires existent
+        - rouvrir une base à jour n'exécute aucune migration
+        """
+        conn = get_connection()
+        self.assertEqual(get_schema_version(conn), SCHEMA_VERSION)
+        index = {
+            r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        conn.close()
+        self.assertIn("idx_affairesuspect_suspect", index)
+        self.assertIn("idx_affaire_statut", index)
+        self.assertIn("idx_arme_numero_serie", index)
+        self.assertIn("idx_affaire_date_iso", index)
+
+        # Sans migration disponible, init_db échouerait s'il tentait d'en exécuter une
+        with unittest.mock.patch.object(database, "MIGRATIONS", []):
+            init_db()
+
+    def test_migration_statut_canonique(self):
+        """
+        POST : les statuts enregistrés tels que saisis sont réécrits
+        en « en cours » ou « classée ».
+        """
+        conn = get_connection()
+        saisis = ["En cours", "EN COURS ", "Classee", "CLASSÉE", "???", "classée"]
+        for statut in saisis:
+            conn.execute(
+                "INSERT INTO Affaire (titre, date, lieu, statut) VALUES ('Statut', '01-01-2020', 'Ville', ?)",
+                (statut,),
+            )
+        database._migration_statut(conn.cursor())
+        statuts = [r[0] for r in conn.execute("SELECT statut FROM Affaire WHERE titre = 'Statut' ORDER BY id_affaire")]
+        conn.rollback()
+        conn.close()
+
+        self.assertEqual(statuts, ["en cours", "en cours", "classée", "classée", "en cours", "classée"])
+
+    def test_insert_many_ids_non_consecutifs(self):
+        """
+        POST : les ids retournés sont ceux des lignes insérées, même quand
+        SQLite ne génère pas des rowid consécutifs (rowid maximal occupé).
+        """
+        conn = get_connection()
+        conn.execute("INSERT INTO Ville (rowid, code_postal, nom) VALUES (9223372036854775807, '8800', 'Max')")
+        conn.commit()
+        conn.close()
+
+        lignes = [{"code_postal": f"88{i:02d}", "nom": f"Ville {i}"} for i in range(1, 4)]
+        ids = database.insert_many("Ville", lignes)
+
+        conn = get_connection()
+        for id_, ligne in zip(ids, lignes):
+            code = conn.execute("SELECT code_postal FROM Ville WHERE rowid = ?", (id_,)).fetchone()
+            self.assertEqual(code, (ligne["code_postal"],))
+        conn.execute("DELETE FROM Ville WHERE code_postal LIKE '88%'")
+        conn.commit()
+        conn.close()
+
+    # ==================================================
+    # LECTURE EN CONTINU / PAGINATION
+    # ==================================================
+    def test_iter_rows_projection_et_pagination(self):
+        """
+        POST :
+        - seules les colonnes demandées sont lues, dans l'ordre des ids
+        - after_id / limit découpent la table en pages sans recouvrement
+        - la connexion est rendue au pool en fin de parcours
+        """
+        ids = database.insert_many("Ville", [
+            {"code_postal": f"77{i:02d}", "nom": f"Ville {i}"} for i in range(5)
+        ])
+        libres = len(get_pool()._idle)
+        filtre = {"where": "code_postal LIKE ?", "params": ("77%",), "pk": "rowid"}
+
+        lignes = list(database.iter_rows("Ville", columns=("nom",), batch_size=2, **filtre))
+        self.assertEqual(lignes, [(f"Ville {i}",) for i in range(5)])
+
+        page1 = list(database.iter_rows("Ville", columns=("rowid",), limit=3, **filtre))
+        page2 = list(database.iter_rows("Ville", columns=("rowid",), after_id=page1[-1][0], limit=3, **filtre))
+        self.assertEqual([r[0] for r in page1 + page2], ids)
+
+        self.assertEqual(len(get_pool()._idle), libres)
+
+
+if __name__ == "__main__":
+    unittest.main()
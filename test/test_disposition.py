@@ -0,0 +1,69 @@
+import random
+import unittest
+from backend.disposition import disposition_forces, numpy_disponible, DEMI_POSTIT
+
+
+def graphe_aleatoire(n, graine=1):
+    # Affaires éparpillées, chacune liée à 0-3 autres (amas autour des plus liées)
+    r = random.Random(graine)
+    positions = {i: (r.randint(0, 3000), r.randint(0, 3000)) for i in range(n)}
+    aretes = set()
+    for i in range(n):
+        for _ in range(r.choice((0, 1, 1, 2, 3))):
+            j = r.randrange(n)
+            if j != i:
+                aretes.add((min(i, j), max(i, j)))
+    return positions, sorted(aretes)
+
+
+def chevauchements(disposition, tailles=None):
+    # Paires de post-it (coins supérieurs gauches, taille standard par défaut) qui se recouvrent
+    tailles = tailles or {}
+    standard = (2 * DEMI_POSTIT, 2 * DEMI_POSTIT)
+    rects = sorted((x, y) + tailles.get(i, standard) for i, (x, y) in disposition.items())
+    largeur_max = max(r[2] for r in rects)
+    n = 0
+    for a, (xa, ya, la, ha) in enumerate(rects):
+        for xb, yb, lb, hb in rects[a + 1:]:
+            if xb - xa >= largeur_max:
+                break
+            if xb < xa + la and ya < yb + hb and yb < ya + ha:
+                n += 1
+    return n
+
+
+class TestDisposition(unittest.TestCase):
+
+    def verifier(self, vectorise):
+        # Aucun chevauchement, même avec des amas denses
+        positions, aretes = graphe_aleatoire(300)
+        disposition = disposition_forces(positions, aretes, vectorise=vectorise)
+        self.assertEqual(set(disposition), set(positions))
+        self.assertEqual(chevauchements(disposition), 0)
+
+        # Post-it agrandis par leur texte : la disposition standard les ferait
+        # se chevaucher, celle qui reçoit leurs tailles non
+        r = random.Random(2)
+        tailles = {i: (r.choice((200, 260, 340)), r.choice((200, 230, 420))) for i in positions if i % 3 == 0}
+        self.assertGreater(chevauchements(disposition, tailles), 0)
+        disposition = disposition_forces(positions, aretes, vectorise=vectorise, tailles=tailles)
+        self.assertEqual(chevauchements(disposition, tailles), 0)
+
+        # Deux affaires liées finissent plus proches qu'une affaire isolée
+        positions = {1: (0, 0), 2: (1200, 0), 3: (600, 0)}
+        d = disposition_forces(positions, [(1, 2)], vectorise=vectorise)
+        ecart = lambda a, b: abs(d[a][0] - d[b][0]) + abs(d[a][1] - d[b][1])
+        self.assertLess(ecart(1, 2), min(ecart(1, 3), ecart(2, 3)))
+
+    # Version Python (installation sans numpy)
+    def test_version_python(self):
+        self.verifier(vectorise=False)
+
+    # Version vectorisée
+    @unittest.skipUnless(numpy_disponible(), "numpy n'est pas installé")
+    def test_version_numpy(self):
+        self.verifier(vectorise=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
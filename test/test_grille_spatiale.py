@@ -0,0 +1,33 @@
+import unittest
+from gui.grille_spatiale import GrilleSpatiale
+
+
+class TestGrilleSpatiale(unittest.TestCase):
+
+    # Seuls les rectangles qui intersectent la zone sont retournés
+    def test_dans_zone(self):
+        g = GrilleSpatiale(taille_case=100)
+        g.placer(1, 0, 0, 50, 50)
+        g.placer(2, 450, 450, 520, 520)
+        g.placer(3, -300, -300, -250, -250)
+
+        self.assertEqual(g.dans(0, 0, 500, 500), {1, 2})
+        self.assertEqual(g.dans(-400, -400, -1, -1), {3})
+        self.assertEqual(g.dans(60, 60, 440, 440), set())
+
+    # Un rectangle déplacé ou retiré n'est plus trouvé à son ancienne place
+    def test_placer_retirer(self):
+        g = GrilleSpatiale(taille_case=100)
+        g.placer(1, 0, 0, 50, 50)
+        g.placer(1, 1000, 1000, 1050, 1050)
+        self.assertEqual(g.dans(0, 0, 100, 100), set())
+        self.assertEqual(g.dans(900, 900, 1100, 1100), {1})
+
+        g.retirer(1)
+        self.assertNotIn(1, g)
+        self.assertEqual(len(g), 0)
+        self.assertEqual(g.cases, {})
+
+
+if __name__ == "__main__":
+    unittest.main()